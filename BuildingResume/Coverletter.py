@@ -1,28 +1,35 @@
 import os
 import json
-import subprocess
 import logging
-import google.generativeai as genai
-from jinja2 import Environment, FileSystemLoader, Template
-from pylatexenc.latexencode import utf8tolatex  # Safe LaTeX encoding
 import re
 from jsonschema import validate, ValidationError
 from typing import Any, Dict, List, Union
 
+import job_queue
+import latex_compiler
+import latex_escape
+import llm_cache
+import pdf_store
+import template_registry
+import tracing
+
 # File paths
-TEX_TEMPLATE_PATH = "templates/cover_letter_template.tex"
 OUTPUT_TEX_PATH = "output/generated_cover_letter.tex"
 OUTPUT_PDF_PATH = "output/generated_cover_letter.pdf"
 
-# Configure Logging
-logging.basicConfig(
-    level=logging.DEBUG,  # Set to DEBUG for detailed logs
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler("cover_letter_generation.log"),  # Log to a file
-        logging.StreamHandler()  # Also log to console
-    ]
-)
+LOG_FILE = "cover_letter_generation.log"
+
+# Value of cover_letter_content in the prompt's output format; a response still containing it has no letter
+COVER_LETTER_PLACEHOLDER = "GENERATE COVER LETTER HERE"
+
+
+# Configure Logging (the command-line entry points call this; importing the module does not)
+def configure_logging(log_file=LOG_FILE, level=logging.DEBUG):
+    """Logs to the console and, unless log_file is None, to a log file."""
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file))
+    logging.basicConfig(level=level, format="%(asctime)s [%(levelname)s] %(message)s", handlers=handlers)
 
 
 # Configure Google Gemini API
@@ -32,6 +39,7 @@ def configure_gemini_api():
     if not api_key:
         logging.error("Google Gemini API key not found in environment variables.")
         raise EnvironmentError("Google Gemini API key is missing.")
+    import google.generativeai as genai
     genai.configure(api_key=api_key)
     logging.info("Google Gemini API configured successfully.")
 
@@ -111,34 +119,49 @@ def extract_and_validate_json(text, schema):
         return None
 
 
+def is_valid_json_response(text, schema):
+    """Returns True if the response contains JSON valid against the schema (a quiet extract_and_validate_json)."""
+    return _parse_valid_json(text, schema) is not None
+
+
+def _parse_valid_json(text, schema):
+    json_match = re.search(r"\{[\s\S]*\}", text)
+    if not json_match:
+        return None
+    try:
+        extracted_json = json.loads(json_match.group(0))
+        validate(instance=extracted_json, schema=schema)
+    except (json.JSONDecodeError, ValidationError):
+        return None
+    return extracted_json
+
+
+def _is_job_themes_response(text):
+    return is_valid_json_response(text, job_themes_schema)
+
+
+def _is_cover_letter_response(text):
+    cover_letter_json = _parse_valid_json(text, cover_letter_schema)
+    return cover_letter_json is not None and cover_letter_json["cover_letter_content"] != COVER_LETTER_PLACEHOLDER
+
+
 ###############################################################################
 # **🔒 Safe LaTeX Character Escaping**
 ###############################################################################
 def escape_latex(s: str) -> str:
     """Escapes LaTeX special characters in a string."""
-    return utf8tolatex(s)
+    return latex_escape.escape_latex(s)
+
+
+def format_cover_letter_content(content):
+    """Replaces newlines in the AI-written letter body with manual LaTeX line breaks (the body is not escaped)."""
+    # Replace double newlines with two manual line breaks
+    return content.replace("\n\n", " \\\\ \n").replace("\n", " \\\\ \n")
 
 
 def escape_context(context_dict):
-    """Recursively escapes all strings in the dictionary for LaTeX compatibility, excluding cover_letter_content."""
-    escaped_context = {}
-    for key, value in context_dict.items():
-        if key == "cover_letter_content":
-            # Replace double newlines with two manual line breaks
-            formatted_content = value.replace("\n\n", " \\\\ \n").replace("\n", " \\\\ \n")
-            escaped_context[key] = formatted_content
-        elif isinstance(value, list):
-            escaped_context[key] = [
-                escape_latex(item) if isinstance(item, str) else escape_context(item) if isinstance(item, dict) else item
-                for item in value
-            ]
-        elif isinstance(value, dict):
-            escaped_context[key] = escape_context(value)
-        elif isinstance(value, str):
-            escaped_context[key] = escape_latex(value)
-        else:
-            escaped_context[key] = value
-    return escaped_context
+    """Escapes all strings in the dictionary (at any nesting depth) for LaTeX compatibility, excluding cover_letter_content."""
+    return latex_escape.escape_context(context_dict, {"cover_letter_content": format_cover_letter_content})
 
 
 # def escape_latex(text: str) -> str:
@@ -248,6 +271,7 @@ def load_text(file_path):
 ###############################################################################
 # **🤖 Generate Job Themes using Google Gemini**
 ###############################################################################
+@tracing.traced("cover_letter.themes")
 def extract_job_themes(job_description):
     """Sends job description to Gemini API to extract key themes."""
     prompt = f"""
@@ -266,15 +290,10 @@ def extract_job_themes(job_description):
     }}
     """
     try:
-        model = genai.GenerativeModel("gemini-pro")
-        response = model.generate_content(prompt)
-        logging.debug("Complete AI Response Object: %s", response)
+        # Invalid JSON is never cached, so a failed extraction is retried by the next call
+        response_text = llm_cache.generate_content(prompt, validate=_is_job_themes_response).strip()
 
-        if response and response.candidates:
-            if not response.candidates[0].content.parts:
-                logging.error("❌ AI response has no content parts.")
-                return {}
-            response_text = response.candidates[0].content.parts[0].text.strip()
+        if response_text:
             logging.info("✅ Raw AI Response for Job Themes:\n%s", response_text)
 
             job_themes_json = extract_and_validate_json(response_text, job_themes_schema)
@@ -284,7 +303,7 @@ def extract_job_themes(job_description):
                 logging.error("❌ AI returned invalid JSON for job themes.")
                 return {}
         else:
-            logging.error("❌ AI did not return any candidates for job themes.")
+            logging.error("❌ AI returned no content for job themes.")
             return {}
     except Exception as e:
         logging.error("Error in AI response processing for job themes: %s", e)
@@ -294,6 +313,7 @@ def extract_job_themes(job_description):
 ###############################################################################
 # **🤖 Generate Cover Letter JSON using Google Gemini**
 ###############################################################################
+@tracing.traced("cover_letter.write")
 def generate_final_cover_letter(applicant_info, job_description, job_themes):
     """Generates the final cover letter content using applicant info and job themes."""
     prompt = f"""
@@ -325,7 +345,7 @@ def generate_final_cover_letter(applicant_info, job_description, job_themes):
         "company_name": "{applicant_info.get('company', 'Company Name')}",
         "company_location": "{applicant_info.get('location', 'Location')}",
         "job_title": "{applicant_info.get('job_title', 'Job Title')}",
-        "cover_letter_content": "GENERATE COVER LETTER HERE"
+        "cover_letter_content": "{COVER_LETTER_PLACEHOLDER}"
     }}
 
     **Instructions:**
@@ -335,24 +355,17 @@ def generate_final_cover_letter(applicant_info, job_description, job_themes):
     """
 
     try:
-        model = genai.GenerativeModel("gemini-pro")
-        response = model.generate_content(prompt)
-        logging.debug("Complete AI Response Object: %s", response)
+        response_text = llm_cache.generate_content(prompt, validate=_is_cover_letter_response).strip()
 
         # Ensure the response contains valid content
-        if response and response.candidates:
-            if not response.candidates[0].content.parts:
-                logging.error("❌ AI response has no content parts.")
-                return {}
-
-            response_text = response.candidates[0].content.parts[0].text.strip()
+        if response_text:
             logging.info("✅ Raw AI Response for Cover Letter:\n%s", response_text)
 
             # Extract JSON
             cover_letter_json = extract_and_validate_json(response_text, cover_letter_schema)
             if cover_letter_json:
                 # Check if placeholder was replaced
-                if cover_letter_json.get("cover_letter_content") == "GENERATE COVER LETTER HERE":
+                if cover_letter_json.get("cover_letter_content") == COVER_LETTER_PLACEHOLDER:
                     logging.error("❌ AI did not generate cover letter content.")
                     return {}
                 return cover_letter_json
@@ -360,7 +373,7 @@ def generate_final_cover_letter(applicant_info, job_description, job_themes):
                 logging.error("❌ AI returned invalid JSON for cover letter.")
                 return {}
         else:
-            logging.error("❌ AI did not return any candidates for cover letter.")
+            logging.error("❌ AI returned no content for cover letter.")
             return {}
     except Exception as e:
         logging.error("Error in AI response processing for cover letter: %s", e)
@@ -372,24 +385,13 @@ def generate_final_cover_letter(applicant_info, job_description, job_themes):
 # **📝 Generate LaTeX Cover Letter File**
 ###############################################################################
 def generate_tex(cover_letter_data):
-    """Generates a LaTeX file for the cover letter using Jinja2 templating."""
+    """Generates a LaTeX file for the cover letter using Jinja2 templating and returns the LaTeX source."""
     try:
-        # Set up Jinja2 environment with custom delimiters to avoid conflicts with LaTeX
-        env = Environment(
-            loader=FileSystemLoader(os.path.dirname(TEX_TEMPLATE_PATH)),
-            block_start_string='<%',
-            block_end_string='%>',
-            variable_start_string='<<',
-            variable_end_string='>>',
-            autoescape=False  # Handle escaping manually
-        )
-        tex_template = env.get_template(os.path.basename(TEX_TEMPLATE_PATH))
-
         # Escape LaTeX special characters, excluding cover_letter_content
         escaped_data = escape_context(cover_letter_data)
 
-        # Render the LaTeX template with the AI-generated data
-        rendered_tex = tex_template.render(escaped_data)
+        # Render the LaTeX template (compiled once per process) with the AI-generated data
+        rendered_tex = template_registry.render("cover_letter", escaped_data)
 
         # Log the rendered LaTeX content for debugging
         logging.debug("Rendered LaTeX Content:\n%s", rendered_tex)
@@ -402,24 +404,71 @@ def generate_tex(cover_letter_data):
             output_file.write(rendered_tex)
 
         logging.info("✅ LaTeX file generated successfully.")
+        return rendered_tex
     except Exception as e:
         logging.error("Error generating LaTeX file: %s", e)
+        return None
 
 
 ###############################################################################
 # **📄 Compile LaTeX to PDF**
 ###############################################################################
-def compile_tex_to_pdf():
-    """Compiles the LaTeX file to PDF using pdflatex."""
+def compile_tex_to_pdf(tex_source=None, pdf_path=OUTPUT_PDF_PATH):
+    """
+    Compiles the LaTeX cover letter to PDF using pdflatex.
+
+    The compilation runs in an isolated working directory (see latex_compiler), so concurrent
+    jobs never overwrite each other's auxiliary files.
+
+    Args:
+        tex_source (str, optional): The rendered LaTeX (defaults to the contents of OUTPUT_TEX_PATH).
+        pdf_path (str): Where to write the PDF.
+
+    Returns:
+        bytes: The PDF content, or None if compilation failed.
+    """
+    try:
+        if tex_source is None:
+            with open(OUTPUT_TEX_PATH, "r", encoding="utf-8") as tex_file:
+                tex_source = tex_file.read()
+        pdf_bytes = latex_compiler.compile_pdf(tex_source, jobname="generated_cover_letter")
+        latex_compiler.write_pdf(pdf_bytes, pdf_path)
+        logging.info("✅ Cover letter successfully generated: %s", pdf_path)
+        return pdf_bytes
+    except latex_compiler.LatexCompilationError as e:
+        logging.error("❌ LaTeX compilation failed: %s", e)
+        logging.error("LaTeX Log:\n%s", e.log)
+        return None
+
+
+###############################################################################
+# **📦 Render to PDF (with the artifact store)**
+###############################################################################
+def generate_pdf(cover_letter_data, pdf_path=OUTPUT_PDF_PATH, tex_path=OUTPUT_TEX_PATH, progress=None):
+    """
+    Renders and compiles the cover letter, reusing the stored PDF when the identical
+    letter was built before with the same template.
+
+    The optional progress callback is called with "render" and "compile" as those stages start.
+
+    Returns:
+        bytes: The PDF content, or None if rendering or compilation failed.
+    """
     try:
-        command = ["pdflatex", "-interaction=nonstopmode", "-output-directory=output", OUTPUT_TEX_PATH]
-        process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
-        logging.info("✅ Cover letter successfully generated: %s", OUTPUT_PDF_PATH)
-    except subprocess.CalledProcessError as e:
-        logging.error("❌ LaTeX compilation failed.")
-        logging.error("Return Code: %s", e.returncode)
-        logging.error("Stdout: %s", e.stdout.decode('utf-8'))
-        logging.error("Stderr: %s", e.stderr.decode('utf-8'))
+        escaped_data = escape_context(cover_letter_data)
+        pdf_bytes = pdf_store.render_pdf("cover_letter", escaped_data, jobname="generated_cover_letter",
+                                         tex_path=tex_path, progress=progress)
+        latex_compiler.write_pdf(pdf_bytes, pdf_path)
+        logging.info("✅ Cover letter successfully generated: %s", pdf_path)
+        return pdf_bytes
+    except latex_compiler.LatexCompilationError as e:
+        logging.error("❌ LaTeX compilation failed: %s", e)
+        logging.error("LaTeX Log:\n%s", e.log)
+    except job_queue.LeaseLostError:
+        raise  # Raised by a job worker's progress callback; the worker stops the job
+    except Exception as e:
+        logging.error("Error generating cover letter PDF: %s", e)
+    return None
 
 
 ###############################################################################
@@ -452,9 +501,9 @@ def main():
         return
 
     # Step 3: Generate LaTeX and Compile to PDF
-    generate_tex(cover_letter_data)
-    compile_tex_to_pdf()
+    generate_pdf(cover_letter_data)
 
 
 if __name__ == "__main__":
+    configure_logging()
     main()
@@ -1,27 +1,35 @@
 import os
 import json
 import re
-import subprocess
 import logging
-from typing import Dict, Any
+from typing import Callable, Dict, Any, List, Optional
 
-import google.generativeai as genai
-from jinja2 import Template
-from pylatexenc.latexencode import utf8tolatex
+
+import job_queue
+import latex_compiler
+import latex_escape
+import llm_cache
+import pdf_store
+import tracing
 
 ###############################################################################
 # 1) Configure Logging
 ###############################################################################
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler("resume_generator.log"),
-        logging.StreamHandler()
-    ]
-)
+LOG_FILE = "resume_generator.log"
+
 logger = logging.getLogger(__name__)
 
+def configure_logging(log_file: Optional[str] = LOG_FILE, level: int = logging.INFO) -> None:
+    """
+    Sends log records to the console and, unless log_file is None, to a log file.
+
+    Called by the command-line entry points only; importing this module leaves logging untouched.
+    """
+    handlers: List[logging.Handler] = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file))
+    logging.basicConfig(level=level, format="%(asctime)s [%(levelname)s] %(message)s", handlers=handlers)
+
 ###############################################################################
 # 2) Configure Google Gemini API
 ###############################################################################
@@ -33,12 +41,14 @@ def configure_gemini_api():
     if not api_key:
         logger.error("Google Gemini API key not found. Please set the 'GOOGLE_GEMINI_API_KEY' environment variable.")
         raise EnvironmentError("GOOGLE_GEMINI_API_KEY environment variable not set.")
+    import google.generativeai as genai
     genai.configure(api_key=api_key)
     logger.info("Google Gemini API configured successfully.")
 
 ###############################################################################
 # 3) Generate Resume JSON
 ###############################################################################
+@tracing.traced("resume.tailor")
 def generate_resume_json(applicant_data: Dict[str, Any], job_description: str) -> Dict[str, Any]:
     """
     Calls Google Gemini API to generate a tailored resume JSON object based on the applicant's data and job description.
@@ -76,47 +86,65 @@ def generate_resume_json(applicant_data: Dict[str, Any], job_description: str) -
     """
 
     try:
-        model = genai.GenerativeModel("gemini-pro")
-        response = model.generate_content(prompt)
-        answer = response.text.strip()
+        # A response that does not parse is never cached, so the next call asks the model again
+        answer = llm_cache.generate_content(prompt, validate=_is_resume_response).strip()
         logger.info("AI Model Response:\n%s", answer)
     except Exception as e:
         logger.error("Error while generating content from AI model: %s", e)
         raise
 
+    try:
+        resume_data = parse_resume_response(answer)
+    except ValueError as e:
+        logger.error("%s", e)
+        raise
+    logger.info("Successfully parsed JSON.")
+    return resume_data
+
+def parse_resume_response(answer: str) -> Dict[str, Any]:
+    """
+    Extracts the resume JSON object from a model response.
+
+    Args:
+        answer (str): The model's response text.
+
+    Returns:
+        Dict[str, Any]: The parsed resume.
+
+    Raises:
+        ValueError: If the response contains no JSON object or it cannot be parsed.
+    """
     # Extract JSON using regex
-    json_str = ""
     json_match = re.search(r'```json\s*(\{.*\})\s*```', answer, re.DOTALL)
     if json_match:
         json_str = json_match.group(1).strip()
-        logger.info("Extracted JSON using ```json``` block.")
+        logger.debug("Extracted JSON using ```json``` block.")
     else:
         json_match = re.search(r'\{.*\}', answer, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(0).strip()
-            logger.info("Extracted JSON using general braces.")
-        else:
-            logger.error("No JSON object found in the AI model's response.")
+        if not json_match:
             raise ValueError("No JSON object found in the response.")
+        json_str = json_match.group(0).strip()
+        logger.debug("Extracted JSON using general braces.")
 
     # Attempt to parse the extracted JSON
     try:
-        resume_data = json.loads(json_str)
-        logger.info("Successfully parsed JSON.")
-        return resume_data
+        return json.loads(json_str)
     except json.JSONDecodeError as e:
-        logger.error("JSON Decode Error: %s", e)
-        logger.info("Attempting to clean the JSON string...")
-
-        # Attempt to fix common JSON issues (e.g., missing quotes)
-        json_str_fixed = re.sub(r'(\w+):', r'"\1":', json_str)
-        try:
-            resume_data = json.loads(json_str_fixed)
-            logger.info("Successfully parsed cleaned JSON.")
-            return resume_data
-        except json.JSONDecodeError as e2:
-            logger.error("Failed to parse cleaned JSON: %s", e2)
-            raise ValueError(f"Unable to parse JSON: {e2}")
+        logger.debug("JSON Decode Error: %s; attempting to clean the JSON string", e)
+
+    # Attempt to fix common JSON issues (e.g., missing quotes)
+    json_str_fixed = re.sub(r'(\w+):', r'"\1":', json_str)
+    try:
+        return json.loads(json_str_fixed)
+    except json.JSONDecodeError as e2:
+        raise ValueError(f"Unable to parse JSON: {e2}")
+
+def _is_resume_response(answer: str) -> bool:
+    try:
+        parse_resume_response(answer)
+    except ValueError:
+        return False
+    return True
 
 ###############################################################################
 # 4) Safe LaTeX Character Escaping
@@ -131,14 +159,14 @@ def escape_latex(s: str) -> str:
     Returns:
         str: The escaped string safe for LaTeX.
     """
-    return utf8tolatex(s)
+    return latex_escape.escape_latex(s)
 
 ###############################################################################
 # 5) Escape Context Data for LaTeX
 ###############################################################################
 def escape_context(context_dict: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Recursively escapes all strings in the dictionary for LaTeX compatibility.
+    Escapes all strings in the dictionary (at any nesting depth) for LaTeX compatibility.
 
     Args:
         context_dict (Dict[str, Any]): The dictionary containing resume data.
@@ -146,238 +174,97 @@ def escape_context(context_dict: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: The escaped dictionary.
     """
-    escaped_context = {}
-    for key, value in context_dict.items():
-        if isinstance(value, list):
-            escaped_context[key] = [
-                escape_latex(item) if isinstance(item, str) else escape_context(item) if isinstance(item, dict) else item
-                for item in value
-            ]
-        elif isinstance(value, dict):
-            escaped_context[key] = escape_context(value)
-        elif isinstance(value, str):
-            escaped_context[key] = escape_latex(value)
-        else:
-            escaped_context[key] = value
-    return escaped_context
+    return latex_escape.escape_context(context_dict)
 
 ###############################################################################
 # 6) LaTeX Resume Template
 ###############################################################################
-latex_template = r"""
-\documentclass[letterpaper,11pt]{article}
-
-\usepackage{latexsym}
-\usepackage[empty]{fullpage}
-\usepackage{titlesec}
-\usepackage{marvosym}
-\usepackage[usenames,dvipsnames]{color}
-\usepackage{verbatim}
-\usepackage{enumitem}
-\usepackage[hidelinks]{hyperref}
-\usepackage{fancyhdr}
-\usepackage[english]{babel}
-\usepackage{tabularx}
-\input{glyphtounicode}
-
-\pagestyle{fancy}
-\fancyhf{} % clear all header and footer fields
-\fancyfoot{}
-\renewcommand{\headrulewidth}{0pt}
-\renewcommand{\footrulewidth}{0pt}
-
-% Adjust margins
-\addtolength{\oddsidemargin}{-0.5in}
-\addtolength{\evensidemargin}{-0.5in}
-\addtolength{\textwidth}{1in}
-\addtolength{\topmargin}{-.5in}
-\addtolength{\textheight}{1.0in}
-
-\urlstyle{same}
-
-\raggedbottom
-\raggedright
-\setlength{\tabcolsep}{0in}
-
-% Sections formatting
-\titleformat{\section}{
-  \vspace{-4pt}\scshape\raggedright\large
-}{}{0em}{}[\color{black}\titlerule \vspace{-5pt}]
-
-% Ensure that generated PDF is machine readable / ATS parsable
-\pdfgentounicode=1
-
-%-------------------------
-% Custom commands
-{% raw %}
-\newcommand{\resumeItem}[1]{ \item\small{#1 \vspace{-2pt}} }
-
-\newcommand{\resumeSubheading}[4]{
-  \vspace{-2pt}\item
-    \begin{tabular*}{0.97\textwidth}[t]{l@{\extracolsep{\fill}}r}
-      \textbf{#1} & #2 \\
-      \textit{\small#3} & \textit{\small #4} \\
-    \end{tabular*}\vspace{-7pt}
-}
-
-\newcommand{\resumeItemListStart}{\begin{itemize}[leftmargin=*,label={}]}
-\newcommand{\resumeItemListEnd}{\end{itemize}\vspace{-5pt}}
-{% endraw %}
-\setlength{\footskip}{12pt} % Adjusted footskip
-
-\begin{document}
-
-%----------HEADING----------
-\begin{center}
-    {\Huge \textbf{\scshape {{ name | default("") }} }} \\ \vspace{4pt}
-
-    {% if contact %}
-        {% if contact.location or contact.phone or contact.email %}
-            {{ contact.location | default("") }}
-            {% if contact.phone %} $|$ {{ contact.phone }} {% endif %}
-            {% if contact.email %} $|$ \href{mailto:{{ contact.email }}}{\texttt{ {{ contact.email }} }} {% endif %}
-            \\ \vspace{4pt}
-        {% endif %}
-
-        {% if contact.linkedin or contact.github %}
-            {% if contact.linkedin %}
-                \href{https://{{ contact.linkedin }}}{\texttt{LinkedIn: {{ contact.linkedin }}}}
-            {% endif %}
-            {% if contact.github %}
-                $|$ \href{https://{{ contact.github }}}{\texttt{GitHub: {{ contact.github }}}}
-            {% endif %}
-        {% endif %}
-    {% endif %}
-\end{center}
-
-{% if summary %}
-%-----------SUMMARY-----------
-\section{Summary}
-\resumeItemListStart
-{% for item in summary %}
-    \resumeItem{ {{ item }} }
-{% endfor %}
-\resumeItemListEnd
-{% endif %}
-
-{% if skills %}
-%-----------TECHNICAL SKILLS-----------
-\section{Technical Skills}
-\resumeItemListStart
-{% for skill in skills %}
-    \resumeItem{ {{ skill }} }
-{% endfor %}
-\resumeItemListEnd
-{% endif %}
-
-{% if education %}
-%-----------EDUCATION-----------
-\section{Education}
-\resumeItemListStart
-{% for edu in education %}
-    \resumeSubheading{ {{ edu.degree }} }{ {{ edu.institution }} }{ {{ edu.years }} }{ {{ edu.location }} }
-    {% if edu.details %}
-    \resumeItemListStart
-    {% for detail in edu.details %}
-        \resumeItem{ {{ detail }} }
-    {% endfor %}
-    \resumeItemListEnd
-    {% endif %}
-{% endfor %}
-\resumeItemListEnd
-{% endif %}
-
-{% if experience %}
-%-----------EXPERIENCE-----------
-\section{Experience}
-\resumeItemListStart
-{% for exp in experience %}
-    \resumeSubheading{ {{ exp.position }} }{ {{ exp.company }} }{ {{ exp.years }} }{ {{ exp.location }} }
-    {% if exp.details %}
-    \resumeItemListStart
-    {% for detail in exp.details %}
-        \resumeItem{ {{ detail }} }
-    {% endfor %}
-    \resumeItemListEnd
-    {% endif %}
-{% endfor %}
-\resumeItemListEnd
-{% endif %}
-
-{% if projects %}
-%-----------PROJECTS-----------
-\section{Projects}
-\resumeItemListStart
-{% for proj in projects %}
-    \resumeSubheading{ {{ proj.title }} }{ {{ proj.tech_stack }} }{ {{ proj.years }} }{ {{ proj.location }} }
-    {% if proj.details %}
-    \resumeItemListStart
-    {% for detail in proj.details %}
-        \resumeItem{ {{ detail }} }
-    {% endfor %}
-    \resumeItemListEnd
-    {% endif %}
-{% endfor %}
-\resumeItemListEnd
-{% endif %}
-
-{% if certifications %}
-%-----------CERTIFICATIONS-----------
-\section{Certifications}
-\resumeItemListStart
-{% for cert in certifications %}
-    \resumeItem{ \href{ {{ cert.link }} }{ {{ cert.name }} } }
-{% endfor %}
-\resumeItemListEnd
-{% endif %}
-
-{% if publications %}
-%-----------PUBLICATIONS-----------
-\section{Publications}
-\resumeItemListStart
-{% for pub in publications %}
-    \resumeItem{ \href{ {{ pub.link }} }{ {{ pub.title }} } }
-{% endfor %}
-\resumeItemListEnd
-{% endif %}
-
-\end{document}
-"""
+# The resume template lives in templates/resume_template.tex and is compiled once per
+# process by template_registry (see template_registry.render("resume", ...)).
 
 ###############################################################################
 # 7) Compile LaTeX to PDF
 ###############################################################################
-def compile_latex(tex_filename: str):
+def compile_latex_source(tex_source: str, pdf_filename: str) -> Optional[bytes]:
+    """
+    Compiles LaTeX source into a PDF.
+
+    The compilation runs in an isolated working directory (see latex_compiler), so concurrent
+    jobs never overwrite each other's auxiliary files; only the final PDF is written out.
+
+    Args:
+        tex_source (str): The rendered LaTeX document.
+        pdf_filename (str): Where to write the PDF.
+
+    Returns:
+        bytes: The PDF content, or None if compilation failed.
+    """
+    jobname = os.path.splitext(os.path.basename(pdf_filename))[0]
+    try:
+        # Single pass unless the log reports cross-references that need another run
+        pdf_bytes = latex_compiler.compile_pdf(tex_source, jobname=jobname)
+    except latex_compiler.LatexCompilationError as e:
+        logger.error(f"❌ LaTeX Compilation Failed: {e}")
+        # Display the LaTeX log for debugging
+        if e.log:
+            logger.error("\n--- LaTeX Log ---\n%s\n--- End of Log ---\n", e.log)
+        else:
+            logger.error("❌ LaTeX log file not found.")
+        return None
+
+    latex_compiler.write_pdf(pdf_bytes, pdf_filename)
+    logger.info("✅ PDF Resume Successfully Generated!")
+    return pdf_bytes
+
+
+def compile_latex(tex_filename: str, pdf_filename: Optional[str] = None) -> Optional[bytes]:
     """
     Compiles a LaTeX file into a PDF.
 
     Args:
         tex_filename (str): The path to the .tex file.
+        pdf_filename (str, optional): Where to write the PDF (defaults to the .tex path with a .pdf extension).
 
     Returns:
-        None
+        bytes: The PDF content, or None if compilation failed.
     """
-    pdflatex_path = "pdflatex"  # Ensure pdflatex is installed and accessible
+    with open(tex_filename, "r", encoding="utf-8") as tex_file:
+        tex_source = tex_file.read()
+    return compile_latex_source(tex_source, pdf_filename or os.path.splitext(tex_filename)[0] + ".pdf")
 
+def render_resume_pdf(escaped_resume: Dict[str, Any], pdf_filename: str, tex_filename: Optional[str] = None,
+                      progress: Optional[Callable[[str], None]] = None) -> Optional[bytes]:
+    """
+    Renders and compiles an escaped resume, reusing the stored PDF when the identical
+    resume was built before with the same template.
+
+    Args:
+        escaped_resume (dict): The LaTeX-escaped resume data.
+        pdf_filename (str): Where to write the PDF.
+        tex_filename (str, optional): Where to write the rendered LaTeX (only written when rendered).
+        progress (Callable[[str], None], optional): Called with "render" and "compile" as those stages start.
+
+    Returns:
+        bytes: The PDF content, or None if rendering or compilation failed.
+    """
+    jobname = os.path.splitext(os.path.basename(pdf_filename))[0]
     try:
-        for i in range(2):  # Run twice for proper references
-            result = subprocess.run(
-                [pdflatex_path, "-interaction=nonstopmode", tex_filename],
-                check=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-        logger.info("✅ PDF Resume Successfully Generated!")
-    except subprocess.CalledProcessError as e:
+        pdf_bytes = pdf_store.render_pdf("resume", escaped_resume, jobname=jobname, tex_path=tex_filename,
+                                         progress=progress)
+    except latex_compiler.LatexCompilationError as e:
         logger.error(f"❌ LaTeX Compilation Failed: {e}")
-        # Attempt to read and display the LaTeX log for debugging
-        log_filename = tex_filename.replace(".tex", ".log")
-        if os.path.exists(log_filename):
-            with open(log_filename, "r", encoding="utf-8") as log_file:
-                log_content = log_file.read()
-                logger.error("\n--- LaTeX Log ---\n%s\n--- End of Log ---\n", log_content)
-        else:
-            logger.error("❌ LaTeX log file not found.")
+        if e.log:
+            logger.error("\n--- LaTeX Log ---\n%s\n--- End of Log ---\n", e.log)
+        return None
+    except job_queue.LeaseLostError:
+        raise  # Raised by a job worker's progress callback; the worker stops the job
+    except Exception as e:
+        logger.error("Error rendering LaTeX template: %s", e)
+        return None
+
+    latex_compiler.write_pdf(pdf_bytes, pdf_filename)
+    logger.info("✅ PDF Resume Successfully Generated!")
+    return pdf_bytes
 
 ###############################################################################
 # 8) Main Function
@@ -615,31 +502,8 @@ Nous offrons également des mesures d’adaptation pendant toutes les étapes du
         logger.error("Error escaping LaTeX characters: %s", e)
         return
 
-    # Step 4: Render LaTeX Template with Escaped Data
-    try:
-        logger.info("Rendering LaTeX template with escaped resume data...")
-        template = Template(latex_template)
-        filled_latex = template.render(escaped_resume)
-    except Exception as e:
-        logger.error("Error rendering LaTeX template: %s", e)
-        return
-
-    # Step 5: Write Rendered LaTeX to .tex File
-    tex_filename = "generated_resume.tex"
-    try:
-        logger.info(f"Writing rendered LaTeX to {tex_filename}...")
-        with open(tex_filename, "w", encoding="utf-8") as f:
-            f.write(filled_latex)
-    except Exception as e:
-        logger.error(f"Error writing LaTeX to file {tex_filename}: %s", e)
-        return
-
-    # Step 6: Compile LaTeX to PDF
-    try:
-        logger.info(f"Compiling {tex_filename} to PDF...")
-        compile_latex(tex_filename)
-    except Exception as e:
-        logger.error(f"Error during LaTeX compilation: {e}")
+    # Step 4: Render and Compile to PDF (identical documents are served from the PDF artifact store)
+    if render_resume_pdf(escaped_resume, "generated_resume.pdf", tex_filename="generated_resume.tex") is None:
         return
 
     logger.info("✅ Resume generation process completed successfully.")
@@ -648,4 +512,5 @@ Nous offrons également des mesures d’adaptation pendant toutes les étapes du
 # 9) Entry Point
 ###############################################################################
 if __name__ == "__main__":
+    configure_logging()
     main()
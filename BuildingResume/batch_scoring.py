@@ -0,0 +1,158 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+import job_registry
+import resume_evaluator
+
+logger = logging.getLogger(__name__)
+
+# Per-worker state, filled in once by _init_worker
+_worker_state: Dict[str, Any] = {}
+
+
+###############################################################################
+# 1) Worker Setup
+###############################################################################
+def _init_worker(job_description: str, job_keywords: set, formatting_rules: Dict[str, Any], describe: bool):
+    """Configures Gemini and stores the shared job artifacts once per worker process."""
+    resume_evaluator.configure_gemini_api()
+    _worker_state.update(
+        job_description=job_description,
+        job_keywords=job_keywords,
+        formatting_rules=formatting_rules,
+        describe=describe,
+    )
+
+
+def load_document_text(path: str) -> str:
+    """Reads a resume or job description from a PDF or plain-text file."""
+    if path.lower().endswith(".pdf"):
+        return resume_evaluator.extract_text_from_pdf(path) or ""
+    with open(path, "r", encoding="utf-8") as file:
+        return file.read()
+
+
+def _score_one(index: int, resume_path: str) -> Dict[str, Any]:
+    """Scores a single resume inside a worker process and records stage timings."""
+    started = time.perf_counter()
+    record: Dict[str, Any] = {"index": index, "resume": resume_path}
+    try:
+        resume_text = load_document_text(resume_path)
+        extracted = time.perf_counter()
+        if not resume_text:
+            raise ValueError("Could not extract text from the resume.")
+
+        analysis = resume_evaluator.analyze_resume(
+            resume_text,
+            _worker_state["job_description"],
+            _worker_state["formatting_rules"],
+            job_keywords=_worker_state["job_keywords"],
+            describe=_worker_state["describe"],
+        )
+        finished = time.perf_counter()
+
+        job_keywords = analysis["job_keywords"]
+        resume_keywords = analysis["resume_keywords"]
+        record.update(
+            final_score=analysis["final_score"],
+            match_score=analysis["match_score"],
+            total_score_formatting=analysis["total_score_formatting"],
+            heading_score=analysis["heading_score"],
+            star_score=analysis["star_score"],
+            missing_headings=analysis["missing_headings"],
+            matched_keywords=sorted(job_keywords & resume_keywords),
+            missing_keywords=sorted(job_keywords - resume_keywords),
+            matched_summary=analysis["matched_keywords"],
+            missing_summary=analysis["missing_keywords"],
+            timings={
+                "extract_seconds": extracted - started,
+                "analyze_seconds": finished - extracted,
+                "total_seconds": finished - started,
+            },
+        )
+    except Exception as e:
+        logger.error("Failed to score %s: %s", resume_path, e)
+        record.update(error=str(e), timings={"total_seconds": time.perf_counter() - started})
+    return record
+
+
+###############################################################################
+# 2) Batch API
+###############################################################################
+def score_batch(resumes: Iterable[str], job_description: str, formatting_rules: Optional[Dict[str, Any]] = None,
+                workers: Optional[int] = None, describe: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Scores many resumes against one job description.
+
+    The job keywords are loaded once in the parent process from the job registry (extracted only
+    for a posting not seen before); the resumes are then scored in parallel across a process pool
+    and yielded as soon as each one finishes.
+
+    Args:
+        resumes (Iterable[str]): Paths to resume PDFs or text files.
+        job_description (str): Text of the job description.
+        formatting_rules (dict, optional): Formatting rules (defaults to resume_evaluator.DEFAULT_FORMATTING_RULES).
+        workers (int, optional): Number of worker processes (defaults to the CPU count).
+        describe (bool): Also generate the matched/missing feedback sentences (two extra LLM calls per resume).
+
+    Yields:
+        dict: One result per resume, including its index, scores, keywords and per-stage timings.
+    """
+    formatting_rules = formatting_rules or resume_evaluator.DEFAULT_FORMATTING_RULES
+
+    started = time.perf_counter()
+    job_keywords = job_registry.get_job_keywords(job_description)
+    logger.info("Loaded %d job keywords in %.2fs.", len(job_keywords), time.perf_counter() - started)
+
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        initializer=_init_worker,
+        initargs=(job_description, job_keywords, formatting_rules, describe),
+    ) as executor:
+        futures = [executor.submit(_score_one, index, path) for index, path in enumerate(resumes)]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+###############################################################################
+# 3) Command Line Interface
+###############################################################################
+def main(argv=None):
+    """
+    Scores resumes against a job description and streams the results as JSONL.
+    """
+    parser = argparse.ArgumentParser(description="Score many resumes against one job description.")
+    parser.add_argument("job_description", help="Path to the job description (.txt or .pdf).")
+    parser.add_argument("resumes", nargs="+", help="Paths to resume PDFs or text files.")
+    parser.add_argument("-o", "--output", help="Write JSONL results to this file instead of stdout.")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Number of worker processes.")
+    parser.add_argument("--describe", action="store_true", help="Generate matched/missing feedback sentences.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    resume_evaluator.configure_gemini_api()
+
+    job_description = load_document_text(args.job_description)
+    if not job_description:
+        logger.error("Job description is missing or invalid.")
+        return 1
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for record in score_batch(args.resumes, job_description, workers=args.workers, describe=args.describe):
+            output.write(json.dumps(record) + "\n")
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+LaTeX escaping microbenchmark: the previous recursive escape_context (utf8tolatex on every
+string) vs. latex_escape (translation-table fast path, non-ASCII fallback, memoization).
+
+Usage:
+    python benchmarks/bench_escape.py [--iterations N]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+MODULE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, MODULE_DIR)
+
+from pylatexenc.latexencode import utf8tolatex  # noqa: E402
+
+import latex_escape  # noqa: E402
+
+
+def legacy_escape_context(context_dict):
+    """The escape_context implementation previously found in Resume.py."""
+    escaped_context = {}
+    for key, value in context_dict.items():
+        if isinstance(value, list):
+            escaped_context[key] = [
+                utf8tolatex(item) if isinstance(item, str) else legacy_escape_context(item) if isinstance(item, dict) else item
+                for item in value
+            ]
+        elif isinstance(value, dict):
+            escaped_context[key] = legacy_escape_context(value)
+        elif isinstance(value, str):
+            escaped_context[key] = utf8tolatex(value)
+        else:
+            escaped_context[key] = value
+    return escaped_context
+
+
+def check_equivalence(resume):
+    samples = [
+        "C++ & C# developer, 100% on-call ~ $5k_budget {a} <b> \"q\" ^ \\",
+        "Café – naïve résumé “quoted” • bullet space",
+        "",
+    ]
+    for sample in samples:
+        assert latex_escape.escape_latex(sample) == utf8tolatex(sample), sample
+    assert latex_escape.escape_context(resume) == legacy_escape_context(resume)
+
+
+def timed(function, resume, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        function(resume)
+    return (time.perf_counter() - started) / iterations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    with open(os.path.join(MODULE_DIR, "tailored_resume.json"), "r", encoding="utf-8") as file:
+        resume = json.load(file)
+    check_equivalence(resume)
+
+    legacy = timed(legacy_escape_context, resume, args.iterations)
+    latex_escape.escape_latex.cache_clear()
+    cold = timed(latex_escape.escape_context, resume, 1)
+    warm = timed(latex_escape.escape_context, resume, args.iterations)
+
+    print(f"{'legacy utf8tolatex recursion':<32} {legacy * 1e6:10.1f} µs/document")
+    print(f"{'latex_escape (cold memo)':<32} {cold * 1e6:10.1f} µs/document")
+    print(f"{'latex_escape (warm memo)':<32} {warm * 1e6:10.1f} µs/document")
+    print(f"speedup (warm): {legacy / warm:.1f}x")
+    print(f"memo: {latex_escape.escape_latex.cache_info()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
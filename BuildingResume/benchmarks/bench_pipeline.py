@@ -0,0 +1,237 @@
+"""
+End-to-end pipeline benchmark: replays a corpus of resume PDFs and job descriptions through
+analyze_resume, process_resume and process_cover_letter with recorded model responses, so no
+request reaches Gemini.
+
+Responses come from the recording file (--recording, by default benchmarks/recorded_responses.json
+when it exists); run once with --record to capture real Gemini responses into it. Without a
+recording, or with --stub, every prompt is answered by the offline stub_llm.StubBackend.
+The LLM response cache and the PDF artifact store are bypassed and the job registry is emptied
+before every run, so each run pays for every stage.
+
+Reports per workload: throughput, p50/p95 latency and tracemalloc peak memory; per traced stage
+(see tracing): call count and p50/p95 latency.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--resumes PDF ...] [--jobs TXT ...] [--iterations N]
+        [--workloads analyze_resume process_resume process_cover_letter] [--recording PATH]
+        [--record | --stub] [--replay-latency] [--no-memory] [--json PATH] [--baseline PATH [--tolerance F]]
+
+Exits with status 1 when any run fails, when a workload has no successful run, when a replayed
+recording misses prompts, or when a workload's p95 latency exceeds the baseline report's by more
+than the tolerance.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+MODULE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, MODULE_DIR)
+
+# Every run compiles its PDF instead of being served from the artifact store
+os.environ.setdefault("RESUME_PDF_STORE", "0")
+
+import job_registry  # noqa: E402
+import llm_cache  # noqa: E402
+import resume_evaluator  # noqa: E402
+import ResumePDF2ResumePDF  # noqa: E402
+import stub_llm  # noqa: E402
+import tracing  # noqa: E402
+
+DEFAULT_RECORDING = os.path.join(MODULE_DIR, "benchmarks", "recorded_responses.json")
+
+
+def run_analyze_resume(pdf_path, job_description, workdir):
+    layout = resume_evaluator.extract_layout_from_pdf(pdf_path)
+    return resume_evaluator.analyze_resume(layout.text, job_description, resume_evaluator.DEFAULT_FORMATTING_RULES,
+                                           layout=layout)
+
+
+def run_process_resume(pdf_path, job_description, workdir):
+    return ResumePDF2ResumePDF.process_resume(pdf_path, job_description,
+                                              pdf_filename=os.path.join(workdir, "resume.pdf"),
+                                              tex_filename=os.path.join(workdir, "resume.tex"))
+
+
+def run_process_cover_letter(pdf_path, job_description, workdir):
+    return ResumePDF2ResumePDF.process_cover_letter(pdf_path, job_description,
+                                                    pdf_filename=os.path.join(workdir, "cover_letter.pdf"),
+                                                    tex_filename=os.path.join(workdir, "cover_letter.tex"))
+
+
+WORKLOADS = {
+    "analyze_resume": run_analyze_resume,
+    "process_resume": run_process_resume,
+    "process_cover_letter": run_process_cover_letter,
+}
+
+
+def run_once(workload, pdf_path, job_description, workdir):
+    """Runs one document through a workload from an empty job registry; returns its duration, or None if it failed."""
+    job_registry.set_registry(job_registry.JobRegistry(":memory:"))
+    started = time.perf_counter()
+    try:
+        result = WORKLOADS[workload](pdf_path, job_description, workdir)
+    except Exception as e:
+        logging.error("%s failed on %s: %s", workload, pdf_path, e)
+        return None
+    duration = time.perf_counter() - started
+    return duration if result is not None else None
+
+
+def peak_memory(workload, corpus, workdir):
+    """Returns the largest tracemalloc peak (bytes) of one run of the workload over the corpus."""
+    peak = 0
+    tracemalloc.start()
+    try:
+        for pdf_path, job_description in corpus:
+            tracemalloc.reset_peak()
+            run_once(workload, pdf_path, job_description, workdir)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def failed_workloads(report):
+    """Returns a message for every workload with failed runs or without a single successful run."""
+    failed = []
+    for workload, stats in report["workloads"].items():
+        if stats["failures"] or not stats["count"]:
+            failed.append(f"{workload}: {stats['failures']} of {stats['failures'] + stats['count']} runs failed")
+    return failed
+
+
+def compare(report, baseline, tolerance):
+    """Returns a message for every workload whose p95 latency regressed beyond the tolerance."""
+    regressions = []
+    for workload, stats in report["workloads"].items():
+        previous = baseline.get("workloads", {}).get(workload)
+        if previous and previous["p95"] and stats["p95"] > previous["p95"] * (1 + tolerance):
+            regressions.append(f"{workload}: p95 {stats['p95'] * 1000:.1f} ms vs. baseline "
+                               f"{previous['p95'] * 1000:.1f} ms ({stats['p95'] / previous['p95'] - 1:+.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", nargs="+", default=[os.path.join(MODULE_DIR, "CSYRM.pdf")],
+                        help="Resume PDFs to replay.")
+    parser.add_argument("--jobs", nargs="+", default=[os.path.join(MODULE_DIR, "data", "job_description.txt")],
+                        help="Job description text files; every resume is run against every job.")
+    parser.add_argument("--iterations", type=int, default=3, help="Timed passes over the corpus per workload.")
+    parser.add_argument("--workloads", nargs="+", choices=sorted(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument("--recording", help="JSON file of recorded model responses "
+                                            "(default: benchmarks/recorded_responses.json, when it exists).")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", action="store_true",
+                      help="Send unrecorded prompts to Gemini and save the responses to the recording.")
+    mode.add_argument("--stub", action="store_true", help="Answer every prompt with the offline stub.")
+    parser.add_argument("--replay-latency", action="store_true", help="Sleep for each response's recorded latency.")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory pass.")
+    parser.add_argument("--json", help="Write the report to this file (usable as a later --baseline).")
+    parser.add_argument("--baseline", help="Report of an earlier run to compare p95 latencies against.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p95 slowdown over the baseline.")
+    args = parser.parse_args(argv)
+    recording = args.recording
+    if recording is None and (args.record or os.path.exists(DEFAULT_RECORDING)):
+        recording = DEFAULT_RECORDING
+    if args.stub:
+        recording = None
+    elif recording and not args.record and not os.path.exists(recording):
+        parser.error(f"recording {recording} does not exist; capture it first with --record")
+    # Resume and Coverletter log every stage at INFO, which would swamp the report
+    logging.getLogger().setLevel(logging.WARNING)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    if args.record:
+        resume_evaluator.configure_gemini_api()
+        backend = stub_llm.RecordedBackend(recording, fallback=llm_cache.GeminiBackend(), record=True)
+    else:
+        # Without a recording there is nothing to replay and every prompt goes to the stub
+        backend = stub_llm.RecordedBackend(recording, fallback=stub_llm.StubBackend(),
+                                           replay_latency=args.replay_latency)
+    llm_cache.set_backend(backend)
+    llm_cache.set_cache(llm_cache.NullCache())
+
+    corpus = []
+    for job_path in args.jobs:
+        with open(job_path, "r", encoding="utf-8") as file:
+            job_description = file.read()
+        corpus += [(pdf_path, job_description) for pdf_path in args.resumes]
+
+    report = {"corpus": {"resumes": args.resumes, "jobs": args.jobs}, "iterations": args.iterations, "workloads": {}}
+    with tempfile.TemporaryDirectory(prefix="bench-pipeline-") as workdir:
+        # One untimed pass loads spaCy, compiles the templates and builds the LaTeX formats
+        for workload in args.workloads:
+            for pdf_path, job_description in corpus:
+                run_once(workload, pdf_path, job_description, workdir)
+        tracing.tracer.reset()
+
+        for workload in args.workloads:
+            latencies = tracing.Histogram()
+            failures = 0
+            for _ in range(args.iterations):
+                for pdf_path, job_description in corpus:
+                    duration = run_once(workload, pdf_path, job_description, workdir)
+                    if duration is None:
+                        failures += 1
+                    else:
+                        latencies.observe(duration)
+            stats = latencies.snapshot()
+            stats.update(failures=failures, throughput=stats["count"] / stats["sum"] if stats["sum"] else 0.0)
+            report["workloads"][workload] = stats
+        metrics = tracing.export_json()
+        report["stages"] = metrics["stages"]
+        report["counters"] = metrics["counters"]
+
+        if not args.no_memory:
+            for workload in args.workloads:
+                report["workloads"][workload]["peak_memory_bytes"] = peak_memory(workload, corpus, workdir)
+
+    report["responses"] = {"recording": recording, "replayed": backend.replayed, "unrecorded": backend.unrecorded}
+    if args.record:
+        backend.save()
+
+    print(f"{'workload':<22} {'runs':>5} {'failed':>6} {'docs/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'peak MiB':>9}")
+    for workload, stats in report["workloads"].items():
+        peak = stats.get("peak_memory_bytes")
+        print(f"{workload:<22} {stats['count']:>5} {stats['failures']:>6} {stats['throughput']:>8.2f} "
+              f"{stats['p50'] * 1000:>9.1f} {stats['p95'] * 1000:>9.1f} "
+              f"{peak / 2 ** 20 if peak is not None else float('nan'):>9.1f}")
+    print()
+    print(f"{'stage':<40} {'calls':>6} {'p50 ms':>9} {'p95 ms':>9}")
+    for stage in report["stages"]:
+        labels = ",".join(f"{key}={value}" for key, value in stage["labels"].items())
+        name = f"{stage['stage']}{{{labels}}}" if labels else stage["stage"]
+        print(f"{name:<40} {stage['count']:>6} {stage['p50'] * 1000:>9.1f} {stage['p95'] * 1000:>9.1f}")
+    print()
+    print(f"model responses: {backend.replayed} replayed, {backend.unrecorded} from "
+          f"{'Gemini' if args.record else 'the stub'}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+    failed = failed_workloads(report)
+    if recording and not args.record and backend.unrecorded:
+        # A recording that misses prompts benchmarks the stub instead of the recorded pipeline
+        failed.append(f"recording: {backend.unrecorded} prompt(s) had no recorded response in {recording}")
+    for failure in failed:
+        print(f"FAILED {failure}")
+    regressions = compare(report, baseline, args.tolerance) if baseline is not None else []
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if failed or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
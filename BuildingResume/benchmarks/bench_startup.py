@@ -0,0 +1,126 @@
+"""
+Startup-time benchmark for the scoring path and the generators.
+
+Measures, each in a fresh interpreter started in an empty directory:
+  * the cold import time of each module (those on the scoring path must stay within the import budget),
+  * import side effects: files created (e.g. log files), root log handlers installed, and heavy
+    dependencies (model SDK, spaCy, nltk) loaded before they are needed,
+  * the first-use cost of each spaCy pipe set (CLEAN_TEXT_PIPES, EXTRACT_INFO_PIPES, full pipeline).
+
+Usage:
+    python benchmarks/bench_startup.py [--import-budget SECONDS] [--repeat N] [--skip-spacy]
+
+Exits with status 1 when a scoring-path module's median import time exceeds the budget,
+or when importing any module has a side effect.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+MODULE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(MODULE_DIR)
+
+# (module, on the scoring path); main is the repository-level scorer
+MODULES = (
+    ("resume_evaluator", True),
+    ("main", True),
+    ("batch_scoring", True),
+    ("Resume", False),
+    ("Coverletter", False),
+    ("ResumePDF2ResumePDF", False),
+)
+
+# Loaded on first use only; importing any of these at module import time is a side effect
+HEAVY_MODULES = ("google.generativeai", "spacy", "nltk")
+
+IMPORT_SNIPPET = """
+import json, logging, os, sys, time
+sys.path[:0] = {paths!r}
+before = set(os.listdir("."))
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": seconds,
+    "files": sorted(set(os.listdir(".")) - before),
+    "log_handlers": len(logging.getLogger().handlers),
+    "heavy": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+LOAD_SNIPPET = """
+import json, time
+import resume_evaluator
+pipes = {pipes}
+start = time.perf_counter()
+nlp = resume_evaluator.get_nlp(pipes)
+loaded = time.perf_counter()
+nlp("Software engineer with Python experience at Motorola Solutions in Ottawa.")
+print(json.dumps({{"seconds": loaded - start, "first_doc_seconds": time.perf_counter() - loaded,
+                  "pipes": nlp.pipe_names}}))
+"""
+
+
+def run_snippet(snippet, cwd=MODULE_DIR):
+    """Runs a snippet in a fresh interpreter (inside the module directory by default) and returns its JSON output."""
+    result = subprocess.run(
+        [sys.executable, "-c", snippet], cwd=cwd, check=True, stdout=subprocess.PIPE, text=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure_import(module, repeat):
+    """Returns the median cold import time of a module and the side effects seen on its first import."""
+    snippet = IMPORT_SNIPPET.format(paths=[MODULE_DIR, REPO_DIR], module=module, heavy=HEAVY_MODULES)
+    runs = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix="bench-startup-") as workdir:
+            runs.append(run_snippet(snippet, cwd=workdir))
+    side_effects = []
+    if runs[0]["files"]:
+        side_effects.append(f"created {', '.join(runs[0]['files'])}")
+    if runs[0]["log_handlers"]:
+        side_effects.append(f"installed {runs[0]['log_handlers']} root log handler(s)")
+    if runs[0]["heavy"]:
+        side_effects.append(f"imported {', '.join(runs[0]['heavy'])}")
+    return statistics.median(run["seconds"] for run in runs), side_effects
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--import-budget", type=float, default=2.0, help="Maximum median import time in seconds.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of fresh interpreters per measurement.")
+    parser.add_argument("--skip-spacy", action="store_true", help="Only measure imports, not spaCy pipe loading.")
+    args = parser.parse_args(argv)
+
+    failures = []
+    for module, scoring_path in MODULES:
+        seconds, side_effects = measure_import(module, args.repeat)
+        budget = f" (budget {args.import_budget * 1000:.0f} ms)" if scoring_path else ""
+        print(f"import {module}: median {seconds * 1000:.1f} ms{budget}"
+              + (f"; side effects: {'; '.join(side_effects)}" if side_effects else ""))
+        if scoring_path and seconds > args.import_budget:
+            failures.append(f"import {module} exceeds the budget")
+        failures += [f"import {module} {effect}" for effect in side_effects]
+
+    pipe_sets = () if args.skip_spacy else (("clean_text", "resume_evaluator.CLEAN_TEXT_PIPES"),
+                                            ("extract_resume_info", "resume_evaluator.EXTRACT_INFO_PIPES"),
+                                            ("full pipeline", "None"))
+    for label, pipes in pipe_sets:
+        runs = [run_snippet(LOAD_SNIPPET.format(pipes=pipes)) for _ in range(args.repeat)]
+        load = statistics.median(run["seconds"] for run in runs)
+        first_doc = statistics.median(run["first_doc_seconds"] for run in runs)
+        print(f"get_nlp({label}): load {load * 1000:.1f} ms, first doc {first_doc * 1000:.1f} ms, "
+              f"pipes={runs[0]['pipes']}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
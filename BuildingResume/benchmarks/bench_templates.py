@@ -0,0 +1,68 @@
+"""
+Template rendering benchmark: compiling the resume template per document (the old
+`Template(latex_template)` path) vs. the process-wide template registry.
+
+Usage:
+    python benchmarks/bench_templates.py [--documents N]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+MODULE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, MODULE_DIR)
+
+from jinja2 import Template  # noqa: E402
+
+import template_registry  # noqa: E402
+
+COVER_LETTER_CONTEXT = {
+    "applicant_name": "Jane Doe",
+    "applicant_email": "jane.doe@example.com",
+    "applicant_phone": "+1 613 555 0100",
+    "company_name": "Acme Corp",
+    "company_location": "Ottawa, ON",
+    "job_title": "Software Engineer Intern",
+    "cover_letter_content": "Dear Hiring Manager, \\\\ \nI am excited to apply. \\\\ \nSincerely",
+}
+
+
+def report(label, documents, seconds):
+    print(f"{label:<36} {documents / seconds:10.1f} docs/s  ({seconds / documents * 1000:.3f} ms/doc)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    with open(os.path.join(MODULE_DIR, "tailored_resume.json"), "r", encoding="utf-8") as file:
+        resume_context = json.load(file)
+    with open(os.path.join(template_registry.TEMPLATE_DIR, "resume_template.tex"), "r", encoding="utf-8") as file:
+        resume_source = file.read()
+
+    started = time.perf_counter()
+    for _ in range(args.documents):
+        Template(resume_source).render(resume_context)
+    report("resume: Template() per document", args.documents, time.perf_counter() - started)
+
+    started = time.perf_counter()
+    template_registry.get_template("resume")  # first-use compile, excluded from the steady-state rate
+    first_compile = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(args.documents):
+        template_registry.render("resume", resume_context)
+    report("resume: template_registry.render", args.documents, time.perf_counter() - started)
+    print(f"{'resume: registry first compile':<36} {first_compile * 1000:10.3f} ms")
+
+    started = time.perf_counter()
+    for _ in range(args.documents):
+        template_registry.render("cover_letter", COVER_LETTER_CONTEXT)
+    report("cover letter: template_registry.render", args.documents, time.perf_counter() - started)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,443 @@
+import argparse
+import base64
+import contextlib
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_PATH = os.getenv(
+    "RESUME_JOB_QUEUE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "job_queue.sqlite3"),
+)
+
+# Seconds an idle worker waits before polling for new jobs again
+POLL_INTERVAL = float(os.getenv("RESUME_JOB_POLL_INTERVAL", "0.5"))
+
+# A running job whose worker has not reported progress for this long is handed to another worker
+LEASE_SECONDS = float(os.getenv("RESUME_JOB_LEASE", "600"))
+MAX_ATTEMPTS = int(os.getenv("RESUME_JOB_MAX_ATTEMPTS", "2"))
+
+# Job kinds and the ResumePDF2ResumePDF pipeline each one runs
+JOB_KINDS = {
+    "resume": "process_resume",
+    "cover_letter": "process_cover_letter",
+}
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+FINISHED = (SUCCEEDED, FAILED)
+
+
+class Job(NamedTuple):
+    id: str
+    kind: str
+    status: str
+    payload: Dict[str, Any]
+    error: Optional[str]
+    attempts: int
+    created_at: float
+    started_at: Optional[float]
+    finished_at: Optional[float]
+
+    def summary(self) -> Dict[str, Any]:
+        """The job's public fields (everything but its input payload)."""
+        fields = self._asdict()
+        del fields["payload"]
+        return fields
+
+
+class LeaseLostError(RuntimeError):
+    """The worker no longer owns the job (its lease expired and the job was requeued or failed)."""
+
+
+class Event(NamedTuple):
+    seq: int
+    job_id: str
+    event: str
+    data: Dict[str, Any]
+    created_at: float
+
+
+###############################################################################
+# 1) SQLite Job Store
+###############################################################################
+class JobQueue:
+    """
+    Generation jobs and their progress events, stored in SQLite so that clients, the HTTP
+    service and any number of worker processes can share one queue.
+
+    Each job moves from queued to running (claimed by one worker) to succeeded (with the
+    PDF stored as its result) or failed. Every state change and pipeline stage is appended
+    to the job's event log, which clients read incrementally by sequence number.
+
+    Args:
+        path (str): Path to the SQLite database file.
+    """
+
+    _COLUMNS = "id, kind, status, payload, error, attempts, created_at, started_at, finished_at"
+
+    def __init__(self, path: str = DEFAULT_QUEUE_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, payload TEXT NOT NULL, "
+            "result BLOB, error TEXT, worker TEXT, attempts INTEGER NOT NULL DEFAULT 0, "
+            "created_at REAL NOT NULL, started_at REAL, finished_at REAL, heartbeat_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, job_id TEXT NOT NULL, event TEXT NOT NULL, "
+            "data TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS events_job ON events (job_id, seq)")
+
+    @staticmethod
+    def _job(row) -> Job:
+        return Job(row[0], row[1], row[2], json.loads(row[3]), *row[4:])
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Holds the lock and a write transaction, rolled back if the block raises."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _append(self, job_id: str, event: str, data: Dict[str, Any], now: float) -> None:
+        """Appends an event (caller holds a transaction)."""
+        self._conn.execute("INSERT INTO events (job_id, event, data, created_at) VALUES (?, ?, ?, ?)",
+                           (job_id, event, json.dumps(data), now))
+
+    def submit(self, kind: str, payload: Dict[str, Any]) -> str:
+        """
+        Queues a job.
+
+        Args:
+            kind (str): One of JOB_KINDS.
+            payload (dict): The pipeline input: "resume_pdf" (base64) and "job_description".
+
+        Returns:
+            str: The job ID.
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind {kind!r}; expected one of {', '.join(JOB_KINDS)}.")
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._transaction():
+            self._conn.execute("INSERT INTO jobs (id, kind, status, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                               (job_id, kind, QUEUED, json.dumps(payload), now))
+            self._append(job_id, QUEUED, {"kind": kind}, now)
+        return job_id
+
+    def claim(self, worker: str) -> Optional[Job]:
+        """Atomically takes the oldest queued job for a worker (None if the queue is empty)."""
+        now = time.time()
+        with self._transaction():
+            row = self._conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, attempts = attempts + 1, started_at = ?, heartbeat_at = ? "
+                "WHERE id = (SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1) "
+                f"RETURNING {self._COLUMNS}",
+                (RUNNING, worker, now, now, QUEUED),
+            ).fetchone()
+            if row is not None:
+                self._append(row[0], RUNNING, {"worker": worker, "attempt": row[5]}, now)
+        return self._job(row) if row is not None else None
+
+    # The updates below only apply while the worker still holds the job; a worker whose lease expired
+    # (the job was requeued, re-claimed or failed meanwhile) changes nothing and gets False back.
+    _OWNED = "WHERE id = ? AND status = 'running' AND worker = ?"
+
+    def stage(self, job_id: str, worker: str, stage: str) -> bool:
+        """Records that a running job started a pipeline stage (this also renews the worker's lease)."""
+        now = time.time()
+        with self._transaction():
+            updated = self._conn.execute(f"UPDATE jobs SET heartbeat_at = ? {self._OWNED}",
+                                         (now, job_id, worker)).rowcount
+            if updated:
+                self._append(job_id, "stage", {"stage": stage}, now)
+        return bool(updated)
+
+    def complete(self, job_id: str, worker: str, result: bytes) -> bool:
+        now = time.time()
+        with self._transaction():
+            updated = self._conn.execute(f"UPDATE jobs SET status = ?, result = ?, finished_at = ? {self._OWNED}",
+                                         (SUCCEEDED, result, now, job_id, worker)).rowcount
+            if updated:
+                self._append(job_id, SUCCEEDED, {"bytes": len(result), "seconds": self._elapsed(job_id, now)}, now)
+        return bool(updated)
+
+    def fail(self, job_id: str, worker: str, error: str) -> bool:
+        now = time.time()
+        with self._transaction():
+            updated = self._conn.execute(f"UPDATE jobs SET status = ?, error = ?, finished_at = ? {self._OWNED}",
+                                         (FAILED, error, now, job_id, worker)).rowcount
+            if updated:
+                self._append(job_id, FAILED, {"error": error}, now)
+        return bool(updated)
+
+    def retry(self, job_id: str, worker: str, error: str) -> bool:
+        """Puts a job whose attempt raised back in the queue for another attempt."""
+        now = time.time()
+        with self._transaction():
+            updated = self._conn.execute(f"UPDATE jobs SET status = ?, worker = NULL {self._OWNED}",
+                                         (QUEUED, job_id, worker)).rowcount
+            if updated:
+                self._append(job_id, QUEUED, {"retry_after": error}, now)
+        return bool(updated)
+
+    def _elapsed(self, job_id: str, now: float) -> Optional[float]:
+        (started_at,) = self._conn.execute("SELECT started_at FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return now - started_at if started_at is not None else None
+
+    def requeue_stale(self, lease_seconds: float = LEASE_SECONDS, max_attempts: int = MAX_ATTEMPTS) -> int:
+        """
+        Returns running jobs whose worker stopped reporting progress (e.g. it crashed) to the
+        queue, or fails them once they have used max_attempts.
+
+        Returns:
+            int: Number of stale jobs found.
+        """
+        now = time.time()
+        with self._transaction():
+            stale = self._conn.execute(
+                "SELECT id, attempts, worker FROM jobs WHERE status = ? AND heartbeat_at < ?",
+                (RUNNING, now - lease_seconds),
+            ).fetchall()
+            for job_id, attempts, worker in stale:
+                if attempts >= max_attempts:
+                    error = f"Worker {worker} stopped responding ({attempts} attempts)."
+                    self._conn.execute("UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                                       (FAILED, error, now, job_id))
+                    self._append(job_id, FAILED, {"error": error}, now)
+                else:
+                    self._conn.execute("UPDATE jobs SET status = ?, worker = NULL WHERE id = ?", (QUEUED, job_id))
+                    self._append(job_id, QUEUED, {"requeued_from": worker}, now)
+        return len(stale)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {self._COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job(row) if row is not None else None
+
+    def result(self, job_id: str) -> Optional[bytes]:
+        """Returns the PDF of a succeeded job (None otherwise)."""
+        with self._lock:
+            row = self._conn.execute("SELECT result FROM jobs WHERE id = ? AND status = ?",
+                                     (job_id, SUCCEEDED)).fetchone()
+        return row[0] if row is not None else None
+
+    def events(self, job_id: str, after: int = 0) -> List[Event]:
+        """Returns a job's events with a sequence number greater than after, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, job_id, event, data, created_at FROM events WHERE job_id = ? AND seq > ? ORDER BY seq",
+                (job_id, after),
+            ).fetchall()
+        return [Event(seq, job, event, json.loads(data), created_at) for seq, job, event, data, created_at in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Returns the number of jobs in each status."""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+
+_queue: Optional[JobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_queue() -> JobQueue:
+    """Returns the process-wide job queue."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = JobQueue()
+    return _queue
+
+
+###############################################################################
+# 2) Workers
+###############################################################################
+def run_job(queue: JobQueue, job: Job, worker: str) -> bytes:
+    """
+    Runs a job's pipeline in a private directory, recording each stage as an event.
+
+    Returns:
+        bytes: The generated PDF.
+
+    Raises:
+        LeaseLostError: If the worker lost the job while running it (the pipeline stops at the next stage).
+        RuntimeError: If the pipeline did not produce a PDF.
+    """
+    def progress(stage: str) -> None:
+        if not queue.stage(job.id, worker, stage):
+            raise LeaseLostError(f"Job {job.id} is no longer held by {worker}.")
+
+    import ResumePDF2ResumePDF
+
+    pipeline = getattr(ResumePDF2ResumePDF, JOB_KINDS[job.kind])
+    with tempfile.TemporaryDirectory(prefix="resume-job-") as workdir:
+        resume_path = os.path.join(workdir, "resume.pdf")
+        with open(resume_path, "wb") as file:
+            file.write(base64.b64decode(job.payload["resume_pdf"]))
+        pdf_bytes = pipeline(
+            resume_path,
+            job.payload["job_description"],
+            progress=progress,
+            pdf_filename=os.path.join(workdir, "output.pdf"),
+            tex_filename=os.path.join(workdir, "output.tex"),
+        )
+    if pdf_bytes is None:
+        raise RuntimeError(f"The {job.kind} pipeline did not produce a PDF; see the worker log.")
+    return pdf_bytes
+
+
+def run_worker(path: str = DEFAULT_QUEUE_PATH, stub: bool = False, poll_interval: float = POLL_INTERVAL,
+               max_jobs: Optional[int] = None, max_attempts: int = MAX_ATTEMPTS) -> int:
+    """
+    Claims and runs jobs until max_jobs have been processed (forever by default).
+
+    A job whose pipeline raises is queued again until it has used max_attempts, then failed.
+
+    Args:
+        path (str): Path of the queue database.
+        stub (bool): Use the offline stub LLM (see resume_service.warm_up).
+        poll_interval (float): Seconds to wait when the queue is empty.
+        max_jobs (int, optional): Stop after this many jobs.
+        max_attempts (int): Attempts per job, counting both errors and expired leases.
+
+    Returns:
+        int: Number of jobs processed.
+    """
+    import resume_service
+
+    resume_service.warm_up(stub=stub)
+    queue = JobQueue(path)
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    logger.info("Worker %s polling %s", worker, path)
+
+    processed = 0
+    while max_jobs is None or processed < max_jobs:
+        queue.requeue_stale(max_attempts=max_attempts)
+        job = queue.claim(worker)
+        if job is None:
+            time.sleep(poll_interval)
+            continue
+        started = time.perf_counter()
+        try:
+            if queue.complete(job.id, worker, run_job(queue, job, worker)):
+                logger.info("Job %s (%s) succeeded in %.2fs", job.id, job.kind, time.perf_counter() - started)
+            else:
+                logger.warning("Job %s finished after its lease expired; the result was discarded.", job.id)
+        except LeaseLostError as e:
+            logger.warning("%s Stopped working on it.", e)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            if job.attempts < max_attempts:
+                logger.exception("Job %s (%s) attempt %d failed, retrying: %s", job.id, job.kind, job.attempts, e)
+                queue.retry(job.id, worker, error)
+            else:
+                logger.exception("Job %s (%s) failed: %s", job.id, job.kind, e)
+                queue.fail(job.id, worker, error)
+        processed += 1
+    return processed
+
+
+def _worker_main(path: str, stub: bool) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(processName)s %(message)s")
+    run_worker(path, stub=stub)
+
+
+def start_workers(processes: int, path: str = DEFAULT_QUEUE_PATH, stub: bool = False) -> List[multiprocessing.Process]:
+    """Starts worker processes (spawned, so each opens its own database connections and model state)."""
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=_worker_main, args=(path, stub), name=f"resume-worker-{index}", daemon=True)
+        for index in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    return workers
+
+
+###############################################################################
+# 3) Command Line Interface
+###############################################################################
+def main(argv=None):
+    """
+    worker: python job_queue.py worker [--processes N] [--stub]
+    submit: python job_queue.py submit {resume,cover_letter} RESUME_PDF JOB_DESCRIPTION_FILE
+    status: python job_queue.py status JOB_ID [--output PDF]
+    """
+    parser = argparse.ArgumentParser(description="SQLite-backed queue for resume and cover letter generation.")
+    parser.add_argument("--queue", default=DEFAULT_QUEUE_PATH, help="Path of the queue database.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    worker_parser = subparsers.add_parser("worker", help="Run worker processes.")
+    worker_parser.add_argument("-p", "--processes", type=int, default=1)
+    worker_parser.add_argument("--stub", action="store_true", help="Answer prompts with the offline stub LLM.")
+
+    submit_parser = subparsers.add_parser("submit", help="Queue a generation job and print its ID.")
+    submit_parser.add_argument("kind", choices=sorted(JOB_KINDS))
+    submit_parser.add_argument("resume_pdf")
+    submit_parser.add_argument("job_description", help="Path to the job description (.txt).")
+
+    status_parser = subparsers.add_parser("status", help="Print a job's events, optionally saving its PDF.")
+    status_parser.add_argument("job_id")
+    status_parser.add_argument("-o", "--output", help="Write the result PDF here once the job succeeded.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(processName)s %(message)s")
+
+    if args.command == "worker":
+        workers = start_workers(args.processes, args.queue, args.stub)
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    queue = JobQueue(args.queue)
+    if args.command == "submit":
+        with open(args.resume_pdf, "rb") as file:
+            resume_pdf = base64.b64encode(file.read()).decode("ascii")
+        with open(args.job_description, "r", encoding="utf-8") as file:
+            job_description = file.read()
+        print(queue.submit(args.kind, {"resume_pdf": resume_pdf, "job_description": job_description}))
+        return 0
+
+    job = queue.get(args.job_id)
+    if job is None:
+        logger.error("Unknown job %s.", args.job_id)
+        return 1
+    for event in queue.events(job.id):
+        print(json.dumps(event._asdict()))
+    if args.output and job.status == SUCCEEDED:
+        with open(args.output, "wb") as file:
+            file.write(queue.result(job.id))
+    return 0 if job.status != FAILED else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
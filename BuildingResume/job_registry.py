@@ -0,0 +1,404 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import resume_evaluator
+import tracing
+import pdf_extraction
+from llm_cache import CacheStats
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REGISTRY_PATH = os.getenv(
+    "RESUME_JOB_REGISTRY_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "job_registry.sqlite3"),
+)
+
+# Set RESUME_JOB_REGISTRY=0 to extract job artifacts on every call
+REGISTRY_ENABLED = os.getenv("RESUME_JOB_REGISTRY", "1") != "0"
+
+# Concurrent postings during a bulk (re)index; extraction is dominated by model latency
+INDEX_WORKERS = int(os.getenv("RESUME_JOB_REGISTRY_WORKERS", "4"))
+
+_WHITESPACE = re.compile(r"[ \t\f\v]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+###############################################################################
+# 1) Posting Normalization and Keys
+###############################################################################
+def normalize_posting(text: str) -> str:
+    """
+    Normalizes a job description so that copies differing only in whitespace, line
+    endings or Unicode compatibility forms map to the same posting.
+
+    Args:
+        text (str): Raw job description text.
+
+    Returns:
+        str: The normalized text.
+    """
+    text = unicodedata.normalize("NFKC", text).replace("\r\n", "\n").replace("\r", "\n")
+    text = "\n".join(_WHITESPACE.sub(" ", line).strip() for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+def posting_key(text: str) -> str:
+    """Returns the content hash (hex SHA-256) of a job description after normalization."""
+    return hashlib.sha256(normalize_posting(text).encode("utf-8")).hexdigest()
+
+
+###############################################################################
+# 2) Artifacts
+###############################################################################
+class Artifact(NamedTuple):
+    """How one precomputed value of a posting is produced and stored."""
+    extract: Callable[[str], Any]
+    version: str = "1"  # Bump when the extractor (e.g. its prompt) changes; stored values are then recomputed
+    as_set: bool = False  # Stored as a sorted JSON list and loaded back as a set
+
+
+def _extract_keywords(text: str) -> set:
+    return resume_evaluator.extract_job_keywords(text)
+
+
+def _extract_key_terms(text: str) -> set:
+    return resume_evaluator.extract_job_key_terms(text)
+
+
+def _extract_themes(text: str) -> Dict[str, List[str]]:
+    # Imported here so scoring-only callers do not pull in the cover letter generator
+    import Coverletter
+    return Coverletter.extract_job_themes(text)
+
+
+def _extract_stems(text: str) -> set:
+    return set(resume_evaluator.clean_text(text).split())
+
+
+# Registered artifacts, computed for every indexed posting (see register_artifact)
+ARTIFACTS: Dict[str, Artifact] = {
+    "keywords": Artifact(_extract_keywords, as_set=True),
+    "key_terms": Artifact(_extract_key_terms, as_set=True),  # Unstemmed, for main.analyze_resume
+    "themes": Artifact(_extract_themes),
+    "stems": Artifact(_extract_stems, as_set=True),
+}
+
+
+def register_artifact(name: str, extract: Callable[[str], Any], version: str = "1", as_set: bool = False) -> None:
+    """
+    Registers (or replaces) an artifact computed for each posting.
+
+    Args:
+        name (str): Artifact name, e.g. "keywords".
+        extract (Callable[[str], Any]): Computes the artifact from the normalized posting text.
+            The result must be JSON-serializable (or a set, with as_set=True).
+        version (str): Version of the extractor; stored values with another version are recomputed.
+        as_set (bool): The value is a set.
+    """
+    ARTIFACTS[name] = Artifact(extract, version, as_set)
+
+
+class JobPosting(NamedTuple):
+    key: str
+    text: str
+    artifacts: Dict[str, Any]
+
+    @property
+    def keywords(self) -> set:
+        return self.artifacts.get("keywords", set())
+
+    @property
+    def themes(self) -> Dict[str, List[str]]:
+        return self.artifacts.get("themes", {})
+
+    @property
+    def stems(self) -> set:
+        return self.artifacts.get("stems", set())
+
+
+###############################################################################
+# 3) SQLite Registry
+###############################################################################
+class JobRegistry(CacheStats):
+    """
+    Job postings and their precomputed artifacts (keywords, themes, stemmed tokens), stored in
+    SQLite and keyed by the content hash of the normalized posting.
+
+    Lookups count a hit when every requested artifact is stored with its current version.
+    Empty results (e.g. a failed theme extraction) are not stored. The extractors' model calls
+    never cache a response they could not parse (see llm_cache.generate_content's validate), so
+    the next lookup asks the model again instead of replaying the failure.
+
+    Args:
+        path (str): Path to the SQLite database file (":memory:" for an in-process registry).
+    """
+
+    def __init__(self, path: str = DEFAULT_REGISTRY_PATH):
+        super().__init__()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS postings ("
+            "key TEXT PRIMARY KEY, text TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS artifacts ("
+            "key TEXT NOT NULL, name TEXT NOT NULL, "
+            "version TEXT NOT NULL, value TEXT NOT NULL, indexed_at REAL NOT NULL, PRIMARY KEY (key, name))"
+        )
+
+    def get(self, key: str) -> Optional[JobPosting]:
+        """
+        Returns the stored posting with its current-version artifacts, without extracting anything.
+
+        Returns:
+            JobPosting: The posting, or None if no posting has this key.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT text FROM postings WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            stored = self._conn.execute(
+                "SELECT name, version, value FROM artifacts WHERE key = ?", (key,)
+            ).fetchall()
+        artifacts = {}
+        for name, version, value in stored:
+            artifact = ARTIFACTS.get(name)
+            if artifact is not None and artifact.version == version:
+                value = json.loads(value)
+                artifacts[name] = set(value) if artifact.as_set else value
+        return JobPosting(key, row[0], artifacts)
+
+    def _store(self, key: str, text: str, artifacts: Dict[str, Any]) -> None:
+        now = time.time()
+        rows = []
+        for name, value in artifacts.items():
+            if not value:
+                continue
+            artifact = ARTIFACTS[name]
+            encoded = json.dumps(sorted(value) if artifact.as_set else value, ensure_ascii=False)
+            rows.append((key, name, artifact.version, encoded, now))
+        with self._lock:
+            self._conn.execute("INSERT OR IGNORE INTO postings (key, text, created_at) VALUES (?, ?, ?)",
+                               (key, text, now))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO artifacts (key, name, version, value, indexed_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def load(self, text: str, names: Optional[Sequence[str]] = None, force: bool = False) -> JobPosting:
+        """
+        Returns a posting with the requested artifacts, extracting and storing only those
+        that are missing or were produced by an older extractor version.
+
+        Args:
+            text (str): The job description (raw or normalized).
+            names (Sequence[str], optional): Artifacts needed (defaults to every registered artifact).
+            force (bool): Recompute the artifacts even if they are stored.
+
+        Returns:
+            JobPosting: The posting and its artifacts.
+        """
+        normalized = normalize_posting(text)
+        key = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        names = list(ARTIFACTS) if names is None else list(names)
+
+        posting = self.get(key)
+        artifacts = dict(posting.artifacts) if posting is not None else {}
+        missing = [name for name in names if force or name not in artifacts]
+        self._record(not missing)
+        if not missing:
+            return JobPosting(key, normalized, artifacts)
+
+        computed = {}
+        for name in missing:
+            started = time.perf_counter()
+            with tracing.span("registry.extract", artifact=name):
+                computed[name] = ARTIFACTS[name].extract(normalized)
+            logger.info("Extracted %s for posting %s in %.2fs.", name, key[:12], time.perf_counter() - started)
+        self._store(key, normalized, computed)
+        artifacts.update(computed)
+        return JobPosting(key, normalized, artifacts)
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT key FROM postings ORDER BY created_at")]
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+            self._conn.execute("DELETE FROM postings WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM artifacts")
+            self._conn.execute("DELETE FROM postings")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+
+
+_registry: Optional[JobRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> JobRegistry:
+    """Returns the process-wide job registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = JobRegistry()
+    return _registry
+
+
+def set_registry(registry: JobRegistry) -> None:
+    """Replaces the process-wide job registry (e.g. with an in-memory JobRegistry(":memory:"))."""
+    global _registry
+    with _registry_lock:
+        _registry = registry
+
+
+tracing.register_collector("job_registry", lambda: _registry.stats() if _registry is not None else {})
+
+
+###############################################################################
+# 4) Scoring-Path Lookups
+###############################################################################
+def load_artifact(job_description_text: str, name: str) -> Any:
+    """
+    Returns one precomputed artifact of a posting, extracting and storing it on first use.
+
+    With RESUME_JOB_REGISTRY=0 the artifact is extracted directly without being stored.
+    """
+    if not REGISTRY_ENABLED:
+        return ARTIFACTS[name].extract(normalize_posting(job_description_text))
+    return get_registry().load(job_description_text, (name,)).artifacts[name]
+
+
+def get_job_keywords(job_description_text: str) -> set:
+    """
+    Returns the keyword set of a posting (see resume_evaluator.extract_job_keywords), or its raw
+    words when extraction failed (the failure is not stored, so the next call retries).
+    """
+    return (load_artifact(job_description_text, "keywords")
+            or resume_evaluator.job_description_words(job_description_text))
+
+
+def get_job_themes(job_description_text: str) -> Dict[str, List[str]]:
+    """Returns the key themes, responsibilities and skills of a posting (see Coverletter.extract_job_themes)."""
+    return load_artifact(job_description_text, "themes")
+
+
+###############################################################################
+# 5) Bulk Indexing
+###############################################################################
+def index_postings(texts: Iterable[str], registry: Optional[JobRegistry] = None, force: bool = False,
+                   workers: int = INDEX_WORKERS) -> List[JobPosting]:
+    """
+    Indexes many postings concurrently, computing every registered artifact.
+
+    Args:
+        texts (Iterable[str]): Job description texts.
+        registry (JobRegistry, optional): Target registry (defaults to the process-wide one).
+        force (bool): Recompute artifacts that are already stored.
+        workers (int): Number of postings indexed at once.
+
+    Returns:
+        List[JobPosting]: The indexed postings, in input order.
+    """
+    registry = registry or get_registry()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        return list(executor.map(lambda text: registry.load(text, force=force), texts))
+
+
+def reindex(registry: Optional[JobRegistry] = None, force: bool = False,
+            workers: int = INDEX_WORKERS) -> List[JobPosting]:
+    """Brings every stored posting up to date with the registered artifacts (all of them with force=True)."""
+    registry = registry or get_registry()
+    postings = (registry.get(key) for key in registry.keys())
+    texts = [posting.text for posting in postings if posting is not None]  # Skips postings deleted meanwhile
+    return index_postings(texts, registry, force=force, workers=workers)
+
+
+###############################################################################
+# 6) Command Line Interface
+###############################################################################
+def _read_postings(paths: Iterable[str]) -> List[str]:
+    """Reads job descriptions from .txt/.pdf files, directories of them, or JSONL files with a "text" field."""
+    texts = []
+    for path in pdf_extraction.expand_paths(paths):
+        if path.lower().endswith(".jsonl"):
+            with open(path, "r", encoding="utf-8") as file:
+                texts += [json.loads(line)["text"] for line in file if line.strip()]
+        else:
+            text = pdf_extraction.read_document(path)
+            if text:
+                texts.append(text)
+    return texts
+
+
+def main(argv=None):
+    """
+    index:   python job_registry.py index JOB_FILES_OR_DIRS... [--force] [--workers N]
+    reindex: python job_registry.py reindex [--force] [--workers N]
+    show:    python job_registry.py show KEY_PREFIX
+    """
+    parser = argparse.ArgumentParser(description="Precompute and store job posting keywords and themes.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    index_parser = subparsers.add_parser("index", help="Index job descriptions (.txt, .pdf, .jsonl or directories).")
+    index_parser.add_argument("postings", nargs="+")
+    reindex_parser = subparsers.add_parser("reindex", help="Recompute missing or outdated artifacts of stored postings.")
+    for subparser in (index_parser, reindex_parser):
+        subparser.add_argument("--force", action="store_true", help="Recompute every artifact.")
+        subparser.add_argument("-w", "--workers", type=int, default=INDEX_WORKERS)
+    show_parser = subparsers.add_parser("show", help="Print a stored posting's artifacts as JSON.")
+    show_parser.add_argument("key", help="Posting key (or a unique prefix).")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    registry = get_registry()
+
+    if args.command == "show":
+        matches = [key for key in registry.keys() if key.startswith(args.key)]
+        if len(matches) != 1:
+            logger.error("%d postings match %s.", len(matches), args.key)
+            return 1
+        posting = registry.get(matches[0])
+        if posting is None:  # Deleted since the keys were listed
+            logger.error("Posting %s no longer exists.", matches[0])
+            return 1
+        artifacts = {name: sorted(value) if isinstance(value, set) else value
+                     for name, value in posting.artifacts.items()}
+        print(json.dumps({"key": posting.key, "text": posting.text, "artifacts": artifacts}, indent=2))
+        return 0
+
+    resume_evaluator.configure_gemini_api()
+    started = time.perf_counter()
+    if args.command == "index":
+        postings = index_postings(_read_postings(args.postings), registry, force=args.force, workers=args.workers)
+    else:
+        postings = reindex(registry, force=args.force, workers=args.workers)
+    logger.info("Indexed %d postings in %.2fs (%d stored).", len(postings), time.perf_counter() - started, len(registry))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
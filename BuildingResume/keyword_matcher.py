@@ -0,0 +1,136 @@
+import threading
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+###############################################################################
+# 1) Aho–Corasick Automaton
+###############################################################################
+class KeywordMatcher:
+    """
+    Matches many keywords (including multi-word skills such as "sql server" or "react native")
+    in one linear pass over a text using an Aho–Corasick automaton.
+
+    Matching is case-insensitive, runs of whitespace in the text match a single space in a keyword,
+    and a match only counts when it is not glued to surrounding letters or digits
+    (so "java" does not match inside "javascript").
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        # State 0 is the root. goto[state] maps a character to the next state.
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[str]] = [[]]
+        self.keywords = sorted({" ".join(keyword.lower().split()) for keyword in keywords if keyword.strip()})
+
+        for keyword in self.keywords:
+            self._add(keyword)
+        self._build_failure_links()
+
+    def _add(self, keyword: str) -> None:
+        state = 0
+        for char in keyword:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        self.output[state].append(keyword)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                # Inherit the keywords that end at the failure state (suffix matches)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """
+        Scans a text once and yields every keyword occurrence.
+
+        Args:
+            text (str): The text to scan (e.g. the raw resume text).
+
+        Yields:
+            tuple: (start, end, keyword) with start/end as offsets into the lowercased text.
+        """
+        text = text.lower()
+        goto, fail, output = self.goto, self.fail, self.output
+        # Offsets of the characters fed to the automaton, so matches map back to the original text
+        offsets: List[int] = []
+        state = 0
+        previous_space = True
+        for index, char in enumerate(text):
+            if char.isspace():
+                if previous_space:
+                    continue
+                char = " "
+                previous_space = True
+            else:
+                previous_space = False
+            offsets.append(index)
+
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for keyword in output[state]:
+                start = offsets[len(offsets) - len(keyword)]
+                if self._is_whole_word(text, start, index + 1, keyword):
+                    yield start, index + 1, keyword
+
+    @staticmethod
+    def _is_whole_word(text: str, start: int, end: int, keyword: str) -> bool:
+        """Rejects matches glued to letters/digits (only checked where the keyword itself starts/ends with one)."""
+        if keyword[0].isalnum() and start > 0 and text[start - 1].isalnum():
+            return False
+        if keyword[-1].isalnum() and end < len(text) and text[end].isalnum():
+            return False
+        return True
+
+    def find(self, text: str) -> Dict[str, Dict[str, object]]:
+        """
+        Finds all keyword occurrences in a text.
+
+        Args:
+            text (str): The text to scan.
+
+        Returns:
+            dict: Mapping of each matched keyword to {"count": int, "positions": [(start, end), ...]}.
+        """
+        found: Dict[str, Dict[str, object]] = {}
+        for start, end, keyword in self.iter_matches(text):
+            entry = found.setdefault(keyword, {"count": 0, "positions": []})
+            entry["count"] += 1
+            entry["positions"].append((start, end))
+        return found
+
+
+###############################################################################
+# 2) Compiled Matcher Cache
+###############################################################################
+_matcher_cache: Dict[frozenset, KeywordMatcher] = {}
+_matcher_lock = threading.Lock()
+MAX_CACHED_MATCHERS = 256
+
+
+def compile_keywords(keywords: Iterable[str]) -> KeywordMatcher:
+    """Returns a matcher for a keyword set, reusing the automaton when the same set was compiled before."""
+    key = frozenset(keywords)
+    matcher = _matcher_cache.get(key)
+    if matcher is None:
+        matcher = KeywordMatcher(key)
+        with _matcher_lock:
+            if len(_matcher_cache) >= MAX_CACHED_MATCHERS:
+                _matcher_cache.pop(next(iter(_matcher_cache)))
+            _matcher_cache[key] = matcher
+    return matcher
@@ -0,0 +1,340 @@
+import argparse
+import functools
+import hashlib
+import logging
+import os
+import re
+import subprocess
+import tempfile
+import threading
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set
+
+import tracing
+
+logger = logging.getLogger(__name__)
+
+PDFLATEX = os.getenv("RESUME_PDFLATEX", "pdflatex")  # Ensure pdflatex is installed and accessible
+
+# Maximum number of pdflatex processes running at once (each one is single-threaded)
+MAX_WORKERS = int(os.getenv("RESUME_LATEX_WORKERS", str(os.cpu_count() or 1)))
+
+# Seconds before a single pdflatex run is killed
+COMPILE_TIMEOUT = float(os.getenv("RESUME_LATEX_TIMEOUT", "60"))
+
+# Upper bound on pdflatex runs per document; reruns only happen when the log asks for them
+MAX_PASSES = int(os.getenv("RESUME_LATEX_MAX_PASSES", "3"))
+
+# Log messages (LaTeX kernel, hyperref, etc.) meaning another run is needed to settle references.
+# The templates load the bookmark package, which writes the PDF outlines in the same run, so
+# hyperref's "Rerun to get outlines right" never applies.
+RERUN_PATTERN = re.compile(
+    r"Rerun to get (?:cross-references|citations) right"
+    r"|Label\(s\) may have changed"
+    r"|Rerun LaTeX"
+)
+
+# pdflatex messages meaning a precompiled format could not be loaded (missing, corrupt or from another engine)
+FORMAT_ERROR_PATTERN = re.compile(
+    r"I can't find the format file"
+    r"|Fatal format file error"
+    r"|---! .+ (?:was written by|doesn't match)"
+)
+
+# Precompiled preamble formats (.fmt), one per distinct preamble; set RESUME_LATEX_FORMATS=0 to disable
+USE_FORMATS = os.getenv("RESUME_LATEX_FORMATS", "1") != "0"
+FORMAT_DIR = os.getenv(
+    "RESUME_LATEX_FORMAT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "latex_formats"),
+)
+
+# mylatexformat dumps the preamble up to this marker (or \begin{document} when it is absent)
+DUMP_MARKER = r"\csname endofdump\endcsname"
+BEGIN_DOCUMENT = r"\begin{document}"
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+_format_locks: Dict[str, threading.Lock] = {}
+_format_locks_lock = threading.Lock()
+_failed_formats: Set[str] = set()
+
+
+class LatexCompilationError(RuntimeError):
+    """Raised when pdflatex fails; carries the LaTeX log of the failed run."""
+
+    def __init__(self, message: str, log: str = ""):
+        super().__init__(message)
+        self.log = log
+
+
+###############################################################################
+# 1) Isolated Compilation
+###############################################################################
+def _read_log(log_path: str) -> str:
+    if not os.path.exists(log_path):
+        return ""
+    with open(log_path, "r", encoding="utf-8", errors="replace") as log_file:
+        return log_file.read()
+
+
+def needs_rerun(log: str) -> bool:
+    """Returns True if a pdflatex log reports references that will only resolve on another run."""
+    return RERUN_PATTERN.search(log) is not None
+
+
+def _run_pdflatex(command: List[str], workdir: str, jobname: str, env: Optional[Dict[str, str]] = None) -> None:
+    log_path = os.path.join(workdir, f"{jobname}.log")
+    try:
+        subprocess.run(command, cwd=workdir, env=env, check=True, timeout=COMPILE_TIMEOUT,
+                       stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except subprocess.CalledProcessError as e:
+        # pdflatex writes no log when it dies before reading the document (e.g. an unloadable format)
+        log = _read_log(log_path) or (e.stdout or b"").decode("utf-8", errors="replace")
+        raise LatexCompilationError(f"pdflatex exited with status {e.returncode} for {jobname}", log) from e
+    except subprocess.TimeoutExpired as e:
+        raise LatexCompilationError(
+            f"pdflatex timed out after {COMPILE_TIMEOUT:.0f}s for {jobname}", _read_log(log_path)
+        ) from e
+
+
+def _compile(tex_source: str, jobname: str, max_passes: int, format_name: Optional[str] = None) -> bytes:
+    """
+    Compiles LaTeX source inside a private temporary directory and returns the PDF bytes.
+
+    Every job gets its own directory, so concurrent jobs never share .tex/.aux/.log/.pdf files.
+    pdflatex runs once, and again only while the log reports unresolved references (up to max_passes).
+    With a format_name, pdflatex starts from the precompiled preamble instead of re-reading it.
+    """
+    with tempfile.TemporaryDirectory(prefix="latex-") as workdir:
+        tex_path = os.path.join(workdir, f"{jobname}.tex")
+        log_path = os.path.join(workdir, f"{jobname}.log")
+        with open(tex_path, "w", encoding="utf-8") as tex_file:
+            tex_file.write(tex_source)
+
+        command = [PDFLATEX, "-interaction=nonstopmode", "-halt-on-error", f"-jobname={jobname}"]
+        env = None
+        if format_name:
+            command.append(f"-fmt={format_name}")
+            # Trailing separator keeps the distribution's own format directories searchable
+            env = dict(os.environ, TEXFORMATS=FORMAT_DIR + os.pathsep)
+        command.append(tex_path)
+
+        total_started = time.perf_counter()
+        for current_pass in range(1, max_passes + 1):
+            started = time.perf_counter()
+            with tracing.span("latex.pass", format="yes" if format_name else "no"):
+                _run_pdflatex(command, workdir, jobname, env)
+            logger.info("pdflatex pass %d for %s took %.3fs", current_pass, jobname, time.perf_counter() - started)
+
+            if not needs_rerun(_read_log(log_path)):
+                break
+            if current_pass == max_passes:
+                logger.warning("References in %s still unresolved after %d passes", jobname, max_passes)
+
+        logger.info("Compiled %s in %d pass(es), %.3fs total", jobname, current_pass, time.perf_counter() - total_started)
+        with open(os.path.join(workdir, f"{jobname}.pdf"), "rb") as pdf_file:
+            return pdf_file.read()
+
+
+@tracing.traced("latex.compile")
+def _compile_job(tex_source: str, jobname: str, max_passes: int) -> bytes:
+    """
+    Compiles with the precompiled preamble when one is available, falling back to a plain compile.
+
+    A format is only given up on when pdflatex could not load it, or when the plain compile succeeds
+    where the format compile failed; an error in the document itself leaves the format in use.
+    """
+    format_name = get_format(tex_source) if USE_FORMATS else None
+    if not format_name:
+        return _compile(tex_source, jobname, max_passes)
+    try:
+        return _compile(tex_source, jobname, max_passes, format_name)
+    except LatexCompilationError as e:
+        logger.warning("Compile of %s with format %s failed (%s); retrying without it", jobname, format_name, e)
+        if FORMAT_ERROR_PATTERN.search(e.log):
+            _failed_formats.add(format_name)
+            return _compile(tex_source, jobname, max_passes)
+    pdf = _compile(tex_source, jobname, max_passes)
+    _failed_formats.add(format_name)
+    return pdf
+
+
+###############################################################################
+# 2) Precompiled Preamble Formats
+###############################################################################
+def split_preamble(tex_source: str) -> Optional[str]:
+    """
+    Returns the part of a document that goes into its format file: everything up to the
+    endofdump marker, or up to \\begin{document} when the document has no marker.
+    """
+    for marker in (DUMP_MARKER, BEGIN_DOCUMENT):
+        index = tex_source.find(marker)
+        if index != -1:
+            return tex_source[:index]
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def _engine_version() -> str:
+    """Identifies the TeX engine, so formats are rebuilt after a TeX distribution upgrade."""
+    try:
+        result = subprocess.run([PDFLATEX, "--version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                timeout=COMPILE_TIMEOUT)
+        return result.stdout.decode("utf-8", errors="replace").splitlines()[0]
+    except (OSError, subprocess.SubprocessError, IndexError):
+        return ""
+
+
+def format_name_for(preamble: str) -> str:
+    """Returns the format name for a preamble (a digest of the preamble and the engine version)."""
+    digest = hashlib.sha256(f"{_engine_version()}\x00{preamble}".encode("utf-8")).hexdigest()
+    return f"preamble-{digest[:24]}"
+
+
+@tracing.traced("latex.build_format")
+def build_format(preamble: str, format_name: Optional[str] = None) -> str:
+    """
+    Dumps a preamble into a .fmt file in FORMAT_DIR with mylatexformat.
+
+    Args:
+        preamble (str): The document preamble (see split_preamble).
+        format_name (str, optional): Name of the format (defaults to format_name_for(preamble)).
+
+    Returns:
+        str: The format name, usable with pdflatex -fmt.
+    """
+    format_name = format_name or format_name_for(preamble)
+    os.makedirs(FORMAT_DIR, exist_ok=True)
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="latex-fmt-") as workdir:
+        with open(os.path.join(workdir, f"{format_name}.tex"), "w", encoding="utf-8") as tex_file:
+            tex_file.write(preamble + DUMP_MARKER + "\n" + BEGIN_DOCUMENT + "\n\\end{document}\n")
+        command = [PDFLATEX, "-ini", "-interaction=nonstopmode", "-halt-on-error", f"-jobname={format_name}",
+                   "&pdflatex", "mylatexformat.ltx", f"{format_name}.tex"]
+        _run_pdflatex(command, workdir, format_name)
+        os.replace(os.path.join(workdir, f"{format_name}.fmt"), os.path.join(FORMAT_DIR, f"{format_name}.fmt"))
+    logger.info("Built LaTeX format %s in %.3fs", format_name, time.perf_counter() - started)
+    return format_name
+
+
+def get_format(tex_source: str) -> Optional[str]:
+    """
+    Returns the name of the precompiled format for a document's preamble, building it on first use.
+
+    Returns None when the document has no recognizable preamble or the format cannot be built;
+    callers then compile normally.
+    """
+    preamble = split_preamble(tex_source)
+    if preamble is None:
+        return None
+    format_name = format_name_for(preamble)
+    if format_name in _failed_formats:
+        return None
+    if os.path.exists(os.path.join(FORMAT_DIR, f"{format_name}.fmt")):
+        return format_name
+
+    with _format_locks_lock:
+        lock = _format_locks.setdefault(format_name, threading.Lock())
+    with lock:  # Only one job builds a given format; the others wait and reuse it
+        if os.path.exists(os.path.join(FORMAT_DIR, f"{format_name}.fmt")):
+            return format_name
+        try:
+            return build_format(preamble, format_name)
+        except (LatexCompilationError, OSError) as e:
+            logger.warning("Could not build LaTeX format %s: %s", format_name, e)
+            _failed_formats.add(format_name)
+            return None
+
+
+def build_template_formats() -> List[str]:
+    """Builds the formats for every registered document template (a deploy-time warm-up step)."""
+    import template_registry  # Only needed for the build step
+
+    names = []
+    for kind, spec in template_registry.TEMPLATES.items():
+        with open(os.path.join(template_registry.TEMPLATE_DIR, spec["file"]), "r", encoding="utf-8") as file:
+            preamble = split_preamble(file.read())
+        if preamble is None:
+            logger.warning("Template %s has no preamble to precompile", kind)
+            continue
+        names.append(build_format(preamble))
+    return names
+
+
+###############################################################################
+# 3) Bounded Worker Pool
+###############################################################################
+def get_pool() -> ThreadPoolExecutor:
+    """Returns the process-wide pool that bounds how many pdflatex runs execute concurrently."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="pdflatex")
+    return _pool
+
+
+def submit(tex_source: str, jobname: str = "document", max_passes: int = MAX_PASSES) -> "Future[bytes]":
+    """
+    Queues a compilation job on the shared pool.
+
+    Args:
+        tex_source (str): The complete LaTeX document.
+        jobname (str): Base name of the generated files (only visible in logs and errors).
+        max_passes (int): Maximum number of pdflatex runs (reruns happen only when the log asks for one).
+
+    Returns:
+        Future[bytes]: Resolves to the PDF bytes, or raises LatexCompilationError.
+    """
+    return get_pool().submit(_compile_job, tex_source, jobname, max_passes)
+
+
+def compile_pdf(tex_source: str, jobname: str = "document", max_passes: int = MAX_PASSES) -> bytes:
+    """Compiles LaTeX source to PDF bytes, waiting for a free worker if the pool is busy."""
+    return submit(tex_source, jobname, max_passes).result()
+
+
+def compile_many(tex_sources: Iterable[str], jobname: str = "document",
+                 max_passes: int = MAX_PASSES) -> List[bytes]:
+    """Compiles several documents in parallel and returns their PDFs in input order."""
+    futures = [submit(tex_source, f"{jobname}-{index}", max_passes) for index, tex_source in enumerate(tex_sources)]
+    return [future.result() for future in futures]
+
+
+def write_pdf(pdf_bytes: bytes, pdf_path: str) -> None:
+    """Writes PDF bytes atomically, so readers never see a half-written file."""
+    directory = os.path.dirname(os.path.abspath(pdf_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".pdf.tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(pdf_bytes)
+        os.replace(temp_path, pdf_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+###############################################################################
+# 4) Command Line Interface
+###############################################################################
+def main(argv=None):
+    """
+    Builds the precompiled preamble formats ahead of time:
+        python latex_compiler.py build-formats
+    """
+    parser = argparse.ArgumentParser(description="LaTeX compilation service utilities.")
+    parser.add_argument("command", choices=["build-formats"])
+    parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    for format_name in build_template_formats():
+        print(os.path.join(FORMAT_DIR, f"{format_name}.fmt"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
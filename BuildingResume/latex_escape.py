@@ -0,0 +1,109 @@
+import functools
+import re
+from typing import Any, Callable, Dict, Optional
+
+from pylatexenc.latexencode import utf8tolatex
+
+import tracing
+
+# Replacements for printable ASCII, identical to what utf8tolatex produces for these characters
+ASCII_ESCAPES = {
+    "\\": r"{\textbackslash}",
+    "{": r"{\{}",
+    "}": r"{\}}",
+    "#": r"{\#}",
+    "$": r"{\$}",
+    "%": r"{\%}",
+    "&": r"{\&}",
+    "_": r"{\_}",
+    "^": r"{\textasciicircum}",
+    "~": r"{\textasciitilde}",
+    "<": r"{\ensuremath{<}}",
+    ">": r"{\ensuremath{>}}",
+    '"': "''",
+}
+_ASCII_TABLE = str.maketrans(ASCII_ESCAPES)
+
+# A run of non-ASCII characters plus the character before it, which a combining accent applies to
+_NON_ASCII_RUN = re.compile(r"[\x00-\x7f]?[^\x00-\x7f]+")
+
+# Distinct strings kept in the escape memo (skills, company names and headings recur across documents)
+MEMO_SIZE = 65536
+
+
+###############################################################################
+# 1) String Escaping
+###############################################################################
+@functools.lru_cache(maxsize=MEMO_SIZE)
+def escape_latex(s: str) -> str:
+    """
+    Escapes LaTeX special characters in a string.
+
+    ASCII text goes through a precompiled translation table; only runs of non-ASCII
+    characters are handed to pylatexenc's utf8tolatex. Results are memoized.
+
+    Args:
+        s (str): The input string to escape.
+
+    Returns:
+        str: The escaped string safe for LaTeX.
+    """
+    if s.isascii():
+        return s.translate(_ASCII_TABLE)
+
+    parts = []
+    position = 0
+    for match in _NON_ASCII_RUN.finditer(s):
+        parts.append(s[position:match.start()].translate(_ASCII_TABLE))
+        parts.append(utf8tolatex(match.group()))
+        position = match.end()
+    parts.append(s[position:].translate(_ASCII_TABLE))
+    return "".join(parts)
+
+
+tracing.register_collector("escape_memo", lambda: tracing.lru_stats(escape_latex))
+
+
+###############################################################################
+# 2) Nested Context Escaping
+###############################################################################
+@tracing.traced("latex.escape")
+def escape_context(context: Any, key_handlers: Optional[Dict[str, Callable[[Any], Any]]] = None) -> Any:
+    """
+    Escapes every string in a nested structure of dicts, lists and tuples (to any depth,
+    including lists of lists) for LaTeX compatibility. The input is not modified.
+
+    Args:
+        context (Any): The template context, typically the resume or cover letter dict.
+        key_handlers (dict, optional): Dict keys whose values are transformed by the given
+            function instead of being escaped (e.g. free text with its own line-break handling).
+
+    Returns:
+        Any: A copy of the context with all strings escaped (tuples become lists).
+    """
+    key_handlers = key_handlers or {}
+    if isinstance(context, str):
+        return escape_latex(context)
+    if not isinstance(context, (dict, list, tuple)):
+        return context
+
+    root: Any = {} if isinstance(context, dict) else [None] * len(context)
+    stack = [(context, root)]
+    while stack:
+        source, target = stack.pop()
+        is_dict = isinstance(source, dict)
+        for key, value in (source.items() if is_dict else enumerate(source)):
+            handler = key_handlers.get(key) if is_dict else None
+            if handler is not None:
+                target[key] = handler(value)
+            elif isinstance(value, str):
+                target[key] = escape_latex(value)
+            elif isinstance(value, dict):
+                target[key] = {}
+                stack.append((value, target[key]))
+            elif isinstance(value, (list, tuple)):
+                target[key] = [None] * len(value)
+                stack.append((value, target[key]))
+            else:
+                target[key] = value
+    return root
@@ -0,0 +1,311 @@
+import abc
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import tracing
+
+logger = logging.getLogger(__name__)
+
+# Default on-disk location of the shared response cache (override with RESUME_LLM_CACHE_PATH)
+DEFAULT_CACHE_PATH = os.getenv(
+    "RESUME_LLM_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "llm_responses.sqlite3"),
+)
+DEFAULT_MAX_ENTRIES = int(os.getenv("RESUME_LLM_CACHE_MAX_ENTRIES", "5000"))
+DEFAULT_TTL_SECONDS = float(os.getenv("RESUME_LLM_CACHE_TTL", str(7 * 24 * 3600)))
+
+
+###############################################################################
+# 1) Cache Keys
+###############################################################################
+def cache_key(model_name: str, prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Builds a content-addressed cache key for a single Gemini call.
+
+    Args:
+        model_name (str): Name of the Gemini model (e.g. "gemini-pro").
+        prompt (str): The full prompt text.
+        generation_config (dict, optional): Generation parameters passed to the model.
+
+    Returns:
+        str: Hex SHA-256 digest identifying the (model, prompt, config) triple.
+    """
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    config = json.dumps(generation_config or {}, sort_keys=True, default=str)
+    return hashlib.sha256(f"{model_name}\x00{prompt_hash}\x00{config}".encode("utf-8")).hexdigest()
+
+
+###############################################################################
+# 2) Cache Backends
+###############################################################################
+class CacheStats:
+    """Hit/miss/eviction counters shared by the response cache and the other stores built on it."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._stats_lock = threading.Lock()
+
+    def _record(self, hit: bool) -> None:
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _record_rejected_hit(self) -> None:
+        """Recounts a hit whose value the caller rejected (see generate_content's validate) as a miss."""
+        with self._stats_lock:
+            self.hits -= 1
+            self.misses += 1
+
+    def _record_evictions(self, count: int) -> None:
+        with self._stats_lock:
+            self.evictions += count
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss/eviction counters and the hit ratio."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+
+class CacheBackend(CacheStats, abc.ABC):
+    """
+    Interface for response cache backends. Subclasses store text responses by key
+    and keep hit/miss/eviction counters.
+    """
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Returns the stored value for a key, or None on a miss."""
+
+    @abc.abstractmethod
+    def set(self, key: str, value: str, model_name: str = "") -> None:
+        """Stores a value under a key."""
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Removes every stored value."""
+
+
+class NullCache(CacheBackend):
+    """A backend that never stores anything (every lookup is a miss)."""
+
+    def get(self, key: str) -> Optional[str]:
+        self._record(False)
+        return None
+
+    def set(self, key: str, value: str, model_name: str = "") -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+class SQLiteCache(CacheBackend):
+    """
+    On-disk response cache backed by SQLite with TTL expiry and LRU eviction.
+
+    Args:
+        path (str): Path to the SQLite database file (":memory:" for an in-process cache).
+        max_entries (int): Maximum number of entries kept; least recently used entries are evicted.
+        ttl_seconds (float): Entries older than this are treated as misses and removed. 0 disables expiry.
+        table (str): Table name, so several caches can share one database file.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS, table: str = "responses"):
+        super().__init__()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.table = table
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, model TEXT, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed_at)")
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                row = None
+            if row is not None:
+                self._conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+        self._record(row is not None)
+        return row[0] if row is not None else None
+
+    def set(self, key: str, value: str, model_name: str = "") -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, model, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, model_name, value, now, now),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drops the least recently used entries beyond max_entries (caller holds the lock)."""
+        if not self.max_entries:
+            return
+        (count,) = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,),
+            )
+            self._record_evictions(overflow)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+###############################################################################
+# 3) Shared Cache Instance
+###############################################################################
+_cache: Optional[CacheBackend] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> CacheBackend:
+    """Returns the process-wide response cache, creating the default SQLite cache on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                if os.getenv("RESUME_LLM_CACHE", "1") == "0":
+                    _cache = NullCache()
+                else:
+                    _cache = SQLiteCache()
+    return _cache
+
+
+def set_cache(backend: CacheBackend) -> None:
+    """Replaces the process-wide response cache (e.g. with NullCache() or an in-memory SQLiteCache)."""
+    global _cache
+    with _cache_lock:
+        _cache = backend
+
+
+###############################################################################
+# 4) Model Backends
+###############################################################################
+class GeminiBackend:
+    """Sends prompts to Google Gemini (the API key must already be configured with genai.configure)."""
+
+    name = "gemini"
+
+    def generate(self, prompt: str, model_name: str, generation_config: Optional[Dict[str, Any]] = None) -> str:
+        import google.generativeai as genai  # Deferred: the SDK takes about a second to import
+
+        model = genai.GenerativeModel(model_name, generation_config=generation_config)
+        response = model.generate_content(prompt)
+        try:
+            text = response.text if response else ""
+        except ValueError:
+            # response.text raises when the candidate has no parts (e.g. blocked output)
+            text = ""
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None and getattr(usage, "prompt_token_count", None) is not None:
+            tracing.record_tokens(model_name, usage.prompt_token_count, usage.candidates_token_count or 0)
+        else:
+            tracing.record_tokens(model_name, tracing.estimate_tokens(prompt), tracing.estimate_tokens(text),
+                                  estimated=True)
+        return text
+
+
+_backend: Any = GeminiBackend()
+
+
+def get_backend() -> Any:
+    """Returns the process-wide model backend (Gemini unless replaced with set_backend)."""
+    return _backend
+
+
+def set_backend(backend: Any) -> None:
+    """
+    Replaces the model backend, e.g. with stub_llm.StubBackend() for local testing.
+
+    A backend has a name and a generate(prompt, model_name, generation_config) method returning text.
+    Responses of backends other than Gemini are cached under their own keys.
+    """
+    global _backend
+    _backend = backend
+
+
+tracing.register_collector("llm_responses", lambda: _cache.stats() if _cache is not None else {})
+
+
+###############################################################################
+# 5) Cached Gemini Call
+###############################################################################
+def generate_content(prompt: str, model_name: str = "gemini-pro",
+                     generation_config: Optional[Dict[str, Any]] = None, use_cache: bool = True,
+                     validate: Optional[Callable[[str], bool]] = None) -> str:
+    """
+    Calls Gemini (or the backend set with set_backend) through the shared response cache
+    and returns the response text.
+
+    Args:
+        prompt (str): The prompt to send.
+        model_name (str): Gemini model name.
+        generation_config (dict, optional): Generation parameters for the model.
+        use_cache (bool): Set to False to force a live call (the result is still stored).
+        validate (callable, optional): Predicate on the response text; only responses it accepts
+            are stored, and a cached response it rejects counts as a miss. Callers that parse the
+            response (e.g. as JSON) should pass one, so a malformed answer is never replayed.
+
+    Returns:
+        str: The response text ("" if the model returned no text).
+    """
+    cache = get_cache()
+    backend = get_backend()
+    cached_model = model_name if backend.name == GeminiBackend.name else f"{backend.name}/{model_name}"
+    key = cache_key(cached_model, prompt, generation_config)
+    if use_cache:
+        cached = cache.get(key)
+        if cached is not None and validate is not None and not validate(cached):
+            cache._record_rejected_hit()
+            cached = None
+        if cached is not None:
+            logger.debug("LLM cache hit for %s (%s)", cached_model, key[:12])
+            tracing.count("llm_requests_total", model=model_name, backend=backend.name, cache="hit")
+            return cached
+
+    tracing.count("llm_requests_total", model=model_name, backend=backend.name, cache="miss")
+    with tracing.span("llm.generate", model=model_name, backend=backend.name):
+        text = backend.generate(prompt, model_name, generation_config)
+    if text and (validate is None or validate(text)):
+        cache.set(key, text, cached_model)
+    return text
@@ -0,0 +1,306 @@
+import glob
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import PyPDF2
+
+import resume_parser
+import tracing
+from llm_cache import SQLiteCache
+
+logger = logging.getLogger(__name__)
+
+# PDFs with fewer pages than this are extracted in-process; worker start-up would cost more than it saves
+PARALLEL_PAGE_THRESHOLD = int(os.getenv("RESUME_PDF_PARALLEL_PAGES", "8"))
+
+TEXT_CACHE_PATH = os.getenv(
+    "RESUME_PDF_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "pdf_text.sqlite3"),
+)
+
+_text_cache: Optional[SQLiteCache] = None
+_text_cache_lock = threading.Lock()
+
+
+###############################################################################
+# 1) Content Hash Cache
+###############################################################################
+def file_hash(pdf_path: str) -> str:
+    """
+    Returns the SHA-256 digest of a file's content, read in 1 MiB chunks.
+    """
+    digest = hashlib.sha256()
+    with open(pdf_path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_text_cache() -> SQLiteCache:
+    """Returns the on-disk cache of extracted PDF text, keyed on the file's content hash."""
+    global _text_cache
+    if _text_cache is None:
+        with _text_cache_lock:
+            if _text_cache is None:
+                _text_cache = SQLiteCache(TEXT_CACHE_PATH, max_entries=2000, ttl_seconds=0, table="pdf_text")
+    return _text_cache
+
+
+tracing.register_collector("pdf_text", lambda: _text_cache.stats() if _text_cache is not None else {})
+
+
+###############################################################################
+# 2) Page Extraction
+###############################################################################
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> List[str]:
+    """Extracts the text of pages [start, stop) of a PDF (runs inside a worker process)."""
+    with open(pdf_path, "rb") as file:
+        reader = PyPDF2.PdfReader(file)
+        return [reader.pages[index].extract_text() or "" for index in range(start, stop)]
+
+
+def iter_pdf_pages(pdf_path: str) -> Iterator[str]:
+    """
+    Yields the text of each page of a PDF as soon as it is extracted.
+
+    Args:
+        pdf_path (str): Path to the PDF file.
+
+    Yields:
+        str: The text of one page, in page order.
+    """
+    with open(pdf_path, "rb") as file:
+        reader = PyPDF2.PdfReader(file)
+        for page in reader.pages:
+            yield page.extract_text() or ""
+
+
+@tracing.traced("pdf.extract_text")
+def extract_text(pdf_path: str, max_workers: Optional[int] = None, use_cache: bool = True) -> str:
+    """
+    Extracts the text of a PDF, skipping parsing entirely when the same content was seen before.
+
+    Large documents are split into contiguous page ranges extracted by parallel worker processes;
+    the pages are joined once at the end.
+
+    Args:
+        pdf_path (str): Path to the PDF file.
+        max_workers (int, optional): Number of worker processes (defaults to the CPU count).
+        use_cache (bool): Look up and store the text by content hash.
+
+    Returns:
+        str: Extracted text from the PDF.
+    """
+    key = file_hash(pdf_path) if use_cache else None
+    if key is not None:
+        cached = get_text_cache().get(key)
+        if cached is not None:
+            logger.debug("PDF text cache hit for %s", pdf_path)
+            return cached
+
+    with open(pdf_path, "rb") as file:
+        reader = PyPDF2.PdfReader(file)
+        page_count = len(reader.pages)
+        workers = min(max_workers or os.cpu_count() or 1, page_count)
+        serial = page_count < PARALLEL_PAGE_THRESHOLD or workers < 2
+        if serial:
+            pages = [page.extract_text() or "" for page in reader.pages]
+
+    if not serial:
+        chunk = -(-page_count // workers)  # ceiling division
+        ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_extract_page_range, pdf_path, start, stop) for start, stop in ranges]
+            pages = [text for future in futures for text in future.result()]
+
+    text = "".join(pages)
+    if key is not None:
+        get_text_cache().set(key, text)
+    return text
+
+
+###############################################################################
+# 3) Layout-Aware Extraction
+###############################################################################
+# Font names of bold faces (e.g. "ABCDEF+Calibri-Bold", TeX's "CMBX12")
+BOLD_FONT_PATTERN = re.compile(r"bold|black|heavy|demi|cmbx", re.IGNORECASE)
+
+# Lines at least this many points larger than the body text are treated as headings
+HEADING_SIZE_DELTA = 1.0
+
+
+class Span(NamedTuple):
+    """A run of text drawn with one font."""
+    text: str
+    font: str
+    font_size: float
+    bold: bool
+    bbox: Tuple[float, float, float, float]  # (x0, y0, x1, y1) in PDF points; x1/y1 estimated from the font size
+    page: int
+
+
+class Line(NamedTuple):
+    """A line of text with the style of the spans it is made of."""
+    text: str
+    font_size: float  # Smallest font size among the line's visible spans
+    bold: bool  # All visible spans are bold
+    page: int
+    is_bullet: bool
+
+
+class DocumentLayout:
+    """
+    Lightweight layout model of a PDF: spans, the lines they form, and the sections derived from
+    heading styles (font size and weight) rather than from the text alone.
+    """
+
+    def __init__(self, spans: List[Span], lines: List[Line]):
+        self.spans = spans
+        self.lines = lines
+        self.text = "\n".join(line.text for line in lines)
+        self.body_font_size = self._body_font_size()
+        self.headers: List[str] = []
+        self.preamble: List[str] = []
+        self.sections: Dict[str, List[str]] = {}
+        self._segment()
+
+    def _body_font_size(self) -> float:
+        """The font size covering the most characters."""
+        sizes = Counter()
+        for span in self.spans:
+            sizes[round(span.font_size, 1)] += len(span.text.strip())
+        return sizes.most_common(1)[0][0] if sizes else 0.0
+
+    def _segment(self) -> None:
+        """
+        Splits the lines into the preamble and sections in one pass.
+
+        A non-bullet line naming a known section (resume_parser.SECTION_ALIASES) opens that section.
+        Once a section is open, any other short line set in a heading-sized font also opens a section,
+        named after its text, so unknown headings do not leak into the previous section.
+        """
+        current = None
+        for line in self.lines:
+            text = line.text.strip()
+            if not text:
+                continue
+            larger = line.font_size >= self.body_font_size + HEADING_SIZE_DELTA
+            section = None if line.is_bullet else resume_parser.detect_header(text)
+            if section is None and larger and current is not None and len(text.split()) <= 5:
+                section = text.lower()
+            if section is not None:
+                self.headers.append(text)
+                current = self.sections.setdefault(section, [])
+            else:
+                (self.preamble if current is None else current).append(text)
+
+    @property
+    def bullet_count(self) -> int:
+        return sum(1 for line in self.lines if line.is_bullet)
+
+
+def _span_visitor(spans: List[Span], page_number: int):
+    def visit(text, cm, tm, font_dict, font_size):
+        if not text:
+            return
+        # Text space -> user space: the text matrix's origin transformed by the current matrix
+        x = tm[4] * cm[0] + tm[5] * cm[2] + cm[4]
+        y = tm[4] * cm[1] + tm[5] * cm[3] + cm[5]
+        size = font_size * (abs(tm[3] * cm[3]) or 1.0)
+        font = str(font_dict.get("/BaseFont", "")) if font_dict else ""
+        bbox = (x, y, x + 0.5 * size * len(text), y + size)
+        spans.append(Span(text, font, size, bool(BOLD_FONT_PATTERN.search(font)), bbox, page_number))
+    return visit
+
+
+def spans_to_lines(spans: List[Span]) -> List[Line]:
+    """Joins spans into lines, breaking wherever the extracted text contains a newline."""
+    lines: List[Line] = []
+    parts: List[str] = []
+    sizes: List[float] = []
+    bold = [True]
+    page = [0]
+
+    def flush():
+        text = "".join(parts).strip()
+        if text:
+            lines.append(Line(text, min(sizes) if sizes else 0.0, bold[0] and bool(sizes), page[0],
+                              resume_parser.BULLET_PATTERN.match(text) is not None))
+        parts.clear()
+        sizes.clear()
+        bold[0] = True
+
+    for span in spans:
+        if span.page != page[0]:
+            flush()
+            page[0] = span.page
+        for index, piece in enumerate(span.text.split("\n")):
+            if index:
+                flush()
+            parts.append(piece)
+            if piece.strip():
+                sizes.append(span.font_size)
+                bold[0] = bold[0] and span.bold
+    flush()
+    return lines
+
+
+def extract_spans(pdf_path: str) -> List[Span]:
+    """
+    Extracts the text spans of a PDF with their font, size, weight, approximate bounding box and page.
+
+    Args:
+        pdf_path (str): Path to the PDF file.
+
+    Returns:
+        List[Span]: Spans in content-stream order.
+    """
+    spans: List[Span] = []
+    with open(pdf_path, "rb") as file:
+        reader = PyPDF2.PdfReader(file)
+        for page_number, page in enumerate(reader.pages):
+            page.extract_text(visitor_text=_span_visitor(spans, page_number))
+    return spans
+
+
+@tracing.traced("pdf.extract_layout")
+def extract_layout(pdf_path: str) -> DocumentLayout:
+    """
+    Extracts a PDF into a DocumentLayout (spans, lines and sections).
+
+    Args:
+        pdf_path (str): Path to the PDF file.
+
+    Returns:
+        DocumentLayout: The layout model; its text attribute holds the plain text.
+    """
+    spans = extract_spans(pdf_path)
+    return DocumentLayout(spans, spans_to_lines(spans))
+
+
+###############################################################################
+# 4) Document Files
+###############################################################################
+def read_document(path: str) -> str:
+    """Reads a PDF or plain-text document."""
+    if path.lower().endswith(".pdf"):
+        return extract_text(path)
+    with open(path, "r", encoding="utf-8") as file:
+        return file.read()
+
+
+def expand_paths(paths: Iterable[str]) -> List[str]:
+    """Expands directories to the .txt/.pdf files they contain."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(glob.glob(os.path.join(path, "*.txt")) + glob.glob(os.path.join(path, "*.pdf")))
+        else:
+            files.append(path)
+    return files
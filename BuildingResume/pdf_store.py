@@ -0,0 +1,200 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import latex_compiler
+import template_registry
+import tracing
+from llm_cache import CacheStats
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = os.getenv(
+    "RESUME_PDF_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "pdf_artifacts"),
+)
+DEFAULT_MAX_BYTES = int(os.getenv("RESUME_PDF_STORE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Set RESUME_PDF_STORE=0 to always invoke TeX
+STORE_ENABLED = os.getenv("RESUME_PDF_STORE", "1") != "0"
+
+_store: Optional["PDFArtifactStore"] = None
+_store_lock = threading.Lock()
+
+
+###############################################################################
+# 1) Artifact Keys
+###############################################################################
+def artifact_key(kind: str, escaped_context: Dict[str, Any]) -> str:
+    """
+    Builds the content address of a rendered document.
+
+    Args:
+        kind (str): The template kind ("resume" or "cover_letter").
+        escaped_context (dict): The LaTeX-escaped template context.
+
+    Returns:
+        str: Hex SHA-256 digest of the template version and the canonical JSON of the context.
+    """
+    context = json.dumps(escaped_context, sort_keys=True, ensure_ascii=False, default=str)
+    version = template_registry.template_version(kind)
+    return hashlib.sha256(f"{kind}\x00{version}\x00{context}".encode("utf-8")).hexdigest()
+
+
+###############################################################################
+# 2) On-Disk Artifact Store
+###############################################################################
+class PDFArtifactStore(CacheStats):
+    """
+    Content-addressed store of compiled PDFs on disk, bounded by total size.
+
+    Each artifact is one file named by its key. Reads refresh the file's modification time,
+    so when the store grows past max_bytes the least recently used files are removed first.
+
+    Args:
+        directory (str): Directory holding the artifacts.
+        max_bytes (int): Maximum total size of the stored PDFs.
+    """
+
+    def __init__(self, directory: str = DEFAULT_STORE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        super().__init__()
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = sum(size for _, _, size in self._entries())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def _entries(self) -> List[Tuple[float, str, int]]:
+        """Returns (mtime, path, size) for every stored artifact."""
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.endswith(".pdf"):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:  # Removed by another process
+                        continue
+                    entries.append((stat.st_mtime, entry.path, stat.st_size))
+        return entries
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Returns the stored PDF for a key, or None if it is not stored."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            os.utime(path)  # Mark as recently used
+        except FileNotFoundError:
+            data = None
+        self._record(data is not None)
+        return data
+
+    def set(self, key: str, value: bytes) -> None:
+        """Stores a PDF under a key, replacing any PDF already stored there."""
+        path = self._path(key)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as file:
+            file.write(value)
+        with self._lock:
+            try:
+                replaced = os.path.getsize(path)
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(temp_path, path)
+            self._total_bytes += len(value) - replaced
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Removes least recently used artifacts until the store fits in max_bytes (caller holds the lock)."""
+        entries = sorted(self._entries())
+        total = sum(size for _, _, size in entries)
+        for _, path, size in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            self._record_evictions(1)
+        self._total_bytes = total
+
+    def clear(self) -> None:
+        with self._lock:
+            for _, path, _ in self._entries():
+                os.remove(path)
+            self._total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+
+def get_store() -> PDFArtifactStore:
+    """Returns the process-wide PDF artifact store."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = PDFArtifactStore()
+    return _store
+
+
+tracing.register_collector("pdf_artifacts", lambda: _store.stats() if _store is not None else {})
+
+
+###############################################################################
+# 3) Cached Rendering
+###############################################################################
+def render_pdf(kind: str, escaped_context: Dict[str, Any], jobname: str = "document",
+               tex_path: Optional[str] = None, use_store: bool = STORE_ENABLED,
+               progress: Optional[Callable[[str], None]] = None) -> bytes:
+    """
+    Returns the PDF for a document, rendering and compiling it only if the identical
+    document (same template version and escaped context) has not been built before.
+
+    Args:
+        kind (str): The template kind ("resume" or "cover_letter").
+        escaped_context (dict): The LaTeX-escaped template context.
+        jobname (str): Base name used for the compilation job.
+        tex_path (str, optional): Also write the rendered LaTeX source here when it is rendered.
+        use_store (bool): Look up and store the PDF in the artifact store.
+        progress (Callable[[str], None], optional): Called with "render" and "compile" as those stages
+            start (neither is reported when the PDF comes from the store).
+
+    Returns:
+        bytes: The PDF content.
+
+    Raises:
+        latex_compiler.LatexCompilationError: If pdflatex fails.
+    """
+    key = artifact_key(kind, escaped_context) if use_store else None
+    if key is not None:
+        cached = get_store().get(key)
+        if cached is not None:
+            logger.info("Serving %s PDF from the artifact store (%s)", kind, key[:12])
+            return cached
+
+    if progress is not None:
+        progress("render")
+    tex_source = template_registry.render(kind, escaped_context)
+    if tex_path:
+        directory = os.path.dirname(tex_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(tex_path, "w", encoding="utf-8") as tex_file:
+            tex_file.write(tex_source)
+
+    if progress is not None:
+        progress("compile")
+    pdf_bytes = latex_compiler.compile_pdf(tex_source, jobname=jobname)
+    if key is not None:
+        get_store().set(key, pdf_bytes)
+    return pdf_bytes
@@ -1,9 +1,18 @@
-import google.generativeai as genai
-import PyPDF2
+import functools
+import os
 import re
-import spacy
-from nltk.stem import PorterStemmer
+import threading
 import json
+import logging
+from jsonschema import validate, ValidationError
+
+import job_registry
+import llm_cache
+import pdf_extraction
+import resume_parser
+import rule_engine
+import tracing
+from task_graph import run_task_graph
 
 
 def configure_gemini_api():
@@ -12,10 +21,11 @@ def configure_gemini_api():
     """
     api_key = "PUT YOUR API KEY HERE"
     if not api_key:
-        print("Google Gemini API key not found. Please set the 'GOOGLE_GEMINI_API_KEY' environment variable.")
+        logging.error("Google Gemini API key not found. Please set the 'GOOGLE_GEMINI_API_KEY' environment variable.")
         raise EnvironmentError("GOOGLE_GEMINI_API_KEY environment variable not set.")
+    import google.generativeai as genai  # Deferred so that scoring never pays for the SDK import
     genai.configure(api_key=api_key)
-    print("Google Gemini API configured successfully.")
+    logging.info("Google Gemini API configured successfully.")
 
 def extract_text_from_pdf(pdf_path):
     """
@@ -32,19 +42,75 @@ def extract_text_from_pdf(pdf_path):
         return None
 
     try:
-        with open(pdf_path, "rb") as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text()
-            return text
+        return pdf_extraction.extract_text(pdf_path)
     except Exception as e:
-        print(f"Error reading PDF file: {e}")
+        logging.error("Error reading PDF file: %s", e)
         return ""
 
+def extract_layout_from_pdf(pdf_path):
+    """
+    Extracts a PDF with its layout: spans (font size, weight, position), lines and sections.
+
+    Args:
+        pdf_path (str): Path to the PDF file.
+
+    Returns:
+        pdf_extraction.DocumentLayout: The layout model (its text attribute holds the plain text),
+        or None if the PDF could not be read.
+    """
+    if not pdf_path:
+        return None
+
+    try:
+        return pdf_extraction.extract_layout(pdf_path)
+    except Exception as e:
+        logging.error("Error reading PDF file: %s", e)
+        return None
+
+
+# English NLP model, loaded lazily on first use (see get_nlp)
+SPACY_MODEL = os.getenv("RESUME_SPACY_MODEL", "en_core_web_sm")
+
+# Every component shipped with the en_core_web_* pipelines
+SPACY_PIPES = ("tok2vec", "tagger", "parser", "senter", "attribute_ruler", "lemmatizer", "ner")
+
+# Components each caller actually needs; is_stop/is_alpha are lexical and need no pipe
+CLEAN_TEXT_PIPES = ("ner",)
+EXTRACT_INFO_PIPES = ("tok2vec", "tagger", "attribute_ruler", "lemmatizer", "ner")
+
+_nlp_cache = {}
+_nlp_lock = threading.Lock()
+
+def get_nlp(pipes=None):
+    """
+    Returns the spaCy pipeline, loading it on first use.
+
+    Args:
+        pipes (Iterable[str], optional): Components to keep; all others are excluded so their
+            weights are never loaded. None loads the full pipeline.
 
-# Load the English NLP model
-nlp = spacy.load("en_core_web_sm")
+    Returns:
+        spacy.language.Language: The (cached) pipeline for this set of components.
+    """
+    key = tuple(sorted(pipes)) if pipes is not None else None
+    nlp = _nlp_cache.get(key)
+    if nlp is None:
+        with _nlp_lock:
+            nlp = _nlp_cache.get(key)
+            if nlp is None:
+                import spacy  # Deferred: importing spaCy alone costs about a second
+
+                exclude = [] if key is None else [pipe for pipe in SPACY_PIPES if pipe not in key]
+                with tracing.span("spacy.load"):
+                    nlp = spacy.load(SPACY_MODEL, exclude=exclude)
+                _nlp_cache[key] = nlp
+    return nlp
+
+def __getattr__(name):
+    # Keeps the old module-level `resume_evaluator.nlp` working without loading it at import time
+    if name == "nlp":
+        return get_nlp()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Mapping of month abbreviations to full names
 month_mapping = {
@@ -60,14 +126,31 @@ def normalize_months(text):
     pattern = r'\b(' + '|'.join(month_mapping.keys()) + r')\b'
     return re.sub(pattern, lambda x: month_mapping[x.group()], text)
 
-def clean_text(text):
+@functools.lru_cache(maxsize=1)
+def _get_stemmer():
+    """Returns the shared Porter stemmer; nltk is only imported once something is stemmed."""
+    from nltk.stem import PorterStemmer
+
+    return PorterStemmer()
+
+# PorterStemmer.stem is pure, so results are memoized across documents
+@functools.lru_cache(maxsize=100_000)
+def stem_word(word):
+    """Returns the Porter stem of a word, cached (word -> stem) for the lifetime of the process."""
+    return _get_stemmer().stem(word)
+
+tracing.register_collector("stem_memo", lambda: tracing.lru_stats(stem_word))
+
+# Define custom stopwords
+CUSTOM_STOPWORDS = {"e.g.", "key", "requirement", "s", "or", "a", "in"}
+
+EMAIL_PATTERN = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+PHONE_PATTERN = re.compile(r"\+?\d[\d -]{7,}\d")
+
+def _prepare_for_cleaning(text):
     """
-    Cleans text using spaCy, removing stopwords, special characters, and normalizing specific terms to base forms.
-    Retains the original verb forms unless specified in the stemming process.
+    Applies the regex normalization steps of clean_text and returns the lowercased text for spaCy.
     """
-    # Initialize the stemmer
-    stemmer = PorterStemmer()
-
     # 1) Normalize month abbreviations
     text = normalize_months(text)
 
@@ -79,12 +162,12 @@ def clean_text(text):
     text = re.sub(r"\b(linkedin|github|envel|obile|alt)\b[a-z]*", "", text, flags=re.IGNORECASE)
 
     # 4) Extract emails & phone numbers
-    emails = re.findall(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", text)
-    phone_numbers = re.findall(r"\+?\d[\d -]{7,}\d", text)
+    emails = EMAIL_PATTERN.findall(text)
+    phone_numbers = PHONE_PATTERN.findall(text)
 
     # Temporarily replace emails and phone numbers with placeholders
-    text = re.sub(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", "EMAIL_PLACEHOLDER", text)
-    text = re.sub(r"\+?\d[\d -]{7,}\d", "PHONE_PLACEHOLDER", text)
+    text = EMAIL_PATTERN.sub("EMAIL_PLACEHOLDER", text)
+    text = PHONE_PATTERN.sub("PHONE_PLACEHOLDER", text)
 
     # 5) Remove special characters (except placeholders)
     text = re.sub(r"[^a-zA-Z0-9\s@.]", " ", text)
@@ -95,12 +178,12 @@ def clean_text(text):
     for phone in phone_numbers:
         text = text.replace("PHONE_PLACEHOLDER", phone, 1)
 
-    # 6) Process text with spaCy
-    doc = nlp(text.lower())
-
-    # Define custom stopwords
-    custom_stopwords = {"e.g.", "key", "requirement", "s", "or", "a", "in"}
+    return text.lower()
 
+def _filter_clean_tokens(doc):
+    """
+    Filters and stems the tokens of a spaCy doc produced from _prepare_for_cleaning.
+    """
     filtered_tokens = []
 
     for token in doc:
@@ -114,7 +197,7 @@ def clean_text(text):
         # Filtering conditions:
         if token.is_stop:  # Remove stopwords
             continue
-        if candidate in custom_stopwords:  # Remove custom stopwords
+        if candidate in CUSTOM_STOPWORDS:  # Remove custom stopwords
             continue
         if len(candidate) == 1:  # Remove single-letter tokens
             continue
@@ -122,68 +205,97 @@ def clean_text(text):
             continue
 
         # Apply stemming for further normalization
-        candidate = stemmer.stem(candidate)
+        filtered_tokens.append(stem_word(candidate))
+
+    return filtered_tokens
 
-        filtered_tokens.append(candidate)
+@tracing.traced("spacy.clean")
+def clean_text(text):
+    """
+    Cleans text using spaCy, removing stopwords, special characters, and normalizing specific terms to base forms.
+    Retains the original verb forms unless specified in the stemming process.
+    """
+    # 6) Process text with spaCy
+    doc = get_nlp(CLEAN_TEXT_PIPES)(_prepare_for_cleaning(text))
 
     # 7) Return the cleaned text
-    return " ".join(filtered_tokens)
+    return " ".join(_filter_clean_tokens(doc))
 
-def score_resume_format(resume_text, formatting_rules):
-    """Scores a resume based on defined formatting rules.
+def clean_texts(texts, batch_size=64, n_process=1, as_tokens=False):
+    """
+    Batched variant of clean_text that streams many documents through nlp.pipe.
+
+    Args:
+        texts (Iterable[str]): The documents to clean (consumed lazily).
+        batch_size (int): Number of documents spaCy processes per batch.
+        n_process (int): Number of spaCy worker processes (-1 for all CPUs).
+        as_tokens (bool): Yield lists of stemmed tokens instead of joined strings.
+
+    Yields:
+        str or list: The cleaned text (or token list) of each document, in input order.
+    """
+    nlp = get_nlp(CLEAN_TEXT_PIPES)
+    prepared = (_prepare_for_cleaning(text) for text in texts)
+    for doc in nlp.pipe(prepared, batch_size=batch_size, n_process=n_process):
+        tokens = _filter_clean_tokens(doc)
+        yield tokens if as_tokens else " ".join(tokens)
+
+# Default formatting rules used by the CLI entry points
+DEFAULT_FORMATTING_RULES = {
+    "section_headers": {
+        "headers": ["skills", "experience", "education"],
+        "weight": 15,
+    }
+}
+
+def score_headings(resume_text, formatting_rules, layout=None):
+    """Scores a resume against the formatting rules (section headers and any other configured rules).
 
     Args:
         resume_text (str): The text content of the resume.
         formatting_rules (dict): A dictionary specifying formatting rules and weights.
+        layout (pdf_extraction.DocumentLayout, optional): PDF structure used for header and bullet checks.
 
     Returns:
-        dict: A dictionary containing the formatting score, reasons, and individual rule scores.
+        tuple: The heading score (0-100) and the list of reasons for lost points.
+    """
+    result = rule_engine.score_format(resume_text, formatting_rules, layout)
+    return result["score"], result["reasons"]
+
+def check_star_method(resume_text):
+    """
+    Asks Gemini whether the resume follows the STAR method.
+
+    Returns:
+        int: 100 if the model answers yes, otherwise 0.
     """
+    if not resume_text:
+        return 0
 
-    score = 100  # Start with a perfect score
-    reasons = []
-    rule_scores = {}
-    header_weight = 100/3 # Weight for each header
-
-    for rule_name, rule_config in formatting_rules.items():
-      rule_score = 0
-      if rule_name == "section_headers":
-          headers = rule_config["headers"]
-          for header in headers:
-            if header == "education":
-              pattern = re.compile(rf"\b{header}\b", re.IGNORECASE)
-              if not pattern.search(resume_text):
-                score -= header_weight
-                reasons.append(f"Missing required header: {header}")
-              else:
-                rule_score += header_weight
-            elif "skills" in header.lower():
-              pattern = re.compile(r"\b\w*skills\w*\b", re.IGNORECASE)
-              if not pattern.search(resume_text):
-                score -= header_weight
-                reasons.append(f"Missing required header containing the word: 'skills'")
-              else:
-                rule_score += header_weight
-
-            elif "experience" in header.lower():
-              pattern = re.compile(r"\b\w*experience\w*\b", re.IGNORECASE)
-              if not pattern.search(resume_text):
-                score -= header_weight
-                reasons.append(f"Missing required header containing the word: 'experience'")
-              else:
-                 rule_score += header_weight
-      rule_scores[rule_name] = rule_score
-
-    model = genai.GenerativeModel('gemini-pro')
     # prompt = f"check if they are following STAR method in {resume_text}"
     prompt = f"if they have followed STAR method in {resume_text}, say yes, if not say no. only say yes or no."
-    response = model.generate_content(prompt)
+    response_text = llm_cache.generate_content(prompt)
 
-    if resume_text and response and response.text:
-        if response.text.lower() == "yes":
-            star_score = 100
-        else:
-            star_score = 0
+    if response_text and response_text.strip().lower() == "yes":
+        return 100
+    return 0
+
+def score_resume_format(resume_text, formatting_rules, star_score=None, layout=None):
+    """Scores a resume based on defined formatting rules.
+
+    Args:
+        resume_text (str): The text content of the resume.
+        formatting_rules (dict): A dictionary specifying formatting rules and weights.
+        star_score (int, optional): A precomputed STAR-method score; queried from Gemini when omitted.
+        layout (pdf_extraction.DocumentLayout, optional): PDF structure used for header and bullet checks.
+
+    Returns:
+        dict: A dictionary containing the formatting score, reasons, and individual rule scores.
+    """
+    score, reasons = score_headings(resume_text, formatting_rules, layout)
+
+    if star_score is None:
+        star_score = check_star_method(resume_text)
 
     total_score_formatting = (star_score + score) / 2
     total_score_formatting_normalized = max(0, min(100, total_score_formatting))  # Ensure score is between 0 and 100
@@ -195,82 +307,122 @@ def score_resume_format(resume_text, formatting_rules):
       "missing_headings": reasons
     }
 
-def analyze_resume(resume_text, job_description_text, formatting_rules):
+def extract_job_keywords(job_description_text):
+    """
+    Extracts the cleaned keyword set of a job description using Gemini.
+
+    Returns an empty set when the model returns nothing, so that the job registry does not store
+    the failure; callers fall back to job_description_words.
+    """
+    # job_description_text = clean_text(job_description_text)
+
+    # ------ Gemini Prompt to extract Keywords from the Job Description -------
+    prompt = f"find the key words in {job_description_text}. do not add additional words."
+    response_text = llm_cache.generate_content(prompt)
+    if response_text:
+        return set(clean_text(response_text).split())
+    return set()
+
+def strip_punctuation(text):
+    """Removes everything but letters, digits and whitespace, and lowercases the text."""
+    return re.sub(r"[^a-zA-Z0-9\s]", "", text).lower()
+
+def extract_job_key_terms(job_description_text):
+    """
+    Extracts the unstemmed key skills and requirements of a job description using Gemini
+    (the terms main.analyze_resume matches with keyword_matcher).
+
+    Returns an empty set when the model returns nothing.
+    """
+    job_description_text = strip_punctuation(job_description_text)
+    prompt = f"extract the key skills and requirements from this job description: {job_description_text}"
+    response_text = llm_cache.generate_content(prompt)
+    if response_text:
+        return set(strip_punctuation(response_text).split())
+    return set()
+
+def job_description_words(job_description_text):
+    """Fallback keywords for when extraction returned nothing: the raw whitespace-separated words."""
+    return set(job_description_text.split())
+
+def describe_matched_keywords(matched_keywords):
+    """Asks Gemini for a user-facing sentence listing the matched keywords (None if there are none)."""
+    if not matched_keywords:
+        return None
+    prompt1 = f"{matched_keywords} contains the matched keywords in a resume. write a sentence for the user saying these words are matched. if the words have miss spelling problems, fix them and do not have duplicate words."
+    return llm_cache.generate_content(prompt1)
+
+def describe_missing_keywords(missing_keywords):
+    """Asks Gemini for a user-facing sentence listing the missing keywords (None if there are none)."""
+    if not missing_keywords:
+        return None
+    prompt2 = f"{missing_keywords} contains the missing words in a resume. write a sentence for the user saying these words are missing."
+    return llm_cache.generate_content(prompt2)
+
+@tracing.traced("score.analyze")
+def analyze_resume(resume_text, job_description_text, formatting_rules, parallel=True, job_keywords=None,
+                   describe=True, layout=None):
     """
     Analyzes the alignment of a resume with a job description and its formatting.
 
+    The keyword-extraction and STAR-method prompts are independent, and the two feedback
+    sentences only depend on the keyword sets, so the Gemini calls run as a small task graph:
+    two concurrent rounds instead of four sequential ones.
+
     Args:
         resume_text (str): Text from the resume.
         job_description_text (str): Text from the job description.
         formatting_rules (dict): Rules for formatting scoring.
+        parallel (bool): Run independent prompts concurrently (set to False for sequential calls).
+        job_keywords (set, optional): Precomputed job keywords (see extract_job_keywords). By default
+            they are loaded from the job registry, so each posting is only sent to Gemini once.
+        describe (bool): Ask Gemini for the matched/missing feedback sentences.
+        layout (pdf_extraction.DocumentLayout, optional): Structure of the resume PDF (see
+            extract_layout_from_pdf); formatting checks then use its headers and bullets.
 
     Returns:
         dict: Analysis results, including score, matched keywords, and formatting information.
     """
-    # Clean the texts
-    resume_text_cleaned = clean_text(resume_text)
-
-
-
-    # job_description_text = clean_text(job_description_text)
-
-    # ------ Gemini Prompt to extract Keywords from the Job Description -------
-    model = genai.GenerativeModel('gemini-pro')
-    prompt = f"find the key words in {job_description_text}. do not add additional words."
-    response = model.generate_content(prompt)
-    if response and response.text:
-        job_keywords = set(clean_text(response.text).split())
-    else:
-        job_keywords = set(job_description_text.split())
-
-    # print("job: ", job_keywords)
-    resume_keywords = set(resume_text_cleaned.split())
-
+    tasks = {
+        # Clean the texts
+        "resume_keywords": ((), lambda _: set(clean_text(resume_text).split())),
+        "job_keywords": ((), lambda _: job_keywords if job_keywords is not None
+                         else job_registry.get_job_keywords(job_description_text)),
+        "star_score": ((), lambda _: check_star_method(resume_text)),
+        "match_output": (
+            ("resume_keywords", "job_keywords"),
+            lambda r: describe_matched_keywords(r["job_keywords"] & r["resume_keywords"]) if describe else None,
+        ),
+        "missing_output": (
+            ("resume_keywords", "job_keywords"),
+            lambda r: describe_missing_keywords(r["job_keywords"] - r["resume_keywords"]) if describe else None,
+        ),
+    }
+    results = run_task_graph(tasks, parallel=parallel)
 
+    job_keywords = results["job_keywords"]
+    resume_keywords = results["resume_keywords"]
 
     # Find matches
     matched_keywords = job_keywords & resume_keywords
     match_score = len(matched_keywords) / len(job_keywords) * 100 if job_keywords else 0
 
-    # print("resume: ", resume_keywords)
     # Score the resume formatting
-    formatting_score_data = score_resume_format(resume_text, formatting_rules)
+    formatting_score_data = score_resume_format(resume_text, formatting_rules, star_score=results["star_score"],
+                                                layout=layout)
 
     # Combine scores with weights (e.g., 70% match score, 30% formatting score)
     final_score = (0.70 * match_score) + (0.30 * formatting_score_data["total_score_formatting"])
-    star_score = formatting_score_data["star_score"]
-    heading_score = formatting_score_data["heading_score"]
-    missing_headings = formatting_score_data["missing_headings"]
-
-    if list(matched_keywords):
-        model1 = genai.GenerativeModel('gemini-pro')
-        prompt1 = f"{matched_keywords} contains the matched keywords in a resume. write a sentence for the user saying these words are matched. if the words have miss spelling problems, fix them and do not have duplicate words."
-        response1 = model1.generate_content(prompt1)
-        match_output = response1.text
-    else:
-        match_output = None
-
-
-    missing_keywords = job_keywords - matched_keywords
-
-    if list(missing_keywords):
-        model2 = genai.GenerativeModel('gemini-pro')
-        prompt2 = f"{missing_keywords} contains the missing words in a resume. write a sentence for the user saying these words are missing."
-        response2 = model2.generate_content(prompt2)
-        missing_output = response2.text
-    else:
-        missing_output = None
-
 
     return {
         "match_score": match_score,
-        "matched_keywords": match_output,
-        "missing_keywords": missing_output,
+        "matched_keywords": results["match_output"],
+        "missing_keywords": results["missing_output"],
         "total_score_formatting": formatting_score_data["total_score_formatting"],
         "final_score": final_score,
-        "star_score": star_score,
-        "heading_score": heading_score,
-        "missing_headings": missing_headings,
+        "star_score": formatting_score_data["star_score"],
+        "heading_score": formatting_score_data["heading_score"],
+        "missing_headings": formatting_score_data["missing_headings"],
         "job_keywords": job_keywords,
         "resume_keywords": resume_keywords,
 
@@ -278,11 +430,9 @@ def analyze_resume(resume_text, job_description_text, formatting_rules):
 
 
 
-def extract_resume_info(text):
+def _prepare_for_extraction(text):
     """
-    Cleans text using spaCy, removing stopwords, special characters, bullet points,
-    and normalizing with lemmatization. Retains numbers, normalizes months,
-    removes URLs, and preserves named entities.
+    Applies the regex normalization steps of extract_resume_info and returns the lowercased text.
     """
     # Step 1: Normalize months
     text = normalize_months(text)
@@ -295,102 +445,62 @@ def extract_resume_info(text):
     text = re.sub(r"[\u2022•●▪♦❖▶■□]", "", text)  # Remove common bullet points
     text = re.sub(r"[^\w\s]", "", text)  # Remove special characters except spaces and word characters
 
-    # Step 4: Process text with spaCy
-    doc = nlp(text.lower())
+    return text.lower()
 
-    # Step 5: Filter tokens
+def _filter_lemmas(doc):
+    """
+    Keeps named entities, numbers and non-stopwords of a spaCy doc as lemmas.
+    """
     filtered_words = []
     for token in doc:
         # Keep named entities, numbers, or words that are not stopwords
         if token.ent_type_ or not token.is_stop or token.is_digit or token.text.isalnum():
             filtered_words.append(token.lemma_)  # Use lemma for normalization
+    return filtered_words
 
-    # Step 6: Return cleaned text
-    return " ".join(filtered_words)
+@tracing.traced("spacy.extract_info")
+def extract_resume_info(text):
+    """
+    Cleans text using spaCy, removing stopwords, special characters, bullet points,
+    and normalizing with lemmatization. Retains numbers, normalizes months,
+    removes URLs, and preserves named entities.
+    """
+    # Step 4: Process text with spaCy
+    doc = get_nlp(EXTRACT_INFO_PIPES)(_prepare_for_extraction(text))
 
-def parse_resume_to_json(text):
-    # Helper function to extract specific fields from text
-    def extract_field(pattern, text, default=""):
-        """
-        Extracts the first match for the given pattern from the text.
-        """
-        match = re.search(pattern, text, re.IGNORECASE)
-        return match.group(1).strip() if match else default
-
-    # Extract basic information
-    name = extract_field(r"^(.*?)\n", text)
-    location = ""
-    phone = extract_field(r"(\+?\d[\d\s\-\(\)]+)", text)
-    email = extract_field(r"([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})", text)
-    linkedin = extract_field(r"linkedin\S*(\S+)", text)
-    github = extract_field(r"github\S*(\S+)", text)
-
-    # Extract sections
-    summary_pattern = r"education\n(.*?)technical skill"
-    summary = re.findall(r"\u2022?(.*?)(?:\.|\n)", extract_field(summary_pattern, text))
-
-    skills_pattern = r"technical skill\n(.*?)research experience"
-    skills_text = extract_field(skills_pattern, text)
-    skills = re.split(r",|\n|\s\u2022\s", skills_text)
-    skills = [skill.strip() for skill in skills if skill.strip()]
-
-    education_pattern = r"education\n(.*?)research experience"
-    education_text = extract_field(education_pattern, text)
-    education_entries = re.split(r"\n\n", education_text)
-
-    education = []
-    for entry in education_entries:
-        institution = extract_field(r"^(.*?)\n", entry)
-        degree = extract_field(r"degree\n(.*?)\n", entry)
-        years = extract_field(r"\b(\d{4}\s*-\s*\d{4}|\d{4}\s*-\s*present|\d{4})\b", entry)
-        location = extract_field(r",\s*(.*?)\n", entry)
-        details = re.findall(r"\u2022\s*(.*?)\n", entry)
-        education.append({
-            "institution": institution,
-            "degree": degree,
-            "years": years,
-            "location": location,
-            "details": details
-        })
-
-    experience_pattern = r"research experience\n(.*?)additional activity"
-    experience_text = extract_field(experience_pattern, text)
-    experience_entries = re.split(r"\n\n", experience_text)
-
-    experience = []
-    for entry in experience_entries:
-        position = extract_field(r"^(.*?)\n", entry)
-        company = extract_field(r"\n\u2022\s*(.*?)\n", entry)
-        years = extract_field(r"\b(\d{4}\s*-\s*\d{4}|\d{4}\s*-\s*present|\d{4})\b", entry)
-        location = extract_field(r",\s*(.*?)\n", entry)
-        details = re.findall(r"\u2022\s*(.*?)\n", entry)
-        experience.append({
-            "position": position,
-            "company": company,
-            "years": years,
-            "location": location,
-            "details": details
-        })
-
-    # Construct the JSON output
-    resume_data = {
-        "name": name,
-        "location": location,
-        "phone": phone,
-        "email": email,
-        "linkedin": linkedin,
-        "github": github,
-        "summary": summary,
-        "skills": skills,
-        "education": education,
-        "experience": experience
-    }
+    # Step 5 & 6: Filter tokens and return cleaned text
+    return " ".join(_filter_lemmas(doc))
+
+def extract_resume_infos(texts, batch_size=64, n_process=1, as_tokens=False):
+    """
+    Batched variant of extract_resume_info that streams many documents through nlp.pipe.
 
-    return resume_data
+    Args:
+        texts (Iterable[str]): The documents to normalize (consumed lazily).
+        batch_size (int): Number of documents spaCy processes per batch.
+        n_process (int): Number of spaCy worker processes (-1 for all CPUs).
+        as_tokens (bool): Yield lists of lemmas instead of joined strings.
 
-def json_creater(info):
+    Yields:
+        str or list: The normalized text (or lemma list) of each document, in input order.
+    """
+    nlp = get_nlp(EXTRACT_INFO_PIPES)
+    prepared = (_prepare_for_extraction(text) for text in texts)
+    for doc in nlp.pipe(prepared, batch_size=batch_size, n_process=n_process):
+        lemmas = _filter_lemmas(doc)
+        yield lemmas if as_tokens else " ".join(lemmas)
 
-    desired_json= {
+def parse_resume_to_json(text):
+    """
+    Structures resume text locally (no model call) with the deterministic resume_parser.
+
+    Returns:
+        dict: Resume data in the RESUME_JSON_TEMPLATE shape.
+    """
+    return resume_parser.parse_resume(text)[0]
+
+# Shape of the structured resume JSON (shown to the model as the target format)
+RESUME_JSON_TEMPLATE = {
     "name": "",
     "location": "",
     "phone": "",
@@ -438,15 +548,148 @@ def json_creater(info):
         "details": ["", "", ""]
         }
     ]
+}
+
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+
+
+def _entry_schema(*fields):
+    return {
+        "type": "array",
+        "items": {
+            "type": "object",
+            "properties": dict({field: {"type": "string"} for field in fields}, details=_STRING_LIST),
+        },
     }
 
-    model = genai.GenerativeModel('gemini-pro')
-    prompt = f"{info} contains information of a resume. write it in the format of {desired_json}."
-    response = model.generate_content(prompt)
-    info_output = response.text
+
+RESUME_JSON_SCHEMA = {
+    "type": "object",
+    "required": ["name", "experience"],
+    "properties": {
+        "name": {"type": "string", "minLength": 1},
+        "location": {"type": "string"},
+        "phone": {"type": "string"},
+        "email": {"type": "string"},
+        "linkedin": {"type": "string"},
+        "github": {"type": "string"},
+        "summary": _STRING_LIST,
+        "skills": _STRING_LIST,
+        "education": _entry_schema("institution", "degree", "years", "location"),
+        "experience": _entry_schema("position", "company", "years", "location"),
+    },
+}
+
+def json_creater(info):
+    prompt = f"{info} contains information of a resume. write it in the format of {RESUME_JSON_TEMPLATE}."
+    info_output = llm_cache.generate_content(prompt)
     print(info_output)
     return info_output
 
+def _fill_nulls(value, schema):
+    """Replaces nulls, at any depth, with the empty value of the type the schema expects there."""
+    if value is None:
+        return {"string": "", "array": [], "object": {}}.get(schema.get("type"), value)
+    if isinstance(value, dict):
+        properties = schema.get("properties", {})
+        return {key: _fill_nulls(item, properties.get(key, {})) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_fill_nulls(item, schema.get("items", {})) for item in value]
+    return value
+
+def _is_valid_resume_json(response_text):
+    return _parse_resume_json(response_text)[1] is None
+
+def _parse_resume_json(response_text):
+    """
+    Parses and validates a model response against RESUME_JSON_SCHEMA.
+
+    Returns:
+        tuple: (resume dict, None) on success, or (None, error message) on failure.
+    """
+    fenced_match = re.search(r"```json\s*(\{.*\})\s*```", response_text, re.DOTALL)
+    brace_match = fenced_match or re.search(r"\{.*\}", response_text, re.DOTALL)
+    if not brace_match:
+        return None, "The response does not contain a JSON object."
+    try:
+        data = json.loads(fenced_match.group(1) if fenced_match else brace_match.group(0))
+    except json.JSONDecodeError as e:
+        return None, f"Invalid JSON: {e}"
+
+    data = _fill_nulls(data, RESUME_JSON_SCHEMA)
+    try:
+        validate(instance=data, schema=RESUME_JSON_SCHEMA)
+    except ValidationError as e:
+        return None, f"Schema validation failed at {'/'.join(map(str, e.absolute_path)) or 'root'}: {e.message}"
+    return data, None
+
+def extract_resume_json(resume_text, max_repairs=1):
+    """
+    Structures raw resume text into validated resume JSON with a single model call.
+
+    The response is validated against RESUME_JSON_SCHEMA; only if it is invalid is the model
+    asked (up to max_repairs times) to repair its own output.
+
+    Args:
+        resume_text (str): Text extracted from the resume.
+        max_repairs (int): Number of repair calls allowed after a failed validation.
+
+    Returns:
+        dict: The structured resume, or None if no valid JSON could be obtained.
+    """
+    prompt = (
+        f"{resume_text}\n\nThe text above contains information of a resume. "
+        f"Write it as a JSON object in exactly this format: {json.dumps(RESUME_JSON_TEMPLATE)}. "
+        "Use as many list entries as the resume has, use empty strings for missing values, "
+        "and respond with only the JSON object."
+    )
+    # Invalid responses are never cached, so a bad answer is not replayed on the next call
+    response_text = llm_cache.generate_content(prompt, validate=_is_valid_resume_json)
+    data, error = _parse_resume_json(response_text)
+
+    for attempt in range(max_repairs):
+        if error is None:
+            break
+        logging.warning("Resume JSON invalid (%s); requesting a repair (attempt %d).", error, attempt + 1)
+        repair_prompt = (
+            f"The following resume JSON is invalid: {error}\n\n{response_text}\n\n"
+            f"Return a corrected JSON object in exactly this format: {json.dumps(RESUME_JSON_TEMPLATE)}. "
+            "Respond with only the JSON object."
+        )
+        response_text = llm_cache.generate_content(repair_prompt, validate=_is_valid_resume_json)
+        data, error = _parse_resume_json(response_text)
+
+    if error is not None:
+        logging.error("Could not obtain valid resume JSON: %s", error)
+        return None
+    return data
+
+@tracing.traced("resume.structure")
+def structure_resume(resume_text, confidence_threshold=None, layout=None):
+    """
+    Structures resume text, using the local parser when it is confident and the model otherwise.
+
+    Args:
+        resume_text (str): Text extracted from the resume.
+        confidence_threshold (float, optional): Minimum parser confidence to skip the model
+            (defaults to resume_parser.CONFIDENCE_THRESHOLD).
+        layout (pdf_extraction.DocumentLayout, optional): Structure of the resume PDF; its sections
+            replace header detection on the raw text.
+
+    Returns:
+        dict: The structured resume, or None if neither path produced one.
+    """
+    if confidence_threshold is None:
+        confidence_threshold = resume_parser.CONFIDENCE_THRESHOLD
+    sections = (layout.preamble, layout.sections) if layout is not None else None
+    parsed, confidence = resume_parser.parse_resume(resume_text, sections)
+    if confidence >= confidence_threshold:
+        logging.info("Structured resume locally (confidence %.2f).", confidence)
+        return parsed
+    logging.info("Local parser confidence %.2f is below %.2f; structuring with the model.",
+                 confidence, confidence_threshold)
+    return extract_resume_json(resume_text)
+
 def main():
     """
     Main function to process resumes and job descriptions.
@@ -455,12 +698,7 @@ def main():
     configure_gemini_api()
 
      # Define formatting rules
-    formatting_rules = {
-        "section_headers": {
-            "headers": ["skills", "experience", "education"],
-            "weight": 15,
-        }
-    }
+    formatting_rules = DEFAULT_FORMATTING_RULES
 
     resume_text = None
     job_description_text = None
@@ -0,0 +1,267 @@
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import tracing
+
+# Documents scoring below this are sent to the LLM for structuring instead
+CONFIDENCE_THRESHOLD = float(os.getenv("RESUME_PARSER_CONFIDENCE", "0.7"))
+
+# Canonical section name -> header phrases that introduce it
+SECTION_ALIASES = {
+    "summary": ("summary", "professional summary", "profile", "professional profile", "objective",
+                "career objective", "about me"),
+    "education": ("education", "academic background", "education and training"),
+    "experience": ("experience", "work experience", "professional experience", "research experience",
+                   "employment", "employment history", "work history", "relevant experience"),
+    "skills": ("skills", "technical skills", "technical skill", "core competencies", "key skills",
+               "skills and interests", "technologies"),
+    "projects": ("projects", "personal projects", "academic projects", "selected projects"),
+    "certifications": ("certifications", "certificates", "licenses and certifications"),
+    "publications": ("publications", "papers"),
+    "activities": ("activities", "additional activity", "additional activities", "extracurricular activities",
+                   "volunteer experience", "volunteering", "leadership", "awards", "honors and awards"),
+}
+_HEADER_LOOKUP = {alias: section for section, aliases in SECTION_ALIASES.items() for alias in aliases}
+
+MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+DATE = rf"(?:{MONTH}\s+\d{{4}}|\d{{1,2}}/\d{{4}}|\d{{4}})"
+DATE_RANGE_PATTERN = re.compile(
+    rf"\b{DATE}\s*(?:-|–|—|to)\s*(?:{DATE}|present|current|now)\b|\b{MONTH}\s+\d{{4}}\b|\b(?:19|20)\d{{2}}\b",
+    re.IGNORECASE,
+)
+# Dates that mark an entry header (a range or a month and year, not a bare year inside a sentence)
+ENTRY_DATE_PATTERN = re.compile(rf"\b{DATE}\s*(?:-|–|—|to)\s*(?:{DATE}|present|current|now)\b|\b{MONTH}\s+\d{{4}}\b",
+                                re.IGNORECASE)
+# Leading sentence ended by punctuation directly followed by a capitalized word
+GLUED_SENTENCE_PATTERN = re.compile(r"(.*[.!?])\s*(?=[A-Z])")
+EMAIL_PATTERN = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+PHONE_PATTERN = re.compile(r"(?<!\d)(?:\(?\+?\d{1,3}\)?[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}(?!\d)")
+LINKEDIN_PATTERN = re.compile(r"(?:https?://)?(?:[\w-]+\.)?linkedin\.com/[^\s|,]+", re.IGNORECASE)
+GITHUB_PATTERN = re.compile(r"(?:https?://)?(?:www\.)?github\.com/[^\s|,]+", re.IGNORECASE)
+# A whole "City, ST" / "City, Province" field (matched against separator-delimited parts of a line)
+LOCATION_PATTERN = re.compile(r"[A-Z][a-zA-Z.\-]*(?: [A-Z][a-zA-Z.\-]*){0,2},\s*[A-Z][a-zA-Z]+(?: [A-Z][a-zA-Z]+){0,2}")
+# An upper-case location glued to the end of a line ("Hefei University of Technology HEFEI, CHINA")
+TRAILING_LOCATION_PATTERN = re.compile(r"\s+([A-Z]{2,}(?: [A-Z]{2,}){0,2},\s*[A-Z]{2,}(?: [A-Z]{2,}){0,2})$")
+BULLET_PATTERN = re.compile(r"^\s*(?:[•●▪◦‣∙·*\-–]|o(?=\s))\s*")
+FIELD_SEPARATORS = re.compile(r"\s*\|\s*|\s+(?:—|–|-|@|at|·)\s+|\s{3,}|\t+")
+SKILL_SEPARATORS = re.compile(r"[,;|•●▪]|\n")
+
+# Weight of each signal in the confidence score (the weights sum to 1)
+CONFIDENCE_WEIGHTS = {
+    "name": 0.15,
+    "email": 0.15,
+    "phone": 0.05,
+    "experience": 0.2,
+    "education": 0.15,
+    "skills": 0.1,
+    "dated_entries": 0.1,
+    "coverage": 0.1,
+}
+
+
+###############################################################################
+# 1) Section Segmentation
+###############################################################################
+def detect_header(line: str) -> Optional[str]:
+    """Returns the canonical section name if a line is a section header, otherwise None."""
+    candidate = line.strip().rstrip(":").strip().lower()
+    if not candidate or len(candidate.split()) > 5:
+        return None
+    candidate = re.sub(r"\s+", " ", candidate.replace("&", "and"))
+    return _HEADER_LOOKUP.get(candidate)
+
+
+def segment_sections(text: str) -> Tuple[List[str], Dict[str, List[str]]]:
+    """
+    Splits a resume into the lines before the first header and the lines of each section.
+
+    Returns:
+        tuple: (header lines, {section: [lines]}); repeated sections are concatenated.
+    """
+    preamble: List[str] = []
+    sections: Dict[str, List[str]] = {}
+    current = None
+    for line in text.splitlines():
+        section = detect_header(line)
+        if section is not None:
+            current = sections.setdefault(section, [])
+        elif line.strip():
+            (preamble if current is None else current).append(line.strip())
+    return preamble, sections
+
+
+###############################################################################
+# 2) Field Extraction
+###############################################################################
+def _first(pattern: re.Pattern, text: str) -> str:
+    match = pattern.search(text)
+    return match.group(0).strip() if match else ""
+
+
+def split_fields(line: str) -> List[str]:
+    """Splits a line on field separators ("|", dashes, "at", wide gaps) and strips date ranges."""
+    fields = []
+    for field in FIELD_SEPARATORS.split(DATE_RANGE_PATTERN.sub("", line)):
+        field = field.strip(" ,|-–—·")
+        trailing_location = TRAILING_LOCATION_PATTERN.search(field)
+        if trailing_location and trailing_location.start() > 0:
+            fields += [field[:trailing_location.start()], trailing_location.group(1)]
+        elif field:
+            fields.append(field)
+    return fields
+
+
+def _is_location(field: str) -> bool:
+    return LOCATION_PATTERN.fullmatch(field) is not None
+
+
+def extract_contact(lines: List[str]) -> Dict[str, str]:
+    """Extracts name, location, phone, email, linkedin and github from the top of a resume."""
+    text = "\n".join(lines)
+    location = next((field for line in lines for field in split_fields(line) if _is_location(field)), "")
+    name = ""
+    for line in lines[:3]:
+        words = line.split()
+        if 1 < len(words) <= 5 and not EMAIL_PATTERN.search(line) and not any(char.isdigit() for char in line):
+            name = line
+            break
+    return {
+        "name": name,
+        "location": location,
+        "phone": _first(PHONE_PATTERN, text),
+        "email": _first(EMAIL_PATTERN, text),
+        "linkedin": _first(LINKEDIN_PATTERN, text),
+        "github": _first(GITHUB_PATTERN, text),
+    }
+
+
+def _ends_sentence(text: str) -> bool:
+    return text.rstrip().endswith((".", "!", "?", ";"))
+
+
+def split_entries(lines: List[str]) -> List[Dict[str, List[str]]]:
+    """
+    Groups section lines into entries: header lines (title, organization, dates) followed by bullets.
+
+    A non-bullet line after a bullet is the wrapped continuation of that bullet unless it looks like
+    the start of the next entry: it carries a date range, or it is followed by a line that does.
+    """
+    entries: List[Dict[str, List[str]]] = []
+    for index, line in enumerate(lines):
+        is_bullet = BULLET_PATTERN.match(line) is not None
+        if entries and not is_bullet and entries[-1]["details"]:
+            details = entries[-1]["details"]
+            date_match = ENTRY_DATE_PATTERN.search(line)
+            following = lines[index + 1] if index + 1 < len(lines) else ""
+            if date_match and not _ends_sentence(details[-1]):
+                # Text extraction can glue the end of a wrapped bullet to the next header ("...series.Developer 2022")
+                glued = GLUED_SENTENCE_PATTERN.match(line[:date_match.start()])
+                if glued and len(glued.group(1).split()) >= 3:
+                    details[-1] += " " + glued.group(1)
+                    line = line[glued.end():]
+            elif not date_match and (line[0].islower() or BULLET_PATTERN.match(following)
+                                     or not ENTRY_DATE_PATTERN.search(following)):
+                details[-1] += " " + line  # Wrapped bullet text
+                continue
+        if not entries or (not is_bullet and entries[-1]["details"]):
+            entries.append({"header": [], "details": []})
+        if is_bullet:
+            entries[-1]["details"].append(BULLET_PATTERN.sub("", line, count=1))
+        else:
+            entries[-1]["header"].append(line)
+    return entries
+
+
+def _parse_entry(entry: Dict[str, List[str]], title_key: str, organization_key: str) -> Dict[str, Any]:
+    date_match = DATE_RANGE_PATTERN.search("\n".join(entry["header"]))
+    fields = [field for line in entry["header"] for field in split_fields(line)]
+    location = next((field for field in fields if _is_location(field)), "")
+    parts = [field for field in fields if field != location]
+    return {
+        title_key: parts[0] if parts else "",
+        organization_key: parts[1] if len(parts) > 1 else "",
+        "years": date_match.group(0) if date_match else "",
+        "location": location,
+        "details": entry["details"],
+    }
+
+
+def parse_entries(lines: List[str], title_key: str, organization_key: str) -> List[Dict[str, Any]]:
+    """Parses experience/education lines into entries with a title, organization, years, location and details."""
+    return [_parse_entry(entry, title_key, organization_key) for entry in split_entries(lines)]
+
+
+def parse_skills(lines: List[str]) -> List[str]:
+    """Splits a skills section into individual skills (dropping "Languages:"-style labels)."""
+    skills = []
+    for line in lines:
+        line = BULLET_PATTERN.sub("", line, count=1)
+        if ":" in line:
+            line = line.split(":", 1)[1]
+        skills += [skill.strip() for skill in SKILL_SEPARATORS.split(line) if skill.strip()]
+    return skills
+
+
+def parse_bullets(lines: List[str]) -> List[str]:
+    """Returns a section's bullets (or its sentences, when it is written as a paragraph)."""
+    entries = split_entries(lines)
+    bullets = [detail for entry in entries for detail in entry["details"]]
+    if bullets:
+        return bullets
+    paragraph = " ".join(lines)
+    return [sentence.strip() for sentence in re.split(r"(?<=\.)\s+", paragraph) if sentence.strip()]
+
+
+###############################################################################
+# 3) Resume Parsing
+###############################################################################
+def score_confidence(resume: Dict[str, Any], sections: Dict[str, List[str]], text: str) -> float:
+    """
+    Estimates how completely a resume was structured, between 0 and 1.
+
+    The score combines whether the contact fields and core sections were found, whether every
+    experience entry carries dates, and the share of non-empty lines that fell inside a section.
+    """
+    lines = [line for line in text.splitlines() if line.strip()]
+    sectioned = sum(len(section_lines) for section_lines in sections.values())
+    experience = resume["experience"]
+    signals = {
+        "name": bool(resume["name"]),
+        "email": bool(resume["email"]),
+        "phone": bool(resume["phone"]),
+        "experience": bool(experience),
+        "education": bool(resume["education"]),
+        "skills": bool(resume["skills"]),
+        "dated_entries": bool(experience) and all(entry["years"] for entry in experience),
+        "coverage": min(1.0, sectioned / max(1, len(lines)) / 0.8),
+    }
+    return round(sum(CONFIDENCE_WEIGHTS[name] * float(value) for name, value in signals.items()), 3)
+
+
+@tracing.traced("parser.parse")
+def parse_resume(text: str, sections: Optional[Tuple[List[str], Dict[str, List[str]]]] = None
+                 ) -> Tuple[Dict[str, Any], float]:
+    """
+    Structures resume text locally, without any model call.
+
+    Args:
+        text (str): Text extracted from the resume.
+        sections (tuple, optional): (preamble lines, {section: [lines]}) already derived from the
+            document layout (see pdf_extraction.extract_layout); detected from the text when omitted.
+
+    Returns:
+        tuple: (resume dict in the RESUME_JSON_TEMPLATE shape, confidence between 0 and 1).
+    """
+    preamble, sections = sections if sections is not None else segment_sections(text)
+    resume: Dict[str, Any] = extract_contact(preamble)
+    resume.update({
+        "summary": parse_bullets(sections.get("summary", [])),
+        "skills": parse_skills(sections.get("skills", [])),
+        "education": parse_entries(sections.get("education", []), "institution", "degree"),
+        "experience": parse_entries(sections.get("experience", []), "position", "company"),
+    })
+    for section in ("projects", "certifications", "publications", "activities"):
+        if section in sections:
+            resume[section] = parse_bullets(sections[section])
+    return resume, score_confidence(resume, sections, text)
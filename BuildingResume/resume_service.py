@@ -0,0 +1,548 @@
+import argparse
+import asyncio
+import base64
+import binascii
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, NamedTuple, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+import job_queue
+import job_registry
+import latex_compiler
+import llm_cache
+import pdf_store
+import resume_evaluator
+import template_registry
+import tracing
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = os.getenv("RESUME_SERVICE_HOST", "127.0.0.1")
+DEFAULT_PORT = int(os.getenv("RESUME_SERVICE_PORT", "8080"))
+
+# Requests processed at once; the rest wait up to QUEUE_TIMEOUT seconds for a slot, then get a 503
+MAX_CONCURRENCY = int(os.getenv("RESUME_SERVICE_CONCURRENCY", "4"))
+QUEUE_TIMEOUT = float(os.getenv("RESUME_SERVICE_QUEUE_TIMEOUT", "30"))
+
+MAX_BODY_BYTES = int(os.getenv("RESUME_SERVICE_MAX_BODY", str(10 * 1024 * 1024)))
+HEADER_TIMEOUT = 30.0
+
+# How often a job's event stream checks for new events, and the idle interval between keep-alive comments
+EVENT_POLL_INTERVAL = 0.25
+EVENT_KEEPALIVE_SECONDS = 15.0
+
+# Origin allowed to call the service from a browser (the React frontend)
+CORS_ORIGIN = os.getenv("RESUME_SERVICE_CORS_ORIGIN", "*")
+
+
+class HTTPError(Exception):
+    """An error answered with the given status and a JSON {"error": message} body."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class Request(NamedTuple):
+    method: str
+    path: str
+    query: Dict[str, str]
+    headers: Dict[str, str]
+    body: bytes
+
+    def json(self) -> Dict[str, Any]:
+        try:
+            data = json.loads(self.body or b"{}")
+        except ValueError as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Invalid JSON body: {e}")
+        if not isinstance(data, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "The JSON body must be an object.")
+        return data
+
+
+class Response(NamedTuple):
+    status: HTTPStatus
+    body: bytes
+    content_type: str = "application/json"
+
+
+class StreamingResponse(NamedTuple):
+    status: HTTPStatus
+    chunks: AsyncIterator[bytes]
+    content_type: str = "text/event-stream"
+
+
+def json_response(data: Any, status: HTTPStatus = HTTPStatus.OK) -> Response:
+    """Serializes data (sets become sorted lists) into a JSON response."""
+    def default(value):
+        if isinstance(value, (set, frozenset)):
+            return sorted(value)
+        return str(value)
+    return Response(status, json.dumps(data, default=default).encode("utf-8"))
+
+
+###############################################################################
+# 1) Warm State
+###############################################################################
+def warm_up(stub: bool = False) -> Dict[str, float]:
+    """
+    Loads everything a request would otherwise pay for on first use: the model backend,
+    the spaCy pipeline and stemmer, the compiled Jinja2 templates and the precompiled LaTeX formats.
+
+    Args:
+        stub (bool): Answer prompts with the offline stub_llm.StubBackend instead of Gemini. The
+            LLM cache and job registry are then kept in memory, so stub output is never persisted.
+
+    Returns:
+        dict: Seconds spent on each warm-up step.
+    """
+    timings = {}
+
+    def step(name: str, function: Callable[[], Any]) -> None:
+        started = time.perf_counter()
+        try:
+            function()
+        except Exception as e:
+            logger.warning("Warm-up step %s failed: %s", name, e)
+        timings[name] = time.perf_counter() - started
+
+    if stub:
+        import stub_llm
+        stub_llm.install()
+    else:
+        step("gemini", resume_evaluator.configure_gemini_api)
+    step("spacy", lambda: resume_evaluator.get_nlp(resume_evaluator.CLEAN_TEXT_PIPES))
+    step("stemmer", lambda: resume_evaluator.stem_word("warm"))
+    step("templates", lambda: [template_registry.get_template(kind) for kind in template_registry.TEMPLATES])
+    if latex_compiler.USE_FORMATS:
+        step("latex_formats", latex_compiler.build_template_formats)
+    step("stores", lambda: (llm_cache.get_cache(), job_registry.get_registry(), pdf_store.get_store()))
+    logger.info("Warm-up finished: %s", ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items()))
+    return timings
+
+
+###############################################################################
+# 2) Endpoints
+###############################################################################
+@contextlib.contextmanager
+def _uploaded_pdf(data: Dict[str, Any]) -> Iterator[Optional[str]]:
+    """Writes the base64 "resume_pdf" field of a request to a temporary file and yields its path."""
+    encoded = data.get("resume_pdf")
+    if not encoded:
+        yield None
+        return
+    try:
+        pdf_bytes = base64.b64decode(encoded, validate=True)
+    except (binascii.Error, TypeError) as e:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"resume_pdf is not valid base64: {e}")
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(pdf_bytes)
+        yield path
+    finally:
+        os.remove(path)
+
+
+def _resume_input(data: Dict[str, Any]) -> Tuple[str, Any]:
+    """Returns the resume text and layout of a request ("resume_pdf" as base64, or "resume_text")."""
+    with _uploaded_pdf(data) as pdf_path:
+        if pdf_path is not None:
+            layout = resume_evaluator.extract_layout_from_pdf(pdf_path)
+            if layout is None or not layout.text:
+                raise HTTPError(HTTPStatus.UNPROCESSABLE_ENTITY, "Could not extract text from resume_pdf.")
+            return layout.text, layout
+    resume_text = data.get("resume_text")
+    if not resume_text:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Provide resume_pdf (base64) or resume_text.")
+    return resume_text, None
+
+
+def _structured_resume(data: Dict[str, Any], field: str) -> Dict[str, Any]:
+    """Returns resume JSON given directly in a request field, or structured from the uploaded resume."""
+    if isinstance(data.get(field), dict):
+        return data[field]
+    resume_text, layout = _resume_input(data)
+    structured = resume_evaluator.structure_resume(resume_text, layout=layout)
+    if structured is None:
+        raise HTTPError(HTTPStatus.UNPROCESSABLE_ENTITY, "Could not structure the resume.")
+    return structured
+
+
+def _job_description(data: Dict[str, Any]) -> str:
+    job_description = data.get("job_description")
+    if not job_description or not isinstance(job_description, str):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "job_description is required.")
+    return job_description
+
+
+def _document(kind: str, escaped_context: Dict[str, Any], output: str) -> Response:
+    """Renders a document as LaTeX source (output="tex") or a compiled PDF."""
+    if output == "tex":
+        return Response(HTTPStatus.OK, template_registry.render(kind, escaped_context).encode("utf-8"),
+                        "application/x-tex; charset=utf-8")
+    try:
+        return Response(HTTPStatus.OK, pdf_store.render_pdf(kind, escaped_context, jobname=kind), "application/pdf")
+    except latex_compiler.LatexCompilationError as e:
+        logger.error("LaTeX compilation failed: %s\n%s", e, e.log)
+        raise HTTPError(HTTPStatus.INTERNAL_SERVER_ERROR, "LaTeX compilation failed.")
+
+
+def score(request: Request) -> Response:
+    """
+    POST /score {"resume_pdf" | "resume_text", "job_description", "formatting_rules"?, "describe"?}
+
+    Returns the analysis of resume_evaluator.analyze_resume as JSON.
+    """
+    data = request.json()
+    job_description = _job_description(data)
+    resume_text, layout = _resume_input(data)
+    analysis = resume_evaluator.analyze_resume(
+        resume_text,
+        job_description,
+        data.get("formatting_rules") or resume_evaluator.DEFAULT_FORMATTING_RULES,
+        describe=bool(data.get("describe", False)),
+        layout=layout,
+    )
+    return json_response(analysis)
+
+
+def tailor(request: Request) -> Response:
+    """
+    POST /tailor {"resume_pdf" | "resume_text" | "resume", "job_description"}[?format=tex]
+
+    Returns the resume tailored to the job description as a PDF (or its LaTeX source).
+    """
+    import Resume
+
+    data = request.json()
+    job_description = _job_description(data)
+    resume_json = _structured_resume(data, "resume")
+    tailored = Resume.generate_resume_json(resume_json, job_description)
+    return _document("resume", Resume.escape_context(tailored), request.query.get("format", "pdf"))
+
+
+def cover_letter(request: Request) -> Response:
+    """
+    POST /cover-letter {"resume_pdf" | "resume_text" | "applicant", "job_description"}[?format=tex]
+
+    Returns a cover letter for the job description as a PDF (or its LaTeX source).
+    """
+    import Coverletter
+
+    data = request.json()
+    job_description = _job_description(data)
+    applicant_info = _structured_resume(data, "applicant")
+    job_themes = job_registry.get_job_themes(job_description)
+    if not job_themes:
+        raise HTTPError(HTTPStatus.BAD_GATEWAY, "Job themes extraction failed.")
+    cover_letter_data = Coverletter.generate_final_cover_letter(applicant_info, job_description, job_themes)
+    if not cover_letter_data:
+        raise HTTPError(HTTPStatus.BAD_GATEWAY, "Cover letter generation failed.")
+    return _document("cover_letter", Coverletter.escape_context(cover_letter_data), request.query.get("format", "pdf"))
+
+
+###############################################################################
+# 3) Generation Jobs
+###############################################################################
+def submit_job(request: Request) -> Response:
+    """
+    POST /jobs {"kind": "resume" | "cover_letter", "resume_pdf", "job_description"}
+
+    Queues a generation job for the workers (see job_queue) and returns its ID at once.
+    """
+    data = request.json()
+    job_description = _job_description(data)
+    resume_pdf = data.get("resume_pdf")
+    if not resume_pdf:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "resume_pdf (base64) is required.")
+    try:
+        base64.b64decode(resume_pdf, validate=True)
+        job_id = job_queue.get_queue().submit(data.get("kind"), {
+            "resume_pdf": resume_pdf,
+            "job_description": job_description,
+        })
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, str(e))
+    return json_response({
+        "id": job_id,
+        "status": job_queue.QUEUED,
+        "events": f"/jobs/{job_id}/events",
+        "result": f"/jobs/{job_id}/result",
+    }, HTTPStatus.ACCEPTED)
+
+
+def _job(job_id: str) -> job_queue.Job:
+    job = job_queue.get_queue().get(job_id)
+    if job is None:
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"No job {job_id}.")
+    return job
+
+
+def job_result(job_id: str) -> Response:
+    """GET /jobs/<id>/result: the generated PDF, or 409 while the job is unfinished or if it failed."""
+    job = _job(job_id)
+    if job.status != job_queue.SUCCEEDED:
+        message = job.error if job.status == job_queue.FAILED else f"The job is {job.status}."
+        raise HTTPError(HTTPStatus.CONFLICT, message)
+    return Response(HTTPStatus.OK, job_queue.get_queue().result(job_id), "application/pdf")
+
+
+async def job_events(job_id: str, after: int = 0) -> AsyncIterator[bytes]:
+    """
+    GET /jobs/<id>/events: the job's events as Server-Sent Events, from after the given
+    sequence number (the Last-Event-ID header on reconnect) until it succeeds or fails.
+    """
+    queue = job_queue.get_queue()
+    idle_since = time.monotonic()
+    while True:
+        events = await asyncio.to_thread(queue.events, job_id, after)
+        for event in events:
+            after = event.seq
+            data = dict(event.data, job_id=job_id, created_at=event.created_at)
+            yield f"id: {event.seq}\nevent: {event.event}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+            if event.event in job_queue.FINISHED:
+                return
+        if events:
+            idle_since = time.monotonic()
+        elif time.monotonic() - idle_since > EVENT_KEEPALIVE_SECONDS:
+            yield b": keep-alive\n\n"
+            idle_since = time.monotonic()
+        await asyncio.sleep(EVENT_POLL_INTERVAL)
+
+
+###############################################################################
+# 4) HTTP Server
+###############################################################################
+class ResumeService:
+    """
+    Long-lived HTTP/1.1 service (stdlib asyncio) for the web frontend.
+
+    Blocking work (spaCy, model calls, pdflatex) runs on a thread pool sized to max_concurrency;
+    a semaphore admits that many requests at once and the rest wait up to queue_timeout seconds
+    before being turned away with 503. Generation jobs (/jobs) are only queued here and run by
+    job_queue workers, so their requests are not limited.
+
+    Args:
+        max_concurrency (int): Requests processed at once.
+        queue_timeout (float): Seconds a request may wait for a free slot.
+        warm_timings (dict, optional): Result of warm_up, reported by /health.
+    """
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY, queue_timeout: float = QUEUE_TIMEOUT,
+                 warm_timings: Optional[Dict[str, float]] = None):
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.warm_timings = warm_timings or {}
+        self.routes: Dict[Tuple[str, str], Callable[[Request], Response]] = {
+            ("POST", "/score"): score,
+            ("POST", "/tailor"): tailor,
+            ("POST", "/cover-letter"): cover_letter,
+        }
+        self.in_flight = 0
+        self.started_at = time.time()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="request")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def health(self) -> Response:
+        return json_response({
+            "status": "ok",
+            "backend": llm_cache.get_backend().name,
+            "uptime_seconds": time.time() - self.started_at,
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "warm_up_seconds": self.warm_timings,
+            "llm_cache": llm_cache.get_cache().stats(),
+            "job_registry": job_registry.get_registry().stats(),
+            "pdf_store": pdf_store.get_store().stats(),
+            "jobs": job_queue.get_queue().counts(),
+        })
+
+    def metrics(self, request: Request) -> Response:
+        """GET /metrics: stage timings, token counts and cache ratios as Prometheus text (?format=json for JSON)."""
+        if request.query.get("format") == "json":
+            return json_response(tracing.export_json())
+        return Response(HTTPStatus.OK, tracing.export_prometheus().encode("utf-8"),
+                        "text/plain; version=0.0.4; charset=utf-8")
+
+    async def jobs(self, request: Request) -> Union[Response, StreamingResponse]:
+        """Routes /jobs requests; they only touch the queue database, so they bypass the concurrency limit."""
+        parts = request.path.split("/")[2:]
+        if request.method == "POST" and not parts:
+            return await asyncio.to_thread(submit_job, request)
+        if request.method != "GET" or not 1 <= len(parts) <= 2:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No endpoint {request.method} {request.path}.")
+        job_id = parts[0]
+        if len(parts) == 1:
+            return json_response((await asyncio.to_thread(_job, job_id)).summary())
+        if parts[1] == "result":
+            return await asyncio.to_thread(job_result, job_id)
+        if parts[1] == "events":
+            await asyncio.to_thread(_job, job_id)
+            try:
+                after = int(request.headers.get("last-event-id") or request.query.get("after") or 0)
+            except ValueError:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Last-Event-ID must be an event sequence number.")
+            return StreamingResponse(HTTPStatus.OK, job_events(job_id, after))
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"No endpoint {request.path}.")
+
+    async def dispatch(self, request: Request) -> Union[Response, StreamingResponse]:
+        if request.method == "GET" and request.path == "/health":
+            # The queue counts are SQLite queries, kept off the event loop like the /jobs endpoints
+            return await asyncio.to_thread(self.health)
+        if request.method == "GET" and request.path == "/metrics":
+            return self.metrics(request)
+        if request.path == "/jobs" or request.path.startswith("/jobs/"):
+            return await self.jobs(request)
+        handler = self.routes.get((request.method, request.path))
+        if handler is None:
+            if any(path == request.path for _, path in self.routes):
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{request.method} is not allowed on {request.path}.")
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No endpoint {request.path}.")
+
+        try:
+            with tracing.span("http.queue_wait", route=request.path):
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            tracing.count("http_rejected_total", route=request.path)
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "The service is busy; retry later.")
+        self.in_flight += 1
+        try:
+            with tracing.span("http.request", route=request.path):
+                # The handler runs in the request's context, so its stage spans nest under this one
+                return await asyncio.get_running_loop().run_in_executor(
+                    self._executor, contextvars.copy_context().run, handler, request)
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Request]:
+        """Reads one request (None when the client closed the connection)."""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), HEADER_TIMEOUT)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            return None
+        except asyncio.LimitOverrunError:
+            raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Request headers are too large.")
+
+        request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+        try:
+            method, target, _ = request_line.split(" ", 2)
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line.")
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Content-Length must be a non-negative integer.")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"The body exceeds {MAX_BODY_BYTES} bytes.")
+        body = await reader.readexactly(length) if length else b""
+
+        url = urlsplit(target)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        return Request(method.upper(), url.path.rstrip("/") or "/", query, headers, body)
+
+    @staticmethod
+    async def _write_response(writer: asyncio.StreamWriter, response: Union[Response, StreamingResponse],
+                              keep_alive: bool) -> None:
+        status = response.status
+        streaming = isinstance(response, StreamingResponse)
+        head = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            f"Content-Type: {response.content_type}",
+            "Cache-Control: no-cache" if streaming else f"Content-Length: {len(response.body)}",
+            f"Access-Control-Allow-Origin: {CORS_ORIGIN}",
+            "Access-Control-Allow-Headers: Content-Type, Last-Event-ID",
+            "Access-Control-Allow-Methods: GET, POST, OPTIONS",
+            f"Connection: {'keep-alive' if keep_alive and not streaming else 'close'}",
+        ]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + (b"" if streaming else response.body))
+        await writer.drain()
+        if streaming:  # The stream ends with the connection
+            async for chunk in response.chunks:
+                writer.write(chunk)
+                await writer.drain()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        keep_alive = True
+        try:
+            while keep_alive:
+                started = time.perf_counter()
+                request = None
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    keep_alive = request.headers.get("connection", "").lower() != "close"
+                    if request.method == "OPTIONS":  # CORS preflight
+                        response = Response(HTTPStatus.NO_CONTENT, b"")
+                    else:
+                        response = await self.dispatch(request)
+                except HTTPError as e:
+                    keep_alive = keep_alive and request is not None  # The rest of a rejected request is unread
+                    response = json_response({"error": str(e)}, e.status)
+                except Exception as e:
+                    logger.exception("Request failed: %s", e)
+                    response = json_response({"error": "Internal server error."}, HTTPStatus.INTERNAL_SERVER_ERROR)
+                await self._write_response(writer, response, keep_alive)
+                keep_alive = keep_alive and not isinstance(response, StreamingResponse)
+                method, path = (request.method, request.path) if request is not None else ("-", "-")
+                logger.info("%s %s -> %d in %.3fs", method, path, response.status, time.perf_counter() - started)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        """Serves requests until cancelled."""
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=64 * 1024)
+        logger.info("Resume service listening on http://%s:%d", host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self._executor.shutdown(wait=False)
+
+
+###############################################################################
+# 5) Command Line Interface
+###############################################################################
+def main(argv=None):
+    """
+    Runs the service: python resume_service.py [--host HOST] [--port PORT] [--concurrency N] [--stub]
+    """
+    parser = argparse.ArgumentParser(description="HTTP service for resume scoring, tailoring and cover letters.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENCY, help="Requests processed at once.")
+    parser.add_argument("--stub", action="store_true", help="Answer prompts with the offline stub LLM.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    service = ResumeService(max_concurrency=args.concurrency, warm_timings=warm_up(stub=args.stub))
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
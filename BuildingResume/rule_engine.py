@@ -0,0 +1,241 @@
+import json
+import re
+import threading
+from typing import Any, Dict, List
+
+# Characters that start a bullet line in extracted resume text
+BULLET_CHARS = "•●▪■◦‣–*-"
+
+MONTHS = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+
+# Named patterns available to the rules. Only the patterns a rule set needs are compiled into its
+# combined regex. Patterns are anchored (lookbehind / literal first characters) so the scanner
+# never re-reads a word from every offset.
+PATTERNS = {
+    "line": rf"^[ \t]*(?:(?P<bullet>[{re.escape(BULLET_CHARS)}])[ \t]*)?(?=\S)",
+    "email": r"(?<![\w.%+-])[\w.%+-]+@[\w-]+(?:\.[\w-]+)*\.[a-zA-Z]{2,}",
+    "linkedin": r"\blinkedin\b",
+    "github": r"\bgithub\b",
+    # Dates come before phone: at the same position the first alternative wins, and a date range
+    # such as "2020-01 - 2022-05" is also a run of digits and separators
+    "date_month_year": rf"\b{MONTHS}\s+\d{{4}}\b",
+    "date_numeric": r"\b(?:0?[1-9]|1[0-2])/\d{4}\b",
+    "date_iso": r"\b\d{4}-(?:0[1-9]|1[0-2])\b",
+    # Never a year range ("2018 - 2022", "2020-01 - 2022-05")
+    "phone": r"(?<![\w+])(?!\d{4}(?:-\d{2})?[ \t]*-[ \t]*\d{4}\b)\+?\(?\d{1,3}\)?[\d \t().-]{7,}\d",
+}
+
+# Characters each pattern can start with; the combined regex is guarded by a lookahead on their
+# union, so positions that cannot start any match are skipped with a single character-class test.
+# Entries are concatenated into one class, so a literal "-" must be escaped.
+FIRST_CHARS = {
+    "email": r"\w.%+\-",
+    "linkedin": "lL",
+    "github": "gG",
+    "phone": r"+(\d",
+    "date_month_year": "adfjmnosADFJMNOS",
+    "date_numeric": r"\d",
+    "date_iso": r"\d",
+}
+
+DATE_FORMATS = ("date_month_year", "date_numeric", "date_iso")
+CONTACT_FIELDS = ("email", "phone")
+
+# Patterns each rule reads from the scan counts (section_headers adds one pattern per header)
+RULE_PATTERNS = {
+    "bullet_density": ("line",),
+    "length_limits": (),
+    "date_formats": DATE_FORMATS,
+}
+
+
+# Headers that only count as a whole word ("education", not "Coeducational"). Any other header may
+# also sit inside a longer word ("skills" in "Softskills", "experience" in "Experienced").
+WHOLE_WORD_HEADERS = {"education"}
+
+
+def header_pattern(header: str) -> str:
+    """Returns the regex matching a header, as a whole word for WHOLE_WORD_HEADERS and anywhere otherwise."""
+    if header.lower() in WHOLE_WORD_HEADERS:
+        return rf"(?<!\w){re.escape(header)}(?!\w)"
+    return re.escape(header)
+
+
+###############################################################################
+# 1) Rule Engine
+###############################################################################
+class FormattingRuleEngine:
+    """
+    Declarative resume formatting rules compiled once into a single combined regex.
+
+    Supported rules (each config may set a "weight", default 1):
+        section_headers: {"headers": [...]} - each header word must appear (e.g. "skills" matches "Technical Skills").
+        bullet_density:  {"min_ratio": 0.3} - share of non-empty lines that start with a bullet.
+        length_limits:   {"min_words": 150, "max_words": 1000} - word count of the resume.
+        date_formats:    {"min_consistency": 0.8} - share of dates written in the dominant format.
+        contact_info:    {"fields": ["email", "phone", "linkedin", "github"]} - contact details present
+                         (defaults to email and phone).
+
+    evaluate() scans the text once and scores every rule from the collected match counts.
+    """
+
+    def __init__(self, formatting_rules: Dict[str, Dict[str, Any]]):
+        self.rules = formatting_rules
+        self.headers: List[str] = list(formatting_rules.get("section_headers", {}).get("headers", []))
+        needed = set()
+        for rule_name, config in formatting_rules.items():
+            if rule_name == "contact_info":
+                needed.update(config.get("fields", CONTACT_FIELDS))
+            else:
+                needed.update(RULE_PATTERNS.get(rule_name, ()))
+
+        # "line" must come first: it matches (possibly empty) at each line start, before any header word there.
+        # A header is found anywhere in a line (e.g. "skills" in "Technical Skills"), see header_pattern.
+        patterns = [(f"header_{index}", header_pattern(header)) for index, header in enumerate(self.headers)]
+        patterns += [(name, regex) for name, regex in PATTERNS.items() if name in needed and name != "line"]
+        first_chars = "".join(re.escape(header[0].lower() + header[0].upper()) for header in self.headers if header)
+        first_chars += "".join(FIRST_CHARS[name] for name, _ in patterns if name in FIRST_CHARS)
+
+        alternatives = []
+        if "line" in needed:
+            alternatives.append(f"(?P<line>{PATTERNS['line']})")
+        if patterns:
+            alternatives.append(f"(?=[{first_chars}])(?:"
+                                + "|".join(f"(?P<{name}>{regex})" for name, regex in patterns) + ")")
+        self.pattern = re.compile("|".join(alternatives), re.IGNORECASE | re.MULTILINE) if alternatives else None
+        self.total_weight = sum(config.get("weight", 1) for config in formatting_rules.values())
+
+    def scan(self, text: str) -> Dict[str, int]:
+        """Counts the matches of every named pattern in a single pass over the text."""
+        counts: Dict[str, int] = {}
+        if self.pattern is None:
+            return counts
+        for match in self.pattern.finditer(text):
+            name = match.lastgroup
+            counts[name] = counts.get(name, 0) + 1
+            if name == "line" and match.group("bullet") is not None:
+                counts["bullet"] = counts.get("bullet", 0) + 1
+        return counts
+
+    def evaluate(self, text: str, layout=None) -> Dict[str, Any]:
+        """
+        Scores a resume against the compiled rules.
+
+        Args:
+            text (str): The text content of the resume.
+            layout (pdf_extraction.DocumentLayout, optional): Structure extracted from the PDF. When given,
+                headers and bullets are taken from the layout instead of being matched in the text.
+
+        Returns:
+            dict: The normalized score (0-100), failure reasons and the weighted score of each rule.
+        """
+        counts = self.scan(text)
+        if layout is not None:
+            self._apply_layout(layout, counts)
+        reasons: List[str] = []
+        rule_scores: Dict[str, float] = {}
+
+        for rule_name, config in self.rules.items():
+            check = getattr(self, f"_check_{rule_name}", None)
+            if check is None:
+                raise ValueError(f"Unknown formatting rule: {rule_name}")
+            fraction = max(0.0, min(1.0, check(config, counts, text, reasons)))
+            rule_scores[rule_name] = fraction * config.get("weight", 1)
+
+        score = sum(rule_scores.values()) / self.total_weight * 100 if self.total_weight else 0
+        return {"score": min(100, score), "reasons": reasons, "rule_scores": rule_scores}
+
+    def _apply_layout(self, layout, counts: Dict[str, int]) -> None:
+        """Replaces the text-derived header and bullet counts with the ones from the document layout."""
+        for index, header in enumerate(self.headers):
+            pattern = re.compile(header_pattern(header), re.IGNORECASE)
+            counts[f"header_{index}"] = sum(1 for found in layout.headers if pattern.search(found))
+        if "line" in counts:
+            counts["line"] = len(layout.lines)
+            counts["bullet"] = layout.bullet_count
+
+    # --- Individual rules: each returns the fraction (0-1) of the rule that is satisfied ---
+
+    def _check_section_headers(self, config, counts, text, reasons):
+        if not self.headers:
+            return 1.0
+        found = 0
+        for index, header in enumerate(self.headers):
+            if counts.get(f"header_{index}"):
+                found += 1
+            else:
+                reasons.append(f"Missing required header containing the word: '{header}'")
+        return found / len(self.headers)
+
+    def _check_bullet_density(self, config, counts, text, reasons):
+        lines = counts.get("line", 0)
+        ratio = counts.get("bullet", 0) / lines if lines else 0.0
+        min_ratio = config.get("min_ratio", 0.3)
+        if ratio < min_ratio:
+            reasons.append(f"Only {ratio:.0%} of lines are bullet points (expected at least {min_ratio:.0%})")
+            return ratio / min_ratio if min_ratio else 1.0
+        return 1.0
+
+    def _check_length_limits(self, config, counts, text, reasons):
+        words = len(text.split())
+        min_words = config.get("min_words", 150)
+        max_words = config.get("max_words", 1000)
+        if words < min_words:
+            reasons.append(f"Resume is too short: {words} words (minimum {min_words})")
+            return words / min_words
+        if words > max_words:
+            reasons.append(f"Resume is too long: {words} words (maximum {max_words})")
+            return max_words / words
+        return 1.0
+
+    def _check_date_formats(self, config, counts, text, reasons):
+        date_counts = [counts.get(name, 0) for name in DATE_FORMATS]
+        total = sum(date_counts)
+        if not total:
+            reasons.append("No dates found for education or experience entries")
+            return 0.0
+        consistency = max(date_counts) / total
+        if consistency < config.get("min_consistency", 0.8):
+            reasons.append(f"Dates use inconsistent formats ({consistency:.0%} in the most common format)")
+        return consistency
+
+    def _check_contact_info(self, config, counts, text, reasons):
+        fields = config.get("fields", CONTACT_FIELDS)
+        if not fields:
+            return 1.0
+        missing = [field for field in fields if not counts.get(field)]
+        for field in missing:
+            reasons.append(f"Missing contact information: {field}")
+        return 1 - len(missing) / len(fields)
+
+
+###############################################################################
+# 2) Compiled Engine Cache
+###############################################################################
+_engine_cache: Dict[str, FormattingRuleEngine] = {}
+_engine_lock = threading.Lock()
+
+
+def compile_rules(formatting_rules: Dict[str, Dict[str, Any]]) -> FormattingRuleEngine:
+    """Returns the compiled engine for a rule set, compiling it only the first time it is seen."""
+    key = json.dumps(formatting_rules, sort_keys=True)
+    engine = _engine_cache.get(key)
+    if engine is None:
+        with _engine_lock:
+            engine = _engine_cache.setdefault(key, FormattingRuleEngine(formatting_rules))
+    return engine
+
+
+def score_format(resume_text: str, formatting_rules: Dict[str, Dict[str, Any]], layout=None) -> Dict[str, Any]:
+    """
+    Scores a resume based on defined formatting rules.
+
+    Args:
+        resume_text (str): The text content of the resume.
+        formatting_rules (dict): A dictionary specifying formatting rules and weights.
+        layout (pdf_extraction.DocumentLayout, optional): Structure extracted from the PDF.
+
+    Returns:
+        dict: A dictionary containing the formatting score, reasons, and individual rule scores.
+    """
+    return compile_rules(formatting_rules).evaluate(resume_text, layout)
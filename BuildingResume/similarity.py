@@ -0,0 +1,137 @@
+import argparse
+import json
+import logging
+import os
+import pickle
+import sys
+import time
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+import pdf_extraction
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_PATH = os.getenv(
+    "RESUME_SIMILARITY_MODEL",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "similarity_model.pkl"),
+)
+
+
+###############################################################################
+# 1) TF-IDF Similarity Model
+###############################################################################
+class SimilarityModel:
+    """
+    Local, LLM-free resume/job similarity based on TF-IDF vectors and cosine similarity
+    (promoted from the poc.ipynb prototype).
+
+    The IDF weights are fitted once on a corpus of historical job descriptions and persisted.
+    Vectors are L2-normalized, so cosine similarity for N resumes x M jobs is a single sparse
+    matrix product.
+    """
+
+    def __init__(self, vectorizer: Optional[TfidfVectorizer] = None):
+        self.vectorizer = vectorizer or TfidfVectorizer(
+            stop_words="english",
+            sublinear_tf=True,
+            ngram_range=(1, 2),
+            min_df=1,
+            dtype=np.float32,
+        )
+
+    def fit(self, job_descriptions: Iterable[str]) -> "SimilarityModel":
+        """Fits the vocabulary and IDF weights on a corpus of job descriptions."""
+        started = time.perf_counter()
+        self.vectorizer.fit(job_descriptions)
+        logger.info("Fitted TF-IDF model with %d terms in %.2fs.",
+                    len(self.vectorizer.vocabulary_), time.perf_counter() - started)
+        return self
+
+    def transform(self, texts: Iterable[str]):
+        """Returns the L2-normalized sparse TF-IDF matrix (one row per text)."""
+        return self.vectorizer.transform(texts)
+
+    def score(self, resumes: Sequence[str], jobs: Sequence[str]):
+        """
+        Scores every resume against every job.
+
+        Args:
+            resumes (Sequence[str]): Resume texts (N).
+            jobs (Sequence[str]): Job description texts (M).
+
+        Returns:
+            numpy.ndarray: N x M matrix of similarity scores between 0 and 100.
+        """
+        return self.score_vectors(self.transform(resumes), self.transform(jobs))
+
+    @staticmethod
+    def score_vectors(resume_vectors, job_vectors):
+        """Scores precomputed TF-IDF matrices (e.g. job vectors transformed once and reused)."""
+        return (resume_vectors @ job_vectors.T).toarray() * 100
+
+    def score_pair(self, resume: str, job: str) -> float:
+        """Returns the similarity score (0-100) of a single resume and job description."""
+        return float(self.score([resume], [job])[0, 0])
+
+    def save(self, path: str = DEFAULT_MODEL_PATH) -> None:
+        """Persists the fitted model."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "wb") as file:
+            pickle.dump(self.vectorizer, file, protocol=pickle.HIGHEST_PROTOCOL)
+        logger.info("Saved similarity model to %s", path)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_MODEL_PATH) -> "SimilarityModel":
+        """Loads a model previously written by save()."""
+        with open(path, "rb") as file:
+            return cls(pickle.load(file))
+
+
+###############################################################################
+# 2) Command Line Interface
+###############################################################################
+def main(argv=None):
+    """
+    fit:   python similarity.py fit JOB_DIR_OR_FILES... [--model PATH]
+    score: python similarity.py score --job JOB... --resume RESUME... [--model PATH]
+    """
+    parser = argparse.ArgumentParser(description="TF-IDF resume/job similarity scoring.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    fit_parser = subparsers.add_parser("fit", help="Fit the IDF model on historical job descriptions.")
+    fit_parser.add_argument("corpus", nargs="+", help="Job description files or directories.")
+    fit_parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+
+    score_parser = subparsers.add_parser("score", help="Score resumes against job descriptions (JSONL output).")
+    score_parser.add_argument("--job", nargs="+", required=True, help="Job description files or directories.")
+    score_parser.add_argument("--resume", nargs="+", required=True, help="Resume files or directories.")
+    score_parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    if args.command == "fit":
+        corpus = pdf_extraction.expand_paths(args.corpus)
+        SimilarityModel().fit(pdf_extraction.read_document(path) for path in corpus).save(args.model)
+        return 0
+
+    model = SimilarityModel.load(args.model)
+    job_paths = pdf_extraction.expand_paths(args.job)
+    resume_paths = pdf_extraction.expand_paths(args.resume)
+    started = time.perf_counter()
+    scores = model.score([pdf_extraction.read_document(path) for path in resume_paths],
+                         [pdf_extraction.read_document(path) for path in job_paths])
+    elapsed = time.perf_counter() - started
+    logger.info("Scored %d pairs in %.3fs.", len(resume_paths) * len(job_paths), elapsed)
+
+    for row, resume_path in enumerate(resume_paths):
+        for column, job_path in enumerate(job_paths):
+            print(json.dumps({"resume": resume_path, "job": job_path, "score": float(scores[row, column])}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
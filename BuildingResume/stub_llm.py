@@ -0,0 +1,232 @@
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
+
+import llm_cache
+import resume_parser
+import tracing
+
+# Simulated model latency in seconds (RESUME_STUB_LLM_LATENCY), e.g. to load-test the service offline
+DEFAULT_LATENCY = float(os.getenv("RESUME_STUB_LLM_LATENCY", "0"))
+
+# Candidate terms; kept when they look like skills: capitalized, or containing digits or + # . (C++, C#, node.js, S3)
+_TERM_PATTERN = re.compile(r"[A-Za-z][\w+#.]*[\w+#]")
+_KEYWORD_PROMPT = re.compile(r"^(?:find the key words in|extract the key skills and requirements from this job description:)\s*")
+_COMMON_WORDS = {
+    "The", "This", "You", "Your", "We", "Our", "And", "Or", "For", "With", "In", "On", "Of", "To", "As",
+    "About", "Who", "What", "Job", "Type", "Role", "Must", "Will", "Are", "Is", "Be", "An", "A", "If",
+}
+
+
+###############################################################################
+# 1) Canned Responders
+###############################################################################
+def _section(prompt: str, start: str, end: str) -> str:
+    """Returns the prompt text between two markers ("" if the start marker is missing)."""
+    head, found, tail = prompt.partition(start)
+    return tail.split(end, 1)[0].strip() if found else ""
+
+
+def posting_terms(text: str, limit: int = 25) -> List[str]:
+    """Returns the distinct skill-like terms of a text in order of first appearance."""
+    terms: Dict[str, None] = {}
+    for match in _TERM_PATTERN.finditer(text):
+        term = match.group().rstrip(".")
+        if term not in _COMMON_WORDS and (term[0].isupper() or any(char in term for char in "0123456789+#.")):
+            terms.setdefault(term, None)
+    return list(terms)[:limit]
+
+
+def _keywords(prompt: str) -> str:
+    return ", ".join(posting_terms(_KEYWORD_PROMPT.sub("", prompt)))
+
+
+def _star_method(prompt: str) -> str:
+    return "yes"
+
+
+def _keyword_sentence(prompt: str) -> str:
+    keywords = prompt.split(" contains ", 1)[0]
+    state = "matched" if "matched keywords" in prompt else "missing"
+    return f"These keywords are {state} in your resume: {keywords}."
+
+
+def _job_themes(prompt: str) -> str:
+    job_description = _section(prompt, "**Job Description:**", "**Output Format")
+    terms = posting_terms(job_description)
+    sentences = [line.strip() for line in job_description.splitlines() if len(line.split()) >= 5]
+    return json.dumps({
+        "key_themes": terms[:5],
+        "responsibilities": sentences[:3],
+        "required_skills": terms,
+    })
+
+
+def _resume_json(prompt: str) -> str:
+    resume_text = prompt.split("\n\nThe text above contains information of a resume.", 1)[0]
+    parsed, _ = resume_parser.parse_resume(resume_text)
+    return json.dumps(parsed)
+
+
+def _tailored_resume(prompt: str) -> str:
+    # Returns the applicant's existing resume data unchanged
+    return _section(prompt, "**Applicant's Existing Resume Data:**", "**Job Description:**")
+
+
+def _cover_letter(prompt: str) -> str:
+    template = json.loads(_section(prompt, "**Output Format (JSON Only, No Additional Text):**", "**Instructions:**"))
+    themes = json.loads(_section(prompt, "**Extracted Job Themes:**", "**Output Format") or "{}")
+    skills = ", ".join(themes.get("required_skills", [])[:5]) or "the skills this role requires"
+    template["cover_letter_content"] = (
+        f"Dear Hiring Manager,\n\nI am excited to apply for the {template.get('job_title', 'open')} position. "
+        f"My experience with {skills} matches what your team is looking for.\n\n"
+        f"Sincerely,\n{template.get('applicant_name', '')}"
+    )
+    return json.dumps(template)
+
+
+# (prompt pattern, responder) pairs for every prompt this package sends; the first match answers
+DEFAULT_RULES: List[Tuple[str, Callable[[str], str]]] = [
+    (r"^if they have followed STAR method in", _star_method),
+    (r"contains the (?:matched keywords|missing words) in a resume", _keyword_sentence),
+    (r"Extract the key themes, responsibilities, and required skills", _job_themes),
+    (r"tasked with tailoring a resume", _tailored_resume),
+    (r"specializing in generating professional cover letters", _cover_letter),
+    (r"The text above contains information of a resume", _resume_json),
+    (_KEYWORD_PROMPT.pattern, _keywords),
+]
+
+
+###############################################################################
+# 2) Stub Backend
+###############################################################################
+class StubBackend:
+    """
+    Deterministic, offline stand-in for Gemini (see llm_cache.set_backend).
+
+    Prompts are answered by the first rule whose pattern matches: keyword prompts return the
+    skill-like terms of the posting, resume structuring uses the local parser, tailoring echoes
+    the applicant's resume, and the cover letter prompt fills in a short templated letter.
+
+    Args:
+        rules (list, optional): (regex, responder) pairs tried before DEFAULT_RULES.
+        default (str): Response for prompts no rule matches.
+        latency (float): Seconds to sleep per call, to simulate model latency.
+    """
+
+    name = "stub"
+
+    def __init__(self, rules: Optional[List[Tuple[str, Callable[[str], str]]]] = None, default: str = "",
+                 latency: float = DEFAULT_LATENCY):
+        self.rules: List[Tuple[Pattern, Callable[[str], str]]] = [
+            (re.compile(pattern, re.MULTILINE), responder) for pattern, responder in (rules or []) + DEFAULT_RULES
+        ]
+        self.default = default
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate(self, prompt: str, model_name: str, generation_config: Optional[Dict[str, Any]] = None) -> str:
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        prompt = prompt.strip()
+        text = next((responder(prompt) for pattern, responder in self.rules if pattern.search(prompt)), self.default)
+        tracing.record_tokens(model_name, tracing.estimate_tokens(prompt), tracing.estimate_tokens(text),
+                              estimated=True)
+        return text
+
+
+###############################################################################
+# 3) Recorded Responses
+###############################################################################
+class RecordedBackend:
+    """
+    Replays model responses recorded earlier, keyed like the response cache (model, prompt, config).
+
+    Prompts without a recording are sent to the fallback backend; with record=True its answers are
+    kept and written out by save(), e.g. to capture real Gemini responses once and replay them offline.
+
+    Args:
+        path (str, optional): JSON file of recorded responses (need not exist yet); None replays nothing.
+        fallback (optional): Backend for unrecorded prompts; without one they raise KeyError.
+        record (bool): Keep the fallback's responses for save().
+        replay_latency (bool): Sleep for each response's recorded latency when replaying it.
+    """
+
+    name = "recorded"
+
+    def __init__(self, path: Optional[str], fallback: Any = None, record: bool = False, replay_latency: bool = False):
+        self.path = path
+        self.fallback = fallback
+        self.record = record
+        self.replay_latency = replay_latency
+        self.replayed = 0
+        self.unrecorded = 0
+        self._lock = threading.Lock()
+        self.responses: Dict[str, Dict[str, Any]] = {}
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                self.responses = json.load(file).get("responses", {})
+
+    def generate(self, prompt: str, model_name: str, generation_config: Optional[Dict[str, Any]] = None) -> str:
+        key = llm_cache.cache_key(model_name, prompt, generation_config)
+        recorded = self.responses.get(key)
+        if recorded is not None:
+            with self._lock:
+                self.replayed += 1
+            if self.replay_latency:
+                time.sleep(recorded.get("latency", 0))
+            tracing.record_tokens(model_name, tracing.estimate_tokens(prompt),
+                                  tracing.estimate_tokens(recorded["response"]), estimated=True)
+            return recorded["response"]
+
+        if self.fallback is None:
+            raise KeyError(f"No recorded response for {model_name} prompt {key[:12]} in {self.path}")
+        started = time.perf_counter()
+        text = self.fallback.generate(prompt, model_name, generation_config)
+        with self._lock:
+            self.unrecorded += 1
+            if self.record and text:
+                self.responses[key] = {"model": model_name, "response": text,
+                                       "latency": time.perf_counter() - started}
+        return text
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Writes the recorded responses (atomically) to path, by default the file they were loaded from."""
+        path = path or self.path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            data = {"version": 1, "responses": dict(sorted(self.responses.items()))}
+        with open(path + ".tmp", "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=1, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+
+
+###############################################################################
+# 4) Offline Mode
+###############################################################################
+def install(backend: Optional[Any] = None) -> Any:
+    """
+    Routes every model call to an offline backend, with the LLM cache and job registry kept in
+    memory so that stub output never reaches the on-disk stores real runs read from.
+
+    Args:
+        backend (optional): The backend to install (defaults to a new StubBackend).
+
+    Returns:
+        The installed backend.
+    """
+    import job_registry  # Imports the evaluation stack; only needed once offline mode is switched on
+
+    backend = backend or StubBackend()
+    llm_cache.set_backend(backend)
+    llm_cache.set_cache(llm_cache.SQLiteCache(":memory:"))
+    job_registry.set_registry(job_registry.JobRegistry(":memory:"))
+    return backend
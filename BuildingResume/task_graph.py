@@ -0,0 +1,63 @@
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A task is (dependency names, function). The function receives a dict with the results
+# of its dependencies and returns its own result.
+Task = Tuple[Iterable[str], Callable[[Dict[str, Any]], Any]]
+
+
+def run_task_graph(tasks: Dict[str, Task], max_workers: int = 4, parallel: bool = True) -> Dict[str, Any]:
+    """
+    Runs a small dependency graph of tasks, starting each task as soon as its dependencies finish.
+
+    Independent LLM prompts spend nearly all their time waiting on the network, so a thread pool
+    is enough to overlap them.
+
+    Args:
+        tasks (Dict[str, Task]): Mapping of task name to (dependency names, function).
+        max_workers (int): Maximum number of tasks running at once.
+        parallel (bool): If False, runs the tasks one after another in dependency order.
+
+    Returns:
+        Dict[str, Any]: Mapping of task name to its result.
+    """
+    dependencies = {name: set(deps) for name, (deps, _) in tasks.items()}
+    for name, deps in dependencies.items():
+        unknown = deps - tasks.keys()
+        if unknown:
+            raise ValueError(f"Task '{name}' depends on unknown task(s): {sorted(unknown)}")
+
+    results: Dict[str, Any] = {}
+    pending = dict(dependencies)
+
+    def ready():
+        return [name for name, deps in pending.items() if deps <= results.keys()]
+
+    if not parallel:
+        while pending:
+            batch = ready()
+            if not batch:
+                raise ValueError(f"Task graph has a cycle between: {sorted(pending)}")
+            for name in batch:
+                del pending[name]
+                results[name] = tasks[name][1]({dep: results[dep] for dep in dependencies[name]})
+        return results
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        running = {}
+        while pending or running:
+            for name in ready():
+                del pending[name]
+                inputs = {dep: results[dep] for dep in dependencies[name]}
+                running[executor.submit(tasks[name][1], inputs)] = name
+            if not running:
+                raise ValueError(f"Task graph has a cycle between: {sorted(pending)}")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name] = future.result()
+                logger.debug("Task '%s' finished.", name)
+    return results
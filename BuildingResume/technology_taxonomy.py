@@ -0,0 +1,122 @@
+import functools
+import json
+import os
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set
+
+DEFAULT_TAXONOMY_PATH = os.getenv(
+    "RESUME_TAXONOMY_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "technology_taxonomy.json"),
+)
+
+# Weight multiplier applied for every hop away from the original keyword
+DEFAULT_HOP_WEIGHT = 0.5
+
+
+###############################################################################
+# 1) Bidirectional Technology Graph
+###############################################################################
+class TechnologyTaxonomy:
+    """
+    Bidirectional graph of related technologies built once from a taxonomy mapping.
+
+    The taxonomy file maps a term to its related terms ({"related": {"python": ["pandas", ...]}}).
+    Every edge is indexed in both directions, so "pandas" reaches "python" as well as the reverse,
+    and neighbour lookups are a single dict access no matter how large the taxonomy grows.
+    """
+
+    def __init__(self, related: Dict[str, Iterable[str]]):
+        self.related_map = {key.lower(): [term.lower() for term in terms] for key, terms in related.items()}
+        self.neighbours: Dict[str, Set[str]] = {}
+        for key, terms in self.related_map.items():
+            for term in terms:
+                if term == key:
+                    continue
+                self.neighbours.setdefault(key, set()).add(term)
+                self.neighbours.setdefault(term, set()).add(key)
+        # Expansion results depend only on (term, depth, hop weight), so memoize them per instance
+        self.expand = functools.lru_cache(maxsize=65536)(self._expand)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_TAXONOMY_PATH) -> "TechnologyTaxonomy":
+        """
+        Loads a taxonomy from a JSON file (or YAML, if PyYAML is installed and the file ends in .yaml/.yml).
+        """
+        with open(path, "r", encoding="utf-8") as file:
+            if path.endswith((".yaml", ".yml")):
+                import yaml  # Only needed for YAML taxonomies
+
+                data = yaml.safe_load(file)
+            else:
+                data = json.load(file)
+        return cls(data.get("related", data))
+
+    def __contains__(self, term: str) -> bool:
+        return term.lower() in self.neighbours
+
+    def __len__(self) -> int:
+        return len(self.neighbours)
+
+    def related(self, term: str) -> Set[str]:
+        """Returns the terms directly connected to a term (in either direction)."""
+        return self.neighbours.get(term.lower(), set())
+
+    def _expand(self, term: str, depth: int = 1, hop_weight: float = DEFAULT_HOP_WEIGHT) -> Dict[str, float]:
+        """
+        Expands a term to its related technologies up to a number of hops.
+
+        Args:
+            term (str): The keyword to expand.
+            depth (int): Maximum number of hops to follow (0 returns only the term itself).
+            hop_weight (float): Weight multiplier per hop; a term n hops away gets hop_weight ** n.
+
+        Returns:
+            Dict[str, float]: Mapping of each reachable term to its weight (the term itself has weight 1.0).
+        """
+        term = term.lower()
+        weights = {term: 1.0}
+        frontier = deque([(term, 0)])
+        while frontier:
+            current, hops = frontier.popleft()
+            if hops >= depth:
+                continue
+            for neighbour in self.neighbours.get(current, ()):
+                if neighbour not in weights:
+                    weights[neighbour] = hop_weight ** (hops + 1)
+                    frontier.append((neighbour, hops + 1))
+        return weights
+
+    def expand_all(self, terms: Iterable[str], depth: int = 1,
+                   hop_weight: float = DEFAULT_HOP_WEIGHT) -> Dict[str, float]:
+        """
+        Expands a set of keywords, keeping the highest weight when several keywords reach the same term.
+        """
+        expanded: Dict[str, float] = {}
+        for term in terms:
+            for related, weight in self.expand(term, depth, hop_weight).items():
+                if weight > expanded.get(related, 0.0):
+                    expanded[related] = weight
+        return expanded
+
+
+###############################################################################
+# 2) Shared Taxonomy
+###############################################################################
+_taxonomy: Optional[TechnologyTaxonomy] = None
+_taxonomy_lock = threading.Lock()
+
+
+def get_taxonomy() -> TechnologyTaxonomy:
+    """Returns the process-wide taxonomy, loading DEFAULT_TAXONOMY_PATH on first use."""
+    global _taxonomy
+    if _taxonomy is None:
+        with _taxonomy_lock:
+            if _taxonomy is None:
+                _taxonomy = TechnologyTaxonomy.load()
+    return _taxonomy
+
+
+def get_related_technologies(keyword: str) -> List[str]:
+    """Returns the technologies directly related to a keyword."""
+    return sorted(get_taxonomy().related(keyword))
@@ -0,0 +1,114 @@
+import functools
+import hashlib
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+
+import tracing
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+# Set RESUME_JINJA_BYTECODE_CACHE to a directory to persist compiled templates across processes
+BYTECODE_CACHE_DIR = os.getenv("RESUME_JINJA_BYTECODE_CACHE")
+
+# Jinja2 delimiters for templates that would clash with LaTeX braces/percent signs
+LATEX_SYNTAX = {
+    "block_start_string": "<%",
+    "block_end_string": "%>",
+    "variable_start_string": "<<",
+    "variable_end_string": ">>",
+}
+
+# Registered document kinds: template file (relative to TEMPLATE_DIR) and Jinja2 syntax
+TEMPLATES: Dict[str, Dict[str, Any]] = {
+    "resume": {"file": "resume_template.tex", "syntax": {}},
+    "cover_letter": {"file": "cover_letter_template.tex", "syntax": LATEX_SYNTAX},
+}
+
+_environments: Dict[tuple, Environment] = {}
+_templates: Dict[str, Template] = {}
+_lock = threading.Lock()
+
+
+###############################################################################
+# 1) Environments and Compiled Templates
+###############################################################################
+def _get_environment(syntax: Dict[str, str]) -> Environment:
+    """Returns the shared Environment for a delimiter syntax (caller holds the lock)."""
+    key = tuple(sorted(syntax.items()))
+    env = _environments.get(key)
+    if env is None:
+        bytecode_cache = None
+        if BYTECODE_CACHE_DIR:
+            os.makedirs(BYTECODE_CACHE_DIR, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(BYTECODE_CACHE_DIR)
+        env = Environment(
+            loader=FileSystemLoader(TEMPLATE_DIR),
+            autoescape=False,  # Handle escaping manually
+            bytecode_cache=bytecode_cache,
+            auto_reload=False,  # Templates are fixed for the life of the process
+            **syntax,
+        )
+        _environments[key] = env
+    return env
+
+
+def register(kind: str, file: str, syntax: Optional[Dict[str, str]] = None) -> None:
+    """
+    Registers (or replaces) a document template.
+
+    Args:
+        kind (str): Name used with render(), e.g. "resume".
+        file (str): Template file name relative to TEMPLATE_DIR.
+        syntax (dict, optional): Jinja2 delimiter overrides (e.g. LATEX_SYNTAX).
+    """
+    with _lock:
+        TEMPLATES[kind] = {"file": file, "syntax": syntax or {}}
+        _templates.pop(kind, None)
+    template_version.cache_clear()
+
+
+def get_template(kind: str) -> Template:
+    """Returns the compiled template for a document kind, compiling it only on first use."""
+    template = _templates.get(kind)
+    if template is None:
+        with _lock:
+            template = _templates.get(kind)
+            if template is None:
+                if kind not in TEMPLATES:
+                    raise KeyError(f"Unknown template kind: {kind}")
+                spec = TEMPLATES[kind]
+                template = _get_environment(spec["syntax"]).get_template(spec["file"])
+                _templates[kind] = template
+                logger.debug("Compiled %s template from %s", kind, spec["file"])
+    return template
+
+
+def render(kind: str, context: Dict[str, Any]) -> str:
+    """
+    Renders a registered template with an (already LaTeX-escaped) context.
+
+    Args:
+        kind (str): The document kind ("resume" or "cover_letter").
+        context (Dict[str, Any]): Template variables.
+
+    Returns:
+        str: The rendered LaTeX source.
+    """
+    template = get_template(kind)
+    with tracing.span("template.render", kind=kind):
+        return template.render(context)
+
+
+@functools.lru_cache(maxsize=None)
+def template_version(kind: str) -> str:
+    """Returns a SHA-256 digest of a template's source, identifying the template version."""
+    if kind not in TEMPLATES:
+        raise KeyError(f"Unknown template kind: {kind}")
+    with open(os.path.join(TEMPLATE_DIR, TEMPLATES[kind]["file"]), "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
@@ -0,0 +1,70 @@
+import pytest
+
+import job_queue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return job_queue.JobQueue(str(tmp_path / "queue.sqlite3"))
+
+
+def submit(queue):
+    return queue.submit("resume", {"resume_pdf": "", "job_description": "Python developer"})
+
+
+def event_names(queue, job_id):
+    return [event.event for event in queue.events(job_id)]
+
+
+def test_owner_completes_its_job(queue):
+    job_id = submit(queue)
+    job = queue.claim("a")
+    assert job.id == job_id and job.attempts == 1
+    assert queue.stage(job_id, "a", "extract")
+    assert queue.complete(job_id, "a", b"%PDF")
+    assert queue.get(job_id).status == job_queue.SUCCEEDED
+    assert queue.result(job_id) == b"%PDF"
+    assert event_names(queue, job_id) == ["queued", "running", "stage", "succeeded"]
+
+
+def test_claim_takes_each_job_once(queue):
+    submit(queue)
+    assert queue.claim("a") is not None
+    assert queue.claim("b") is None
+
+
+def test_late_completion_cannot_revive_a_failed_job(queue):
+    job_id = submit(queue)
+    queue.claim("a")
+    assert queue.requeue_stale(lease_seconds=-1, max_attempts=1) == 1
+    assert queue.get(job_id).status == job_queue.FAILED
+
+    assert not queue.complete(job_id, "a", b"%PDF")
+    assert not queue.stage(job_id, "a", "render")
+    assert queue.get(job_id).status == job_queue.FAILED
+    assert queue.result(job_id) is None
+    assert event_names(queue, job_id) == ["queued", "running", "failed"]
+
+
+def test_stale_worker_cannot_touch_a_reclaimed_job(queue):
+    job_id = submit(queue)
+    queue.claim("a")
+    queue.requeue_stale(lease_seconds=-1, max_attempts=2)
+    assert queue.get(job_id).status == job_queue.QUEUED
+    assert queue.claim("b").attempts == 2
+
+    assert not queue.fail(job_id, "a", "late error")
+    assert not queue.retry(job_id, "a", "late error")
+    assert queue.complete(job_id, "b", b"%PDF")
+    assert queue.get(job_id).status == job_queue.SUCCEEDED
+    assert event_names(queue, job_id) == ["queued", "running", "queued", "running", "succeeded"]
+
+
+def test_retry_requeues_for_another_attempt(queue):
+    job_id = submit(queue)
+    queue.claim("a")
+    assert queue.retry(job_id, "a", "model timeout")
+    job = queue.claim("b")
+    assert job.id == job_id and job.attempts == 2
+    assert queue.fail(job_id, "b", "model timeout")
+    assert queue.get(job_id).error == "model timeout"
@@ -0,0 +1,102 @@
+import pytest
+
+import resume_parser
+
+RESUME = """Jane Doe
+Ottawa, ON | (613) 555-0123 | jane.doe@example.com | linkedin.com/in/janedoe | github.com/janedoe
+
+Summary
+Backend developer with five years of experience. Enjoys building data pipelines.
+
+Work Experience
+Software Engineer | Acme Corp | Toronto, ON
+Jan 2020 - Present
+• Built the billing service in Python.
+• Cut API latency by 40% by caching
+rendered templates.
+Intern | Initech
+May 2018 - Aug 2018
+- Wrote integration tests.
+
+Education
+University of Ottawa | BASc Computer Engineering
+2014 - 2018
+
+Technical Skills
+Languages: Python, SQL, C++
+Tools: Docker; Git
+"""
+
+
+@pytest.mark.parametrize("line, section", [
+    ("Work Experience", "experience"),
+    ("TECHNICAL SKILLS:", "skills"),
+    ("Honors & Awards", "activities"),
+    ("  Education  ", "education"),
+    ("Experienced engineer building payment systems", None),
+    ("", None),
+])
+def test_detect_header(line, section):
+    assert resume_parser.detect_header(line) == section
+
+
+def test_segment_sections_splits_preamble_and_sections():
+    preamble, sections = resume_parser.segment_sections(RESUME)
+    assert preamble[0] == "Jane Doe"
+    assert set(sections) == {"summary", "experience", "education", "skills"}
+    assert sections["education"] == ["University of Ottawa | BASc Computer Engineering", "2014 - 2018"]
+
+
+def test_extract_contact():
+    preamble, _ = resume_parser.segment_sections(RESUME)
+    assert resume_parser.extract_contact(preamble) == {
+        "name": "Jane Doe",
+        "location": "Ottawa, ON",
+        "phone": "(613) 555-0123",
+        "email": "jane.doe@example.com",
+        "linkedin": "linkedin.com/in/janedoe",
+        "github": "github.com/janedoe",
+    }
+
+
+def test_experience_entries_carry_dates_and_bullets():
+    resume, _ = resume_parser.parse_resume(RESUME)
+    first, second = resume["experience"]
+    assert (first["position"], first["company"], first["location"]) == ("Software Engineer", "Acme Corp", "Toronto, ON")
+    assert first["years"] == "Jan 2020 - Present"
+    # The wrapped second bullet is joined back onto its first line
+    assert first["details"] == ["Built the billing service in Python.",
+                                "Cut API latency by 40% by caching rendered templates."]
+    assert (second["position"], second["years"], second["details"]) == ("Intern", "May 2018 - Aug 2018",
+                                                                        ["Wrote integration tests."])
+
+
+def test_education_skills_and_summary():
+    resume, _ = resume_parser.parse_resume(RESUME)
+    assert resume["education"][0]["institution"] == "University of Ottawa"
+    assert resume["education"][0]["years"] == "2014 - 2018"
+    assert resume["skills"] == ["Python", "SQL", "C++", "Docker", "Git"]
+    assert resume["summary"] == ["Backend developer with five years of experience.",
+                                 "Enjoys building data pipelines."]
+
+
+def test_complete_resume_clears_the_confidence_threshold():
+    _, confidence = resume_parser.parse_resume(RESUME)
+    assert confidence >= resume_parser.CONFIDENCE_THRESHOLD
+
+
+def test_resume_without_sections_falls_below_the_threshold():
+    _, confidence = resume_parser.parse_resume("Jane Doe\njane.doe@example.com\nI write software.")
+    assert confidence < resume_parser.CONFIDENCE_THRESHOLD
+
+
+@pytest.mark.parametrize("text, uses_model", [
+    (RESUME, False),
+    ("Jane Doe\njane.doe@example.com\nI write software.", True),
+])
+def test_structure_resume_falls_back_to_the_model_below_the_threshold(monkeypatch, text, uses_model):
+    resume_evaluator = pytest.importorskip("resume_evaluator")
+    model_result = {"name": "from the model"}
+    monkeypatch.setattr(resume_evaluator, "extract_resume_json", lambda resume_text: model_result)
+    result = resume_evaluator.structure_resume(text)
+    assert (result is model_result) is uses_model
@@ -0,0 +1,57 @@
+import re
+
+import pytest
+
+import rule_engine
+
+DATE_RULES = {"date_formats": {"weight": 1}, "contact_info": {"fields": ["email", "phone"], "weight": 1}}
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Acme 2020-01 - 2022-05", {"date_iso": 2}),
+    ("Acme 2020-01-2022-05", {"date_iso": 2}),
+    ("Acme 01/2020 - 05/2022", {"date_numeric": 2}),
+    ("Acme January 2020 - May 2022", {"date_month_year": 2}),
+])
+def test_date_ranges_are_dates_not_phones(text, expected):
+    counts = rule_engine.compile_rules(DATE_RULES).scan(text)
+    assert "phone" not in counts
+    for name, count in expected.items():
+        assert counts.get(name) == count
+
+
+def test_year_range_is_not_a_phone():
+    assert "phone" not in rule_engine.compile_rules(DATE_RULES).scan("University of Ottawa 2018 - 2022")
+
+
+@pytest.mark.parametrize("phone", ["+1 (613) 555-0100", "613-555-0100", "(613) 555 0100", "+16135550100"])
+def test_phone_numbers_are_found(phone):
+    assert rule_engine.compile_rules(DATE_RULES).scan(f"Jane Doe | {phone} | jane@example.com")["phone"] == 1
+
+
+def test_iso_dates_satisfy_the_date_rule():
+    result = rule_engine.score_format("Jane Doe\njane@example.com\nAcme 2020-01 - 2022-05", DATE_RULES)
+    assert "No dates found for education or experience entries" not in result["reasons"]
+    assert "Missing contact information: phone" in result["reasons"]
+    assert result["rule_scores"]["date_formats"] == 1
+
+
+@pytest.mark.parametrize("text, found", [
+    ("Education\nBASc", True),
+    ("TECHNICAL SKILLS: Python", True),
+    ("Softskills: teamwork", True),
+    ("Experienced engineer", True),
+    ("WorkExperience", True),
+    ("Coeducational school", False),
+    ("Skill: Python", False),
+])
+def test_headers_match_like_the_original_scorer(text, found):
+    rules = {"section_headers": {"headers": ["education", "skills", "experience"], "weight": 1}}
+    result = rule_engine.score_format(text, rules)
+    assert (result["rule_scores"]["section_headers"] > 0) is found
+
+
+def test_hyphen_in_the_first_character_guard_is_literal():
+    engine = rule_engine.FormattingRuleEngine({"contact_info": {"fields": ["email", "linkedin"]}})
+    guard = re.search(r"\(\?=(\[.*?\])\)", engine.pattern.pattern).group(1)
+    assert re.fullmatch(guard, "-") and not re.fullmatch(guard, "@")
@@ -0,0 +1,260 @@
+import bisect
+import collections
+import contextlib
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# Set RESUME_TRACING=0 to turn spans and counters into no-ops
+ENABLED = os.getenv("RESUME_TRACING", "1") != "0"
+
+# Histogram bucket upper bounds in seconds (from a fast regex pass to a slow model call or TeX run)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Durations kept per stage for percentiles, and finished spans kept for the JSON export
+SAMPLE_SIZE = int(os.getenv("RESUME_TRACE_SAMPLES", "1024"))
+RECENT_SPANS = int(os.getenv("RESUME_TRACE_RECENT_SPANS", "256"))
+
+METRIC_PREFIX = "resume"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+###############################################################################
+# 1) Metric Types
+###############################################################################
+class Histogram:
+    """Bucketed durations of one stage, plus a sliding sample of recent values for percentiles."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # The last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.samples: Deque[float] = collections.deque(maxlen=SAMPLE_SIZE)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        self.samples.append(value)
+
+    def percentile(self, q: float) -> float:
+        """Returns the q-th percentile (0-100) of the recent samples."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class SpanRecord(NamedTuple):
+    id: int
+    parent: Optional[int]
+    name: str
+    labels: Dict[str, str]
+    start: float
+    duration: float
+    error: Optional[str]
+
+
+###############################################################################
+# 2) Tracer
+###############################################################################
+class Tracer:
+    """
+    Collects span durations (one histogram per stage and label set), counters such as token
+    counts, and gauges read from registered collectors (e.g. cache hit ratios) at export time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._counters: Dict[Tuple[str, Labels], float] = collections.defaultdict(float)
+        self._collectors: Dict[str, Callable[[], Dict[str, Any]]] = {}
+        self._recent: Deque[SpanRecord] = collections.deque(maxlen=RECENT_SPANS)
+        self._ids = itertools.count(1)
+        self._current: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar("span", default=None)
+
+    @contextlib.contextmanager
+    def span(self, name: str, **labels: Any) -> Iterator[None]:
+        """
+        Times the enclosed block as one occurrence of a stage.
+
+        Args:
+            name (str): Stage name, e.g. "latex.compile".
+            **labels: Extra dimensions, e.g. model="gemini-pro" (keep their values low-cardinality).
+        """
+        if not ENABLED:
+            yield
+            return
+        span_id = next(self._ids)
+        parent = self._current.get()
+        token = self._current.set(span_id)
+        error = None
+        started_at = time.time()
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            duration = time.perf_counter() - started
+            self._current.reset(token)
+            key_labels = tuple(sorted((key, str(value)) for key, value in labels.items()))
+            with self._lock:
+                histogram = self._histograms.get((name, key_labels))
+                if histogram is None:
+                    histogram = self._histograms[(name, key_labels)] = Histogram()
+                histogram.observe(duration)
+                if error is not None:
+                    self._counters[("stage_errors_total", (("stage", name),) + key_labels)] += 1
+                self._recent.append(SpanRecord(span_id, parent, name, dict(key_labels),
+                                               started_at, duration, error))
+
+    def count(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Adds value to a counter, e.g. count("llm_tokens_total", 120, model="gemini-pro", kind="prompt")."""
+        if not ENABLED:
+            return
+        key = (name, tuple(sorted((key, str(label)) for key, label in labels.items())))
+        with self._lock:
+            self._counters[key] += value
+
+    def register_collector(self, name: str, collect: Callable[[], Dict[str, Any]]) -> None:
+        """
+        Registers a function returning current gauge values, read at export time. Collectors
+        returning CacheBackend.stats() are exported as resume_cache_* metrics labelled by name.
+        """
+        self._collectors[name] = collect
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._recent.clear()
+
+    def _collect(self) -> Dict[str, Dict[str, Any]]:
+        gauges = {}
+        for name, collect in list(self._collectors.items()):
+            try:
+                gauges[name] = collect()
+            except Exception as e:  # An exporter must never take the caller down
+                gauges[name] = {"error": str(e)}
+        return gauges
+
+    def export_json(self) -> Dict[str, Any]:
+        """Returns stage statistics, counters, collector gauges and the most recent spans."""
+        with self._lock:
+            stages = [dict(stage=name, labels=dict(labels), **histogram.snapshot())
+                      for (name, labels), histogram in sorted(self._histograms.items())]
+            counters = [{"name": name, "labels": dict(labels), "value": value}
+                        for (name, labels), value in sorted(self._counters.items())]
+            recent = [span._asdict() for span in self._recent]
+        return {"stages": stages, "counters": counters, "gauges": self._collect(), "recent_spans": recent}
+
+    def export_prometheus(self) -> str:
+        """Returns all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+
+        metric = f"{METRIC_PREFIX}_stage_duration_seconds"
+        lines += [f"# HELP {metric} Duration of pipeline stages.", f"# TYPE {metric} histogram"]
+        for (name, labels), histogram in histograms:
+            base = (("stage", name),) + labels
+            cumulative = 0
+            for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{metric}_bucket{_format_labels(base + (('le', le),))} {cumulative}")
+            lines.append(f"{metric}_sum{_format_labels(base)} {histogram.sum!r}")
+            lines.append(f"{metric}_count{_format_labels(base)} {histogram.count}")
+
+        for name in sorted({name for (name, _), _ in counters}):
+            metric = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# TYPE {metric} counter")
+            lines += [f"{metric}{_format_labels(labels)} {value!r}"
+                      for (counter, labels), value in counters if counter == name]
+
+        gauges = self._collect()
+        for field in ("hits", "misses", "evictions", "hit_ratio"):
+            metric = f"{METRIC_PREFIX}_cache_{field}" + ("" if field == "hit_ratio" else "_total")
+            values = [(name, stats[field]) for name, stats in sorted(gauges.items())
+                      if isinstance(stats.get(field), (int, float))]
+            if values:
+                lines.append(f"# TYPE {metric} {'gauge' if field == 'hit_ratio' else 'counter'}")
+                lines += [f"{metric}{_format_labels((('cache', name),))} {value!r}" for name, value in values]
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n") for _, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+
+###############################################################################
+# 3) Process-Wide Tracer
+###############################################################################
+tracer = Tracer()
+span = tracer.span
+count = tracer.count
+register_collector = tracer.register_collector
+export_json = tracer.export_json
+export_prometheus = tracer.export_prometheus
+
+
+def traced(name: str, **labels: Any) -> Callable:
+    """Decorator recording every call of a function as a span."""
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with tracer.span(name, **labels):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_tokens(model: str, prompt_tokens: int, response_tokens: int, estimated: bool = False) -> None:
+    """Counts the prompt and response tokens of one model call."""
+    source = "estimated" if estimated else "reported"
+    count("llm_tokens_total", prompt_tokens, model=model, kind="prompt", source=source)
+    count("llm_tokens_total", response_tokens, model=model, kind="response", source=source)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token) for backends that report none."""
+    return (len(text) + 3) // 4
+
+
+def lru_stats(function: Callable) -> Dict[str, Any]:
+    """Returns CacheBackend-style stats for a functools.lru_cache-wrapped function."""
+    info = function.cache_info()
+    total = info.hits + info.misses
+    return {"hits": info.hits, "misses": info.misses, "hit_ratio": info.hits / total if total else 0.0}
+
+
+def write_json(path: str) -> None:
+    """Writes export_json() to a file (e.g. at the end of a batch run)."""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(export_json(), file, indent=2)
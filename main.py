@@ -1,25 +1,31 @@
-import google.generativeai as genai
-import PyPDF2
-import re
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-
-# Download stopwords if you haven't already
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
-
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-
-try:
-    nltk.data.find('tokenizers/punkt_tab')
-except LookupError:
-    nltk.download('punkt_tab')
+import functools
+import os
+import sys
+
+# Shared helpers (LLM response cache, ...) live alongside the generators in BuildingResume/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "BuildingResume"))
+import job_registry
+import keyword_matcher
+import pdf_extraction
+import resume_evaluator
+import rule_engine
+import technology_taxonomy
+import tracing
+
+
+@functools.lru_cache(maxsize=1)
+def get_stop_words():
+    """
+    Returns NLTK's English stop words, downloading the corpus on first use if it is missing.
+    """
+    import nltk
+    from nltk.corpus import stopwords
+
+    try:
+        nltk.data.find('corpora/stopwords')
+    except LookupError:
+        nltk.download('stopwords')
+    return frozenset(stopwords.words('english'))
 
 
 def configure_gemini_api():
@@ -30,6 +36,7 @@ def configure_gemini_api():
     if not api_key:
         print("Google Gemini API key not found. Please set the 'GOOGLE_GEMINI_API_KEY' environment variable.")
         raise EnvironmentError("GOOGLE_GEMINI_API_KEY environment variable not set.")
+    import google.generativeai as genai
     genai.configure(api_key=api_key)
     print("Google Gemini API configured successfully.")
 
@@ -44,12 +51,7 @@ def extract_text_from_pdf(pdf_path):
         str: Extracted text from the PDF.
     """
     try:
-        with open(pdf_path, "rb") as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text()
-            return text
+        return pdf_extraction.extract_text(pdf_path)
     except Exception as e:
         print(f"Error reading PDF file: {e}")
         return ""
@@ -64,12 +66,13 @@ def clean_text(text):
     Returns:
         str: Cleaned text.
     """
-    text = re.sub(r"[^a-zA-Z0-9\s]", "", text)
-    return text.lower()
+    return resume_evaluator.strip_punctuation(text)
 
 def score_resume_format(resume_text, formatting_rules):
     """Scores a resume based on defined formatting rules.
 
+    The rules are compiled once (see rule_engine) and evaluated in a single pass over the text.
+
     Args:
         resume_text (str): The text content of the resume.
         formatting_rules (dict): A dictionary specifying formatting rules and weights.
@@ -77,81 +80,42 @@ def score_resume_format(resume_text, formatting_rules):
     Returns:
         dict: A dictionary containing the formatting score, reasons, and individual rule scores.
     """
+    return rule_engine.score_format(resume_text, formatting_rules)
 
-    score = 0
-    reasons = []
-    rule_scores = {}
-    total_weight = 0
-
-    for rule_name, rule_config in formatting_rules.items():
-        rule_score = 0
-        if rule_name == "section_headers":
-            headers = rule_config["headers"]
-            for header in headers:
-                if header == "education":
-                    pattern = re.compile(rf"\b{header}\b", re.IGNORECASE)
-                    if pattern.search(resume_text):
-                        rule_score += rule_config["weight"]
-                    else:
-                        reasons.append(f"Missing required header: {header}")
-                elif "skills" in header.lower():
-                    pattern = re.compile(r"\b\w*skills\w*\b", re.IGNORECASE)
-                    if pattern.search(resume_text):
-                        rule_score += rule_config["weight"]
-                    else:
-                         reasons.append(f"Missing a required header containing the word 'skills'")
-
-                elif "experience" in header.lower():
-                    pattern = re.compile(r"\b\w*experience\w*\b", re.IGNORECASE)
-                    if pattern.search(resume_text):
-                        rule_score += rule_config["weight"]
-                    else:
-                         reasons.append(f"Missing a required header containing the word 'experience'")
-        score += rule_score
-        rule_scores[rule_name] = rule_score
-        total_weight = sum([value['weight'] for key, value in formatting_rules.items()])
-    
-    normalized_score = min(100, (score / total_weight) * 100 if total_weight > 0 else 0)
-    return {
-      "score": normalized_score,
-      "reasons": reasons,
-      "rule_scores": rule_scores
-    }
 
+# Related technologies now live in BuildingResume/data/technology_taxonomy.json (see technology_taxonomy)
+def __getattr__(name):
+    # Keeps the old module-level `main.TECHNOLOGY_MAPPING` working without loading the taxonomy at import time
+    if name == "TECHNOLOGY_MAPPING":
+        return technology_taxonomy.get_taxonomy().related_map
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-TECHNOLOGY_MAPPING = {
-    "python": ["pandas", "numpy", "scikit-learn", "django", "flask", "requests", "beautifulsoup4", "matplotlib", "seaborn", "pytest", "unittest"],
-    "deep learning": ["pytorch", "tensorflow", "keras", "theano", "caffe", "onnx", "tensorrt", "transformers"],
-    "javascript": ["react", "angular", "node.js", "vue.js", "express", "webpack", "babel", "jquery", "typescript"],
-    "java": ["spring", "hibernate", "maven", "gradle", "junit", "mockito", "servlet", "jsp"],
-    "sql": ["mysql", "postgresql", "sqlite", "oracle", "sql server", "mongodb", "cassandra", "redis"],
-    "c++": ["boost", "stl", "qt", "opencv", "cmake"],
-    "c#": [".net", "asp.net", "entity framework", "unity", "xamarin"],
-    "mobile development": ["android", "ios", "swift", "kotlin", "flutter", "react native", "xamarin"],
-    "cloud computing": ["aws", "azure", "google cloud", "docker", "kubernetes", "lambda", "ecs", "gke", "ec2"],
-    "devops": ["jenkins", "gitlab ci", "circleci", "ansible", "terraform", "chef", "puppet", "prometheus", "grafana", "kubernetes", "docker"],
-    "data visualization": ["tableau", "power bi", "d3.js", "plotly"],
-    "testing": ["selenium", "junit", "pytest", "cypress", "mocha", "jest"],
-    "api": ["rest", "graphql", "soap"],
-    "machine learning": ["scikit-learn", "xgboost", "lightgbm", "catboost"],
-    "frontend": ["html", "css", "javascript", "react", "angular", "vue.js"],
-    "backend": ["node.js", "java", "python", "php", "ruby", "go", "c#"],
-    "databases": ["mysql", "postgresql", "mongodb", "cassandra", "redis", "oracle", "sql server"],
-    "version control": ["git", "github", "gitlab", "bitbucket"],
-    "operating system": ["linux", "windows", "macos"]
-}
+# How far job keywords are expanded through the taxonomy, and the weight of each hop
+EXPANSION_DEPTH = 1
+HOP_WEIGHT = technology_taxonomy.DEFAULT_HOP_WEIGHT
 
 
 def get_related_technologies(keyword):
   """Returns related technologies of the given key word"""
-  related = []
-  for key, value in TECHNOLOGY_MAPPING.items():
-    if keyword == key:
-      related += value
-  return related
+  return technology_taxonomy.get_related_technologies(keyword)
 
 
-def analyze_resume(resume_text, job_description_text, formatting_rules):
+def extract_job_keywords(job_description_text):
+    """
+    Extracts the key skills and requirements of a job description using Gemini.
+
+    Args:
+        job_description_text (str): Text from the job description.
+
+    Returns:
+        set: Cleaned job keywords (empty if Gemini returns nothing; analyze_resume then falls back
+            to the words of the description).
+    """
+    return resume_evaluator.extract_job_key_terms(job_description_text)
+
+
+@tracing.traced("score.analyze", scorer="keyword_matcher")
+def analyze_resume(resume_text, job_description_text, formatting_rules, job_keywords=None):
     """
     Analyzes the alignment of a resume with a job description and its formatting.
 
@@ -159,44 +123,35 @@ def analyze_resume(resume_text, job_description_text, formatting_rules):
         resume_text (str): Text from the resume.
         job_description_text (str): Text from the job description.
         formatting_rules (dict): Rules for formatting scoring.
+        job_keywords (set, optional): Precomputed job keywords (see extract_job_keywords). By default
+            they are loaded from the job registry, so a posting is only sent to Gemini once.
 
     Returns:
         dict: Analysis results, including score, matched keywords, and formatting information.
     """
-    # Clean the texts
-    resume_text_cleaned = clean_text(resume_text)
-    job_description_text = clean_text(job_description_text)
-
-    # ------ Gemini Prompt to extract Keywords from the Job Description -------
-    model = genai.GenerativeModel('gemini-pro')
-    prompt = f"extract the key skills and requirements from this job description: {job_description_text}"
-    response = model.generate_content(prompt)
-    if response and response.text:
-        job_keywords = set(clean_text(response.text).split())
-    else:
-        job_keywords = set(job_description_text.split())
+    if job_keywords is None:
+        job_keywords = (job_registry.load_artifact(job_description_text, "key_terms")
+                        or set(clean_text(job_description_text).split()))
 
     # Get stop words
-    stop_words = set(stopwords.words('english'))
+    stop_words = get_stop_words()
 
     # Tokenize and remove stop words from job keywords
     filtered_job_keywords = set(
         word for word in job_keywords if word not in stop_words
     )
-     #Expand keywords to include related technologies
-    expanded_job_keywords = set()
-    for keyword in filtered_job_keywords:
-        expanded_job_keywords.add(keyword)
-        expanded_job_keywords.update(get_related_technologies(keyword))
-
-    #Tokenize and remove stop words from resume keywords
-    resume_keywords = set(
-        word for word in word_tokenize(resume_text_cleaned) if word not in stop_words
+     #Expand keywords to include related technologies (weighted by their distance in the taxonomy)
+    keyword_weights = technology_taxonomy.get_taxonomy().expand_all(
+        filtered_job_keywords, depth=EXPANSION_DEPTH, hop_weight=HOP_WEIGHT
     )
+    expanded_job_keywords = set(keyword_weights)
 
-    # Find matches
-    matched_keywords = expanded_job_keywords & resume_keywords
-    match_score = len(matched_keywords) / len(expanded_job_keywords) * 100 if expanded_job_keywords else 0
+    # Find matches: one Aho-Corasick pass over the resume finds every keyword, including
+    # multi-word ones ("sql server") and ones with punctuation ("node.js", "c++")
+    keyword_matches = keyword_matcher.compile_keywords(expanded_job_keywords).find(resume_text)
+    matched_keywords = set(keyword_matches)
+    total_weight = sum(keyword_weights.values())
+    match_score = sum(keyword_weights.get(keyword, 0.0) for keyword in matched_keywords) / total_weight * 100 if total_weight else 0
 
     # Score the resume formatting
     formatting_score_data = score_resume_format(resume_text, formatting_rules)
@@ -208,6 +163,7 @@ def analyze_resume(resume_text, job_description_text, formatting_rules):
         "match_score": match_score,
         "matched_keywords": matched_keywords,
         "missing_keywords": expanded_job_keywords - matched_keywords,
+        "keyword_matches": keyword_matches,
         "formatting_score": formatting_score_data["score"],
         "formatting_reasons": formatting_score_data["reasons"],
         "formatting_rule_scores": formatting_score_data["rule_scores"],